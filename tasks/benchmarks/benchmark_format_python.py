@@ -0,0 +1,334 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import tasks.utils.for_format_python.source_document as source_document
+from tasks.benchmarks.synthetic_corpus import SYNTHETIC_MODULES_INFO, generate_module
+from tasks.utils.for_format_python.format_python_file import (
+    STRATEGIES,
+    format_python_file,
+)
+from tasks.utils.for_format_python.rearrange_imports import rearrange_imports
+
+# The in-process strategies of the default pipeline, in application order.
+BENCHMARKED_STRATEGIES = ["RT", "AE", "RUE", "RF", "RI", "RU", "FE", "FD", "FC"]
+PIPELINE = "pipeline"
+DEFAULT_SIZES = [10, 100, 1000]
+DEFAULT_REPEAT = 5
+# A timing is reported as regression if it exceeds the baseline by more than
+# this share.
+DEFAULT_TOLERANCE = 0.25
+
+
+def _time(function, repeat):
+    # The minimum is the least disturbed by other load on the machine.
+    timings = []
+    for _ in range(repeat):
+        # Strategies must not profit from the document parsed by a previous
+        # run of the same code.
+        source_document._LAST_DOCUMENT = None  # pylint: disable=protected-access
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def time_strategy(abbreviation, code, repeat=DEFAULT_REPEAT):
+    """
+    Times applying a single strategy to code.
+
+    Parameters
+    ----------
+    abbreviation (str)
+        The abbreviation of the strategy, one of BENCHMARKED_STRATEGIES.
+    code (str)
+        The code to format.
+    repeat (int)
+        The number of runs. Default is DEFAULT_REPEAT.
+
+    Returns
+    -------
+    float
+        The fastest run in seconds.
+    """
+    if abbreviation not in BENCHMARKED_STRATEGIES:
+        msg = f"Strategy {abbreviation} is not benchmarked."
+        raise ValueError(msg)
+    function = STRATEGIES[abbreviation][0]
+    if function == rearrange_imports:
+        return _time(lambda: function(code, SYNTHETIC_MODULES_INFO), repeat)
+    return _time(lambda: function(code), repeat)
+
+
+def time_pipeline(code, repeat=DEFAULT_REPEAT):
+    """
+    Times formatting a file containing code with format_python_file, applying
+    all benchmarked strategies in a row.
+
+    Parameters
+    ----------
+    code (str)
+        The code to format.
+    repeat (int)
+        The number of runs. Default is DEFAULT_REPEAT.
+
+    Returns
+    -------
+    float
+        The fastest run in seconds.
+    """
+    temp_dir = tempfile.mkdtemp()
+    file_path = os.path.join(temp_dir, "synthetic_module.py")
+
+    def format_file():
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(code)
+        with contextlib.redirect_stdout(io.StringIO()):
+            format_python_file(
+                file_path,
+                select_only=BENCHMARKED_STRATEGIES,
+                modules_info=SYNTHETIC_MODULES_INFO,
+            )
+
+    try:
+        return _time(format_file, repeat)
+    finally:
+        shutil.rmtree(temp_dir)
+
+
+def run_benchmark(
+    sizes=DEFAULT_SIZES,
+    num_imports=10,
+    docstring_density=0.5,
+    exception_density=0.3,
+    repeat=DEFAULT_REPEAT,
+    seed=0,
+):
+    """
+    Benchmarks the strategies on synthetic modules of increasing size, see
+    generate_module. Every benchmarked strategy is timed on its own and all
+    of them as the pipeline of format_python_file.
+
+    Parameters
+    ----------
+    sizes (list)
+        The numbers of functions of the modules. Default is DEFAULT_SIZES.
+    num_imports (int)
+        The number of import statements per module. Default is 10.
+    docstring_density (float)
+        The share of functions with a docstring. Default is 0.5.
+    exception_density (float)
+        The share of functions raising an exception. Default is 0.3.
+    repeat (int)
+        The number of runs per timing. Default is DEFAULT_REPEAT.
+    seed (int)
+        The seed of the synthetic modules. Default is 0.
+
+    Returns
+    -------
+    dict
+        The results with the keys 'config', the arguments and the platform,
+        and 'results', a list with an entry per size holding the size, the
+        lines of the module and the timings in seconds by strategy
+        abbreviation and PIPELINE.
+    """
+    config = {
+        "sizes": list(sizes),
+        "num_imports": num_imports,
+        "docstring_density": docstring_density,
+        "exception_density": exception_density,
+        "repeat": repeat,
+        "seed": seed,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+    }
+    results = []
+    for size in sizes:
+        code = generate_module(
+            size, num_imports, docstring_density, exception_density, seed
+        )
+        timings = {
+            abbreviation: time_strategy(abbreviation, code, repeat)
+            for abbreviation in BENCHMARKED_STRATEGIES
+        }
+        timings[PIPELINE] = time_pipeline(code, repeat)
+        results.append(
+            {"size": size, "lines": code.count("\n") + 1, "timings": timings}
+        )
+    return {"config": config, "results": results}
+
+
+def compare_results(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares benchmark results to a baseline of the same sizes.
+
+    Parameters
+    ----------
+    results (dict)
+        The results, see run_benchmark.
+    baseline (dict)
+        The baseline results.
+    tolerance (float)
+        The share a timing may exceed its baseline by before it is a
+        regression. Default is DEFAULT_TOLERANCE.
+
+    Returns
+    -------
+    list
+        The comparisons of the timings found in both, as dicts with the keys
+        size, name, baseline, current, ratio and regression.
+    """
+    baseline_timings = {
+        entry["size"]: entry["timings"] for entry in baseline["results"]
+    }
+    comparisons = []
+    for entry in results["results"]:
+        previous = baseline_timings.get(entry["size"])
+        if previous is None:
+            continue
+        for name, current in entry["timings"].items():
+            if name not in previous:
+                continue
+            ratio = current / previous[name] if previous[name] else float("inf")
+            comparisons.append(
+                {
+                    "size": entry["size"],
+                    "name": name,
+                    "baseline": previous[name],
+                    "current": current,
+                    "ratio": ratio,
+                    "regression": ratio > 1 + tolerance,
+                }
+            )
+    return comparisons
+
+
+def save_results(results, json_path):
+    """
+    Saves benchmark results as JSON.
+
+    Parameters
+    ----------
+    results (dict)
+        The results, see run_benchmark.
+    json_path (str)
+        The path to the JSON file.
+    """
+    directory = os.path.dirname(os.path.abspath(json_path))
+    os.makedirs(directory, exist_ok=True)
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=4)
+
+
+def load_results(json_path):
+    """
+    Loads benchmark results saved with save_results.
+
+    Parameters
+    ----------
+    json_path (str)
+        The path to the JSON file.
+
+    Returns
+    -------
+    dict
+        The results.
+    """
+    with open(json_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def format_results_table(results):
+    """
+    Formats benchmark results as a table of milliseconds, with a row per
+    strategy and a column per size.
+
+    Parameters
+    ----------
+    results (dict)
+        The results, see run_benchmark.
+
+    Returns
+    -------
+    str
+        The table.
+    """
+    entries = results["results"]
+    header = ["strategy"] + [f"{entry['lines']} lines" for entry in entries]
+    rows = [header]
+    for name in BENCHMARKED_STRATEGIES + [PIPELINE]:
+        rows.append(
+            [name] + [f"{entry['timings'][name] * 1000:.2f}" for entry in entries]
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows
+    )
+
+
+def main(argv=None):
+    """
+    Runs the benchmark from the command line, see --help.
+
+    Returns
+    -------
+    int
+        The exit code, 1 if a regression against the baseline is found.
+    """
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Format Python strategies on synthetic modules."
+    )
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=DEFAULT_SIZES,
+        help="Numbers of functions of the synthetic modules.",
+    )
+    parser.add_argument("--imports", type=int, default=10)
+    parser.add_argument("--docstring-density", type=float, default=0.5)
+    parser.add_argument("--exception-density", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Path to save the results as JSON.")
+    parser.add_argument("--baseline", help="Path to results to compare with.")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(
+        args.sizes,
+        args.imports,
+        args.docstring_density,
+        args.exception_density,
+        args.repeat,
+        args.seed,
+    )
+    print(format_results_table(results))
+    if args.output:
+        save_results(results, args.output)
+        print(f"Results saved to {args.output}")
+    if not args.baseline:
+        return 0
+
+    comparisons = compare_results(results, load_results(args.baseline), args.tolerance)
+    regressions = [c for c in comparisons if c["regression"]]
+    for c in regressions:
+        print(
+            f"Regression of {c['name']} at size {c['size']}: "
+            f"{c['baseline'] * 1000:.2f} ms -> {c['current'] * 1000:.2f} ms "
+            f"({c['ratio']:.2f}x)"
+        )
+    if not regressions:
+        print(f"No regressions against {args.baseline}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+import os
+import random
+
+# Modules the synthetic imports are drawn from, grouped like modules info.
+STANDARD_LIBRARY_MODULES = [
+    "collections",
+    "functools",
+    "itertools",
+    "json",
+    "math",
+    "os",
+    "re",
+    "shutil",
+    "string",
+    "sys",
+    "tempfile",
+    "time",
+]
+THIRD_PARTY_MODULES = ["numpy", "pandas", "requests", "yaml"]
+LOCAL_MODULES = ["helpers", "settings"]
+SYNTHETIC_MODULES_INFO = {
+    "standard_library": STANDARD_LIBRARY_MODULES,
+    "third_party": THIRD_PARTY_MODULES,
+    "local": LOCAL_MODULES,
+}
+WORDS = [
+    "value",
+    "file",
+    "path",
+    "result",
+    "count",
+    "item",
+    "content",
+    "entry",
+    "config",
+    "record",
+    "buffer",
+    "index",
+]
+
+
+def _generate_imports(rng, num_imports):
+    modules = STANDARD_LIBRARY_MODULES + THIRD_PARTY_MODULES + LOCAL_MODULES
+    lines = []
+    names = []
+    for i in range(num_imports):
+        module = modules[i % len(modules)]
+        if i < len(modules):
+            lines.append(f"import {module}")
+            names.append(module)
+        else:
+            # Further imports are specifiers of the modules.
+            name = f"{rng.choice(WORDS)}_{i}"
+            lines.append(f"from {module} import {name}")
+            names.append(name)
+    rng.shuffle(lines)
+    return lines, names
+
+
+def _generate_docstring(rng, indent):
+    summary = " ".join(rng.choice(WORDS) for _ in range(rng.randint(20, 40)))
+    description = " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 12)))
+    return [
+        f'{indent}"""',
+        f"{indent}{summary.capitalize()}.",
+        "",
+        f"{indent}Parameters",
+        f"{indent}----------",
+        f"{indent}path (str)",
+        f"{indent}    {description.capitalize()}.",
+        "",
+        f"{indent}Returns",
+        f"{indent}-------",
+        f"{indent}int",
+        f"{indent}    The {rng.choice(WORDS)}.",
+        f'{indent}"""',
+    ]
+
+
+def _generate_function(rng, index, used_names, docstring_density, exception_density):
+    word = rng.choice(WORDS)
+    lines = [f"def {word}_function_{index}(path, {word}=None):"]
+    if rng.random() < docstring_density:
+        lines.extend(_generate_docstring(rng, "    "))
+    comment = " ".join(rng.choice(WORDS) for _ in range(rng.randint(15, 25)))
+    lines.append(f"    # {comment.capitalize()}.   ")
+    lines.append(f"    {word}_{index} = {rng.choice(used_names)}")
+    if rng.random() < exception_density:
+        lines.extend(
+            [
+                f"    if {word} is None:",
+                f'        raise ValueError(f"No {word} given for {{path}}, '
+                f'the {rng.choice(WORDS)} cannot be read without it.")',
+                "    else:",
+                f'        message = f"{word.capitalize()} of the file"',
+            ]
+        )
+    lines.extend(
+        [
+            "    with open(path) as f:",
+            "        content = f.read()",
+            "    if not content:",
+            f"        return {word}",
+            "    else:",
+            f"        return len(content) + {index}",
+            "",
+            "",
+        ]
+    )
+    return lines
+
+
+def generate_module(
+    num_functions=20,
+    num_imports=10,
+    docstring_density=0.5,
+    exception_density=0.3,
+    seed=0,
+):
+    """
+    Generates the code of a synthetic Python module exercising the Format
+    Python strategies. It has imports, of which the unused ones are never
+    referenced, and functions with comments, opened files and redundant else
+    branches. Docstrings and raised exceptions are added to a share of the
+    functions.
+
+    Parameters
+    ----------
+    num_functions (int)
+        The number of functions, which determines the size of the module.
+        Default is 20.
+    num_imports (int)
+        The number of import statements. Default is 10.
+    docstring_density (float)
+        The share of functions with a docstring, between 0 and 1. Default is
+        0.5.
+    exception_density (float)
+        The share of functions raising an exception, between 0 and 1. Default
+        is 0.3.
+    seed (int)
+        The seed of the random generator, the same arguments generate the same
+        code. Default is 0.
+
+    Returns
+    -------
+    str
+        The code of the module.
+    """
+    for name, density in (
+        ("docstring_density", docstring_density),
+        ("exception_density", exception_density),
+    ):
+        if not 0 <= density <= 1:
+            msg = f"{name} must be between 0 and 1, got {density}."
+            raise ValueError(msg)
+    rng = random.Random(seed)
+    import_lines, imported_names = _generate_imports(rng, num_imports)
+    # Half of the imports are used, the others are removed as unused.
+    used_names = imported_names[::2] or ["None"]
+    lines = ['"""', "Synthetic module generated for benchmarking.", '"""', ""]
+    lines.extend(import_lines)
+    lines.extend(["", ""])
+    for index in range(num_functions):
+        lines.extend(
+            _generate_function(
+                rng, index, used_names, docstring_density, exception_density
+            )
+        )
+    return "\n".join(lines)
+
+
+def generate_corpus(
+    output_dir,
+    num_files,
+    num_functions=20,
+    num_imports=10,
+    docstring_density=0.5,
+    exception_density=0.3,
+    seed=0,
+):
+    """
+    Writes synthetic modules to a directory, see generate_module.
+
+    Parameters
+    ----------
+    output_dir (str)
+        The directory to write the modules to.
+    num_files (int)
+        The number of modules.
+    num_functions (int)
+        The number of functions per module. Default is 20.
+    num_imports (int)
+        The number of import statements per module. Default is 10.
+    docstring_density (float)
+        The share of functions with a docstring. Default is 0.5.
+    exception_density (float)
+        The share of functions raising an exception. Default is 0.3.
+    seed (int)
+        The seed of the first module, the following modules use the next
+        seeds. Default is 0.
+
+    Returns
+    -------
+    list
+        The paths of the written modules.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    file_paths = []
+    for i in range(num_files):
+        code = generate_module(
+            num_functions, num_imports, docstring_density, exception_density, seed + i
+        )
+        file_path = os.path.join(output_dir, f"synthetic_module_{i:04d}.py")
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.write(code)
+        file_paths.append(file_path)
+    return file_paths
+
+
+if __name__ == "__main__":
+    print(generate_module(num_functions=3))
@@ -26,3 +26,45 @@ class DIRECTORY_TREE_DEFAULTS(Enum):
     ]
 
 COPY_PROMPT_DEFAULT = False  # Does not copy the prompt by default.
+
+DIRECTORY_RUNNER_MAX_WORKERS_DEFAULT = 1  # Runs the subtasks one file at a time.
+
+DIRECTORY_RUNNER_STRATEGY_TIMING_DEFAULT = False  # Sweeps do not time the strategies.
+
+BLACK_FORMATTING_MODE_DEFAULT = "auto"  # In-process Black if compatible, else a worker.
+
+FORMAT_CACHE_MAX_ENTRIES_DEFAULT = 100000  # Keys of formatted files kept in the cache.
+
+RUNNER_UPDATE_MAX_WORKERS_DEFAULT = 4  # Runners updated in parallel by the update scripts.
+
+MAX_CONCURRENT_MACROS_DEFAULT = 1  # Resolves the macros of a prompt one at a time.
+
+WARM_PYTHON_WORKERS_DEFAULT = False  # Runs each python module in a fresh interpreter.
+
+STRATEGY_TIMING_SINK_DEFAULT = None  # Format python strategies are not timed.
+
+PYTHON_MODULE_WORKER_MAX_JOBS_DEFAULT = 50  # Modules run by a warm worker before recycling.
+
+SUMMARY_CACHE_MAX_ENTRIES_DEFAULT = 10000  # Python file summaries kept in the cache.
+
+SUMMARY_CACHE_MAX_SIZE_DEFAULT = 64 * 1024**2  # Total characters of cached summaries.
+
+PYLINT_JOBS_DEFAULT = 0  # Parallel pylint processes for reports, 0 uses all CPUs.
+
+PYLINT_CHUNK_SIZE_DEFAULT = 200  # Maximum number of files per batched pylint run.
+
+IGNORE_PATTERNS_DEFAULT = [  # Gitignore-style patterns pruned from path resolution.
+    ".git/",
+    "venv/",
+    ".venv/",
+    "node_modules/",
+    "__pycache__/",
+    "__taskscache__/",
+    "tasks_storage/",
+    "build/",
+    "dist/",
+    "*.egg-info/",
+    ".mypy_cache/",
+    ".pytest_cache/",
+    ".tox/",
+]
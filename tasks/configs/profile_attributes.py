@@ -8,9 +8,23 @@ from tasks.configs.constants import (
     TASKS_CACHE,
     MAX_BACKUPS,
 )
-from tasks.configs.defaults import COPY_PROMPT_DEFAULT
+from tasks.configs.defaults import (
+    BLACK_FORMATTING_MODE_DEFAULT,
+    COPY_PROMPT_DEFAULT,
+    DIRECTORY_RUNNER_MAX_WORKERS_DEFAULT,
+    DIRECTORY_RUNNER_STRATEGY_TIMING_DEFAULT,
+    IGNORE_PATTERNS_DEFAULT,
+    MAX_CONCURRENT_MACROS_DEFAULT,
+    STRATEGY_TIMING_SINK_DEFAULT,
+    WARM_PYTHON_WORKERS_DEFAULT,
+)
 from tasks.management.standardize_path import standardize_path
 from tasks.utils.shared.execute_python_module import execute_python_module
+from tasks.utils.shared.modules_info_cache import (
+    get_modules_info_fingerprint,
+    load_cached_modules_info,
+    store_modules_info,
+)
 import tasks.utils.shared.retrieve_modules as retrieve_modules
 
 
@@ -44,11 +58,17 @@ class ProfileAttrNames(Enum):
     copy_prompt = (20, "configs.json")
     modules_info = (21, "modules_info.json")
     directory_runner_config = (22, "directory_runner_template.json")
+    ignore_patterns = (23, "configs.json")
+    black_formatting_mode = (24, "configs.json")
+    max_concurrent_macros = (25, "configs.json")
+    warm_python_workers = (26, "configs.json")
+    strategy_timing_sink = (27, "configs.json")
 
 
 UPDATE_MAPPING = {
     # New Name: Old Name
     # Old Name None is accepted
+    # Old Names missing in the profile are initialized
     "cwd": "cwd",
     "runner_python_env": "runner_python_env",
     "tasks_cache": "tasks_cache",
@@ -71,6 +91,11 @@ UPDATE_MAPPING = {
     "copy_prompt": "copy_prompt",
     "modules_info": None,  # Forces update of modules_info
     "directory_runner_config": "directory_runner_config",
+    "ignore_patterns": "ignore_patterns",
+    "black_formatting_mode": "black_formatting_mode",
+    "max_concurrent_macros": "max_concurrent_macros",
+    "warm_python_workers": "warm_python_workers",
+    "strategy_timing_sink": "strategy_timing_sink",
 }
 
 
@@ -254,11 +279,17 @@ class AttributesInitializer:
     def _initialize_modules_info(cls, primary_attrs):
         """
         Initializes the modules information by retrieving and loading the
-        modules_info.json file.
+        modules_info.json file. The retrieval is skipped if the site-packages
+        and the working directory are unchanged since the last retrieval.
         """
         storage_dir = primary_attrs.get("storage_dir")
         cwd = primary_attrs.get("cwd")
         runner_python_env = primary_attrs.get("runner_python_env")
+        fingerprint = get_modules_info_fingerprint(runner_python_env, cwd)
+        modules_info = load_cached_modules_info(runner_python_env, cwd, fingerprint)
+        if modules_info is not None:
+            return modules_info
+
         profile_dir = os.path.join(storage_dir, PROFILE_SUBFOLDER)
         os.makedirs(profile_dir, exist_ok=True)
         name = ProfileAttrNames.modules_info.value[1]
@@ -275,6 +306,9 @@ class AttributesInitializer:
         with open(module_info_json, "r") as f:
             modules_info = json.load(f)
 
+        store_modules_info(
+            runner_python_env, cwd, fingerprint, modules_info["modules_info"]
+        )
         return modules_info["modules_info"]
 
     @classmethod
@@ -290,6 +324,8 @@ class AttributesInitializer:
             "excluded_files": ["only_py_file_name.py"],
             "excluded_dirs": ["/must/be/absolute"],
             "clear_backup_storage": True,
+            "max_workers": DIRECTORY_RUNNER_MAX_WORKERS_DEFAULT,
+            "strategy_timing": DIRECTORY_RUNNER_STRATEGY_TIMING_DEFAULT,
         }
         return config
     
@@ -299,3 +335,42 @@ class AttributesInitializer:
         Initializes the save prompt to clipboard flag.
         """
         return COPY_PROMPT_DEFAULT
+
+    @classmethod
+    def _initialize_ignore_patterns(cls, _):
+        """
+        Initializes the gitignore-style patterns excluded from path
+        resolution and directory walks.
+        """
+        return list(IGNORE_PATTERNS_DEFAULT)
+
+    @classmethod
+    def _initialize_black_formatting_mode(cls, _):
+        """
+        Initializes how Black formatting is run by the format python task.
+        """
+        return BLACK_FORMATTING_MODE_DEFAULT
+
+    @classmethod
+    def _initialize_max_concurrent_macros(cls, _):
+        """
+        Initializes the maximum number of macros resolved concurrently by the
+        automatic prompt task.
+        """
+        return MAX_CONCURRENT_MACROS_DEFAULT
+
+    @classmethod
+    def _initialize_warm_python_workers(cls, _):
+        """
+        Initializes whether the automatic prompt task runs python modules in
+        warm worker processes.
+        """
+        return WARM_PYTHON_WORKERS_DEFAULT
+
+    @classmethod
+    def _initialize_strategy_timing_sink(cls, _):
+        """
+        Initializes where the format python task records the timings of its
+        strategies.
+        """
+        return STRATEGY_TIMING_SINK_DEFAULT
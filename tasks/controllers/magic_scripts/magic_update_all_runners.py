@@ -1,29 +1,43 @@
 import os
 
+from tasks.configs.defaults import RUNNER_UPDATE_MAX_WORKERS_DEFAULT
 from tasks.controllers.shared.TASKS_ROOT import TASKS_ROOT
 from tasks.controllers.magic_scripts.magic_register_runner import allocate_vscode_tasks_json
 from tasks.management.task_manager import TaskManager
 
 
-def magic_update_all_runners():
+def _copy_templates_to(runner_root):
+    if runner_root == TASKS_ROOT:
+        return
+    TaskManager.copy_costumizations_files(TASKS_ROOT, runner_root)
+    allocate_vscode_tasks_json(runner_root)
+    print(f"Runner {os.path.basename(runner_root)} updated successfully.")
+
+
+def magic_update_all_runners(max_workers=RUNNER_UPDATE_MAX_WORKERS_DEFAULT):
     """
     A Magic function that not only updates all the registered runners but also
     copies the templates files from the main tasks root to the target runner
-    root and allocates the '.vscode/tasks.json'.
-    """
-    TaskManager.update_registered_runners()
+    root and allocates the '.vscode/tasks.json'. The runners are updated in
+    parallel processes, a failing runner does not abort the others.
 
-    runners = TaskManager.get_registered_runners()
+    Parameters
+    ----------
+    max_workers (int)
+        The number of runners updated in parallel.
 
-    for runner in runners:
-        runner_root = runner if isinstance(runner, str) else runner.root
-        if runner_root == TASKS_ROOT:
-            continue
-        TaskManager.copy_costumizations_files(TASKS_ROOT, runner)
-        allocate_vscode_tasks_json(runner)
-        print(f"Runner {os.path.basename(runner_root)} updated successfully.")
+    Returns
+    -------
+    dict
+        The error tracebacks of the failed runners by runner root.
+    """
+    return TaskManager.update_registered_runners(
+        max_workers=max_workers, post_update=_copy_templates_to
+    )
 
 
 if __name__ == "__main__":
-    magic_update_all_runners()
-    print("All runners updated successfully.")
+    if failures := magic_update_all_runners():
+        print(f"{len(failures)} runner(s) failed to update.")
+    else:
+        print("All runners updated successfully.")
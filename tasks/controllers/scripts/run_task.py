@@ -0,0 +1,24 @@
+"""
+Thin client running a task in the task daemon, see
+tasks/management/task_daemon.py. If no daemon is running, the task is run in
+this process instead.
+
+Usage: python run_task.py <task_name> <runner_root> [args...]
+"""
+
+import os
+import runpy
+import sys
+
+from tasks.management.task_daemon import get_task_script, request_task
+
+if __name__ == "__main__":
+    task_name, runner_root, *args = sys.argv[1:]
+    exit_code = request_task(task_name, runner_root, args)
+    if exit_code is not None:
+        sys.exit(exit_code)
+
+    script = get_task_script(task_name)
+    sys.argv = [script, runner_root, *args]
+    sys.path.insert(0, os.path.dirname(script))
+    runpy.run_path(script, run_name="__main__")
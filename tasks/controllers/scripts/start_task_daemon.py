@@ -0,0 +1,5 @@
+from tasks.management.task_daemon import TaskDaemon
+
+if __name__ == "__main__":
+    # Runs until interrupted, tasks are requested with run_task.py.
+    TaskDaemon().serve_forever()
@@ -1,7 +1,10 @@
+from tasks.configs.defaults import RUNNER_UPDATE_MAX_WORKERS_DEFAULT
 from tasks.management.task_manager import TaskManager
 
 if __name__ == "__main__":
     task_manager = TaskManager()
 
-    task_manager.update_registered_runners()
+    task_manager.update_registered_runners(
+        max_workers=RUNNER_UPDATE_MAX_WORKERS_DEFAULT
+    )
     # Do not forget to to update UPDATE_MAPPING in tasks/configs/profile_attributes.py
@@ -0,0 +1,427 @@
+"""
+A long-lived daemon that runs tasks without paying the start up of a new
+Python process for every task.
+
+The daemon imports all task modules once, and keeps the profiles and file
+indexes of the runners it served warm. It listens on a Unix domain socket for
+requests of thin clients, see request_task. Every request is run in a process
+forked from the daemon, so tasks are isolated from each other but start with
+everything already imported. The client passes its standard streams along
+with the request, so the task writes to the client's terminal directly, and
+the exit code of the task is sent back to the client.
+
+Only this module's standard library imports are loaded by clients.
+"""
+
+import atexit
+import importlib
+import json
+import os
+import runpy
+import selectors
+import signal
+import socket
+import sys
+import tempfile
+import traceback
+
+from tasks.configs.constants import TASKS_ROOT
+
+TASKS_DIR = os.path.join(TASKS_ROOT, "tasks", "tasks")
+TASK_NAMES = [
+    "automatic_prompt",
+    "directory_runner",
+    "format_python",
+    "git_discard",
+    "git_staging",
+    "pylint_report",
+    "restore_file",
+    "undo_directory_runner",
+]
+# Dependencies the tasks import lazily, preloaded as well by the daemon.
+LAZILY_IMPORTED_MODULES = [
+    "clipboard",
+    "openai",
+    "PIL.Image",
+    "PIL.ImageTk",
+    "pyperclip",
+    "rich.console",
+    "rich.table",
+    "tkinter",
+]
+SOCKET_NAME = "task_daemon.sock"
+REQUEST_TIMEOUT = 10  # Seconds a client may take to send its request.
+
+
+def get_daemon_socket_path():
+    """
+    Returns the path to the socket of the daemon. The socket is placed in a
+    directory only accessible by the current user.
+
+    Returns
+    -------
+    str
+        The path to the socket.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    socket_dir = os.path.join(runtime_dir, f"code_accelerator_kit-{os.getuid()}")
+    os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+    stat = os.stat(socket_dir)
+    if stat.st_uid != os.getuid() or stat.st_mode & 0o077:
+        msg = f"Directory '{socket_dir}' of the task daemon socket is not private."
+        raise PermissionError(msg)
+    return os.path.join(socket_dir, SOCKET_NAME)
+
+
+def get_task_script(task_name):
+    """
+    Returns the script of a task.
+
+    Parameters
+    ----------
+    task_name (str)
+        The name of the task, the name of its directory in tasks/tasks, e.g.
+        'format_python'.
+
+    Returns
+    -------
+    str
+        The path to the script.
+    """
+    if task_name not in TASK_NAMES:
+        msg = f"Unknown task '{task_name}', expected one of {TASK_NAMES}."
+        raise ValueError(msg)
+    return os.path.join(TASKS_DIR, task_name, f"{task_name}_task.py")
+
+
+def _read_line(connection):
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = connection.recv(65536)
+        if not chunk:
+            return None
+        data += chunk
+    return json.loads(data)
+
+
+def request_task(task_name, runner_root, args, socket_path=None):
+    """
+    Runs a task in the daemon. The task writes to the standard streams of the
+    calling process.
+
+    Parameters
+    ----------
+    task_name (str)
+        The name of the task, see get_task_script.
+    runner_root (str)
+        The root directory of the runner.
+    args (list)
+        The additional arguments of the task.
+    socket_path (str, optional)
+        The path to the socket of the daemon. Defaults to
+        get_daemon_socket_path().
+
+    Returns
+    -------
+    int or None
+        The exit code of the task, or None if no daemon is running.
+    """
+    get_task_script(task_name)
+    socket_path = socket_path or get_daemon_socket_path()
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        try:
+            connection.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        request = {
+            "task_name": task_name,
+            "runner_root": runner_root,
+            "args": list(args),
+            "cwd": os.getcwd(),
+            "env": dict(os.environ),
+        }
+        sys.stdout.flush()
+        sys.stderr.flush()
+        socket.send_fds(connection, [b"\0"], [0, 1, 2])
+        connection.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        try:
+            response = _read_line(connection)
+        except KeyboardInterrupt:
+            # Closing the connection interrupts the task.
+            return 130
+    finally:
+        connection.close()
+    if response is None:
+        print("Task daemon closed the connection.", file=sys.stderr)
+        return 1
+    exit_code = response["exit_code"]
+    # Like a shell, report tasks killed by a signal with 128 + signal number.
+    return exit_code if exit_code >= 0 else 128 - exit_code
+
+
+# The type of each field of a request, see request_task.
+REQUEST_FIELDS = {
+    "task_name": str,
+    "runner_root": str,
+    "args": list,
+    "cwd": str,
+    "env": dict,
+}
+
+
+def _validate_request(request):
+    if not isinstance(request, dict):
+        msg = f"Request must be a JSON object, got {type(request).__name__}."
+        raise ValueError(msg)
+    for field, type_ in REQUEST_FIELDS.items():
+        if not isinstance(request.get(field), type_):
+            msg = f"Request field '{field}' is missing or not a {type_.__name__}."
+            raise ValueError(msg)
+    get_task_script(request["task_name"])
+
+
+def _get_exit_code(system_exit):
+    # Mirrors how the interpreter turns SystemExit into an exit code.
+    code = system_exit.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def _run_task(request):
+    """
+    Runs a task as __main__ in the current process, like the interpreter runs
+    a script, and returns its exit code.
+    """
+    script = get_task_script(request["task_name"])
+    try:
+        os.chdir(request["cwd"])
+        os.environ.clear()
+        os.environ.update(request["env"])
+        sys.argv = [script, request["runner_root"], *request["args"]]
+        sys.path.insert(0, os.path.dirname(script))
+        runpy.run_path(script, run_name="__main__")
+        return 0
+    except SystemExit as e:
+        return _get_exit_code(e)
+    except BaseException as e:  # pylint: disable=broad-except
+        # Frames of the daemon and runpy are not part of the task's traceback.
+        tb = e.__traceback__
+        while tb is not None and tb.tb_frame.f_code.co_filename != script:
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb or e.__traceback__)
+        return 1
+
+
+class TaskDaemon:
+    """
+    Daemon serving task requests on a Unix domain socket, see the module
+    docstring.
+
+    Attributes
+    ----------
+    socket_path (str)
+        The path to the socket the daemon listens on.
+    """
+
+    def __init__(self, socket_path=None):
+        """
+        Initialize the TaskDaemon instance.
+
+        Parameters
+        ----------
+        socket_path (str, optional)
+            The path to the socket. Defaults to get_daemon_socket_path().
+        """
+        self.socket_path = socket_path or get_daemon_socket_path()
+        self._selector = None
+        self._listener = None
+        self._stopping = False
+        self._wakeup_fds = None
+        # The connection of every running task by the pid of its process.
+        self._connections = {}
+        # Connections of tasks interrupted because their client has gone away.
+        self._interrupted = set()
+
+    def _import_tasks(self):
+        modules = [
+            f"tasks.tasks.{task_name}.{task_name}_task" for task_name in TASK_NAMES
+        ]
+        for module in modules + LAZILY_IMPORTED_MODULES:
+            try:
+                importlib.import_module(module)
+            except Exception as e:  # pylint: disable=broad-except
+                # The task reports the error itself once it needs the module.
+                print(f"Module {module} not preloaded: {e}", file=sys.stderr)
+
+    def _warm_runner(self, runner_root):
+        from tasks.management.task_runner_profile import TaskRunnerProfile
+        from tasks.utils.shared.file_index import get_file_index
+
+        try:
+            profile = TaskRunnerProfile(runner_root)
+            profile.attributes  # pylint: disable=pointless-statement
+            get_file_index(profile.root, profile.data_dir, profile.ignore_patterns)
+        except Exception:  # pylint: disable=broad-except
+            # Errors are reported by the task, which loads the profile again.
+            pass
+
+    def _bind(self):
+        if os.path.exists(self.socket_path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+            except ConnectionRefusedError:
+                os.remove(self.socket_path)  # Left by a daemon that died.
+            else:
+                msg = f"A task daemon is already listening on {self.socket_path}."
+                raise RuntimeError(msg)
+            finally:
+                probe.close()
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        self._listener.listen()
+
+    def _handle_signal(self, signum, frame):  # pylint: disable=unused-argument
+        if signum != signal.SIGCHLD:
+            self._stopping = True
+
+    def _accept(self):
+        connection, _ = self._listener.accept()
+        fds = []
+        try:
+            connection.settimeout(REQUEST_TIMEOUT)
+            _, fds, _, _ = socket.recv_fds(connection, 1, 3)
+            request = _read_line(connection)
+            if request is None or len(fds) != 3:
+                connection.close()
+                return
+            _validate_request(request)
+            self._warm_runner(request["runner_root"])
+            pid = os.fork()
+            if pid == 0:
+                self._run_child(request, fds)
+        except (OSError, ValueError) as e:
+            print(f"Invalid task request: {e}", file=sys.stderr)
+            connection.close()
+            return
+        finally:
+            for fd in fds:
+                os.close(fd)
+        connection.setblocking(False)
+        self._connections[pid] = connection
+        self._selector.register(connection, selectors.EVENT_READ, pid)
+
+    def _run_child(self, request, fds):
+        # The child must never return into the serve loop of the daemon, as
+        # it would serve requests and remove the socket of the daemon on exit.
+        exit_code = 1
+        try:
+            signal.set_wakeup_fd(-1)
+            for signum in (signal.SIGCHLD, signal.SIGTERM):
+                signal.signal(signum, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            self._selector.close()
+            self._listener.close()
+            for fd in self._wakeup_fds:
+                os.close(fd)
+            for connection in self._connections.values():
+                connection.close()
+            for target_fd, fd in enumerate(fds):
+                os.dup2(fd, target_fd)
+            sys.stdin = open(0, "r", closefd=False)
+            sys.stdout = open(1, "w", buffering=1, closefd=False)
+            sys.stderr = open(2, "w", buffering=1, closefd=False)
+            exit_code = _run_task(request)
+            atexit._run_exitfuncs()  # pylint: disable=protected-access
+        except BaseException:  # pylint: disable=broad-except
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally:
+                os._exit(exit_code)
+
+    def _reap_children(self, block=False):
+        while self._connections:
+            try:
+                pid, status = os.waitpid(-1, 0 if block else os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            connection = self._connections.pop(pid, None)
+            if connection is None:
+                continue
+            if connection in self._interrupted:
+                self._interrupted.remove(connection)
+            else:
+                self._selector.unregister(connection)
+            response = {"exit_code": os.waitstatus_to_exitcode(status)}
+            try:
+                connection.setblocking(True)
+                connection.sendall(json.dumps(response).encode("utf-8") + b"\n")
+            except OSError:
+                pass  # The client has gone away.
+            connection.close()
+
+    def _handle_client_event(self, connection, pid):
+        # Clients send nothing after their request, so the connection became
+        # readable because the client has gone away. Its task is interrupted.
+        try:
+            data = connection.recv(1)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+        if not data:
+            self._selector.unregister(connection)
+            self._interrupted.add(connection)
+            try:
+                os.kill(pid, signal.SIGINT)
+            except ProcessLookupError:
+                pass
+
+    def serve_forever(self):
+        """
+        Serves task requests until the daemon receives SIGTERM or SIGINT.
+        Running tasks are completed before the daemon exits.
+        """
+        self._import_tasks()
+        self._bind()
+        self._selector = selectors.DefaultSelector()
+        self._wakeup_fds = os.pipe()
+        for fd in self._wakeup_fds:
+            os.set_blocking(fd, False)
+        signal.set_wakeup_fd(self._wakeup_fds[1])
+        for signum in (signal.SIGCHLD, signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self._handle_signal)
+        self._selector.register(self._listener, selectors.EVENT_READ)
+        self._selector.register(self._wakeup_fds[0], selectors.EVENT_READ)
+        print(f"Task daemon listening on {self.socket_path}")
+        try:
+            while not self._stopping:
+                for key, _ in self._selector.select():
+                    if key.fileobj is self._listener:
+                        self._accept()
+                    elif key.fileobj == self._wakeup_fds[0]:
+                        os.read(self._wakeup_fds[0], 4096)
+                    else:
+                        self._handle_client_event(key.fileobj, key.data)
+                self._reap_children()
+        finally:
+            self._listener.close()
+            os.remove(self.socket_path)
+            self._reap_children(block=True)
+            signal.set_wakeup_fd(-1)
+            self._selector.close()
+            for fd in self._wakeup_fds:
+                os.close(fd)
+            print("Task daemon stopped")
@@ -1,6 +1,11 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stderr, redirect_stdout
 import json
 import os
 import shutil
+import sys
+import tempfile
+import traceback
 import warnings
 
 from tasks.configs.constants import REGISTERED_RUNNERS_JSON, TASKS_ROOT
@@ -11,6 +16,47 @@ from tasks.management.task_runner_profile import TaskRunnerProfile
 SUPPORT_FILES_DIR = os.path.join(TASKS_ROOT, "tasks", "management", "support_files")
 
 
+def _update_runner_capturing_output(runner_root, post_update=None):
+    """
+    Updates a runner, capturing its output and errors. Used as the work item
+    of the parallel runner update.
+
+    Returns
+    -------
+    tuple
+        The runner root, the captured output and the error traceback, which is
+        None if the update succeeded.
+    """
+    error = None
+    # The file descriptors 1 and 2 are redirected as well, so output of
+    # subprocesses is captured.
+    sys.stdout.flush()
+    sys.stderr.flush()
+    saved_fds = [os.dup(1), os.dup(2)]
+    with tempfile.TemporaryFile() as output_file, open(
+        output_file.fileno(), "w", encoding="utf-8", buffering=1, closefd=False
+    ) as output_stream:
+        try:
+            os.dup2(output_file.fileno(), 1)
+            os.dup2(output_file.fileno(), 2)
+            with redirect_stdout(output_stream), redirect_stderr(output_stream):
+                try:
+                    TaskManager.update_runner(runner_root)
+                    if post_update is not None:
+                        post_update(runner_root)
+                except Exception:
+                    error = traceback.format_exc()
+            output_stream.flush()
+        finally:
+            os.dup2(saved_fds[0], 1)
+            os.dup2(saved_fds[1], 2)
+            for fd in saved_fds:
+                os.close(fd)
+        output_file.seek(0)
+        output = output_file.read().decode("utf-8", errors="replace")
+    return runner_root, output, error
+
+
 class TaskManager(Attributes.AttributesInitializer):
     """
     Manages the registration and initialization of new task runners.
@@ -292,19 +338,77 @@ class TaskManager(Attributes.AttributesInitializer):
         TaskManager.sync_directories_of(runner)
 
     @classmethod
-    def update_registered_runners(cls):
+    def update_registered_runners(cls, max_workers=1, post_update=None):
         """
-        Updates the attributes of all registered runners.
+        Updates the attributes of all registered runners. A failing runner
+        does not abort the update of the others, its error is reported and
+        returned.
+
+        Parameters
+        ----------
+        max_workers (int, optional)
+            The number of runners updated in parallel processes. 1 updates
+            the runners one after another in this process. Defaults to 1.
+        post_update (callable, optional)
+            A module level function called with the runner root after each
+            successful update, in the same process. Defaults to None.
+
+        Returns
+        -------
+        dict
+            The error tracebacks of the failed runners by runner root.
         """
         with open(REGISTERED_RUNNERS_JSON, "r", encoding="utf-8") as f:
             registered_runners = json.load(f)
-        for runner_root in registered_runners:
+        failures = {}
+        total = len(registered_runners)
+
+        def report(index, runner_root, output, error):
             runner_name = os.path.basename(runner_root)
-            print(f"Updating runner {runner_name}...")
-            cls.update_runner(runner_root)
-            print(f"Runner {runner_name} updated.")
+            print(f"[{index}/{total}] Runner {runner_name}")
+            if output:
+                print(output.rstrip())
+            if error:
+                failures[runner_root] = error
+                print(f"Runner {runner_name} failed:\n{error}")
+            else:
+                print(f"Runner {runner_name} updated.")
             print()
 
+        if max_workers > 1 and total > 1:
+            with ProcessPoolExecutor(min(max_workers, total)) as executor:
+                futures = {
+                    executor.submit(
+                        _update_runner_capturing_output, runner_root, post_update
+                    ): runner_root
+                    for runner_root in registered_runners
+                }
+                for index, future in enumerate(as_completed(futures), start=1):
+                    try:
+                        result = future.result()
+                    except Exception:
+                        # E.g. BrokenProcessPool if a worker died, which fails
+                        # the runners still pending in the pool as well.
+                        result = (futures[future], "", traceback.format_exc())
+                    report(index, *result)
+        else:
+            for index, runner_root in enumerate(registered_runners, start=1):
+                runner_name = os.path.basename(runner_root)
+                print(f"Updating runner {runner_name}...")
+                error = None
+                try:
+                    cls.update_runner(runner_root)
+                    if post_update is not None:
+                        post_update(runner_root)
+                except Exception:
+                    error = traceback.format_exc()
+                report(index, runner_root, "", error)
+
+        print(f"Updated runners: {total - len(failures)} / {total}")
+        for runner_root in failures:
+            print(f"Failed runner: {runner_root}")
+        return failures
+
     @classmethod
     def delete_runner(cls, runner_root):
         """
@@ -1,4 +1,3 @@
-#TODO Maybe its not good to load attributes twice, so make flag or so
 from copy import deepcopy
 import json
 import os
@@ -9,11 +8,57 @@ import tasks.configs.constants as configs
 from tasks.management.standardize_path import standardize_path
 import tasks.configs.profile_attributes as Attributes
 
+# Contents of registered runners and profile files by path, with the
+# modification time and size they were read at. Values are shared between
+# profiles of the process and must not be modified in place.
+_FILE_CACHE = {}
+
+
+def _get_file_signature(file_path):
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_cached_file(file_path):
+    """
+    Loads a JSON or pickle file, reusing the content loaded before in the
+    process if the modification time and size of the file are unchanged.
+
+    Parameters
+    ----------
+    file_path (str)
+        The path to the file.
+
+    Returns
+    -------
+    Any
+        The content of the file. It must not be modified in place.
+    """
+    signature = _get_file_signature(file_path)
+    cached = _FILE_CACHE.get(file_path)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    if file_path.endswith(".pkl"):
+        with open(file_path, "rb") as f:
+            content = pickle.load(f)
+    else:
+        with open(file_path, "r", encoding="utf-8") as f:
+            content = json.load(f)
+    _FILE_CACHE[file_path] = (signature, content)
+    return content
+
 
 class TaskRunnerProfile:
     """
     Stores the TaskRunnerProfile, including loading and saving attributes.
 
+    Attributes from storage are loaded lazily: a profile file is read when
+    one of its attributes is accessed first. File contents are cached for the
+    process, keyed by the file modification times, so profiles created
+    repeatedly, e.g. by the subtasks of a directory runner, share a single
+    load. Attribute values must therefore not be modified in place, use
+    get_attribute_copy instead.
+
     Parameters
     ----------
     runner_root (str)
@@ -27,6 +72,7 @@ class TaskRunnerProfile:
         self._storage_dir = self._get_storage_dir(self.root)
         self._profile_dir = os.path.join(self.storage_dir, configs.PROFILE_SUBFOLDER)
         self._all_attributes = {}
+        self._pending_files = []
         if load_attributes_from_storage:
             self.load_attributes_from_storage()
 
@@ -77,8 +123,54 @@ class TaskRunnerProfile:
         dict
             The attributes dictionary.
         """
+        self._load_pending_files()
         return self._all_attributes
 
+    def __getattr__(self, name):
+        """
+        Loads the pending profile file of an attribute that is accessed for
+        the first time. Unknown attributes load all pending files.
+        """
+        if not self.__dict__.get("_pending_files") or name.startswith("__"):
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+        self._load_pending_file_of(name)
+        if name in self._all_attributes:
+            return self._all_attributes[name]
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    def _load_pending_file_of(self, attribute_name):
+        """
+        Loads the pending profile file of an attribute, or all pending files
+        if the file of the attribute is unknown.
+        """
+        member = Attributes.ProfileAttrNames.__members__.get(attribute_name)
+        file_name = member.value[1] if member is not None else None
+        if file_name in self._pending_files:
+            self._load_pending_files([file_name])
+        else:
+            self._load_pending_files()
+
+    def _load_pending_files(self, file_names=None):
+        """
+        Loads attributes of pending profile files.
+
+        Parameters
+        ----------
+        file_names (list, optional)
+            The names of the files to load. Defaults to all pending files.
+        """
+        if file_names is None:
+            file_names = list(self._pending_files)
+        for file_name in file_names:
+            self._pending_files.remove(file_name)
+            file_path = os.path.join(self.profile_dir, file_name)
+            for name, value in load_cached_file(file_path).items():
+                self._store_attribute(name, value)
+
     def _get_storage_dir(self, runner_root):
         """
         Determines the storage directory based on the registration data of
@@ -94,8 +186,7 @@ class TaskRunnerProfile:
         str
             The storage directory path.
         """
-        with open(configs.REGISTERED_RUNNERS_JSON, "r", encoding="utf-8") as f:
-            registered_variables = json.load(f)
+        registered_variables = load_cached_file(configs.REGISTERED_RUNNERS_JSON)
         if runner_root not in registered_variables:
             msg = f"Runner root {runner_root} is not registered."
             raise ValueError(msg)
@@ -112,6 +203,12 @@ class TaskRunnerProfile:
         attribute_value (Any)
             The value of the attribute.
         """
+        # The value set overrides the value of a profile file loaded later
+        if self._pending_files:
+            self._load_pending_file_of(attribute_name)
+        self._store_attribute(attribute_name, attribute_value)
+
+    def _store_attribute(self, attribute_name, attribute_value):
         if attribute_name not in Attributes.ProfileAttrNames.__members__.keys():
             warnings.warn(f"Attribute {attribute_name} is not defined in the ProfileAttrNames.")
         setattr(self, attribute_name, attribute_value)
@@ -131,6 +228,7 @@ class TaskRunnerProfile:
         Any
             A deep copy of the attribute.
         """
+        self._load_pending_files()
         if attribute_name not in self._all_attributes:
             msg = f"Attribute {attribute_name} is not present in the attributes."
             raise AttributeError(msg)
@@ -140,6 +238,7 @@ class TaskRunnerProfile:
         """
         Clears all attributes.
         """
+        self._pending_files = []
         for attr in self._all_attributes:
             delattr(self, attr)
         self._all_attributes = {}
@@ -158,28 +257,22 @@ class TaskRunnerProfile:
 
     def load_attributes_from_storage(self):
         """
-        Loads attributes from the storage/configs directory.
+        Loads attributes from the storage/configs directory. The files are
+        read when their attributes are accessed first.
         """
         if not os.path.isdir(self.profile_dir):
             msg = f"Directory {self.profile_dir} does not exist. Please register the runner properly."
             raise NotADirectoryError(msg)
-        attributes_dict = {}
         for dir_ in os.listdir(self.profile_dir):
-            if dir_.endswith(".json"):
-                with open(
-                    os.path.join(self.profile_dir, dir_), "r", encoding="utf-8"
-                ) as f:
-                    attributes_dict = json.load(f)
-                self.load_attributes_from_dict(attributes_dict)
-            elif dir_.endswith(".pkl"):
-                with open(os.path.join(self.profile_dir, dir_), "rb") as f:
-                    attributes_dict = pickle.load(f)
-                self.load_attributes_from_dict(attributes_dict)
+            if dir_.endswith((".json", ".pkl")) and dir_ not in self._pending_files:
+                self._pending_files.append(dir_)
                 
     def update_attributes(self, reinitialized_attrs):
         """
         Updates the attributes with the reinitialized attributes. The update
-        depends on the UPDATE_MAPPING parameter.
+        depends on the UPDATE_MAPPING parameter. Attributes whose old name is
+        not present in the profile, e.g. newly introduced attributes, take the
+        reinitialized value.
 
         Parameters
         ----------
@@ -187,12 +280,13 @@ class TaskRunnerProfile:
             A dictionary containing the reinitialized attributes. It is
             expected that the keys corresponds to ProfileAttrNames.
         """
+        self._load_pending_files()
         updated_attrs = {}
         for reinit_name in reinitialized_attrs:
             if reinit_name not in Attributes.UPDATE_MAPPING:
                 raise AttributeError(f"Attribute {reinit_name} is not in the update mapping.")
             old_name = Attributes.UPDATE_MAPPING[reinit_name]
-            if old_name is None:
+            if old_name is None or old_name not in self._all_attributes:
                 updated_attrs[reinit_name] = reinitialized_attrs[reinit_name]
             else:
                 updated_attrs[reinit_name] = self.get_attribute_copy(old_name)
@@ -2,10 +2,13 @@ import os
 import subprocess
 import sys
 import time
-import tkinter as tk
 import warnings
 
-from PIL import Image, ImageTk
+from tasks.utils.shared.lazy_import import lazy_import
+
+tk = lazy_import("tkinter")
+Image = lazy_import("PIL.Image")
+ImageTk = lazy_import("PIL.ImageTk")
 
 WIN_WIDTH_PERCENTAGE = 0.5
 WIN_HEIGHT_PERCENTAGE = 0.5
@@ -1,7 +1,6 @@
 import os
 import subprocess
-
-import clipboard
+import threading
 
 from tasks.configs.constants import AUTOMATIC_PROMPT_MACROS as MACROS
 from tasks.tasks.automatic_prompt.line_validation import (
@@ -38,24 +37,40 @@ from tasks.utils.for_automatic_prompt.find_file_in_1st_level_subdir import (
 from tasks.utils.for_automatic_prompt.generate_directory_tree import (
     generate_directory_tree,
 )
-from tasks.utils.for_automatic_prompt.get_declaration_block import get_declaration_block
+from tasks.utils.for_automatic_prompt.get_declaration_block import (
+    get_declaration_index,
+)
 from tasks.utils.for_automatic_prompt.render_to_markdown_code_block import (
     render_to_markdown_code_block,
 )
 from tasks.utils.for_automatic_prompt.summarize_python_script import (
-    summarize_python_file,
+    summarize_python_files,
 )
+from tasks.utils.for_automatic_prompt.summary_cache import SummaryCache
 from tasks.utils.shared.execute_pylint import execute_pylint
 from tasks.utils.shared.execute_python_module import execute_python_module
 from tasks.utils.shared.find_closest_matching_dir import find_closest_matching_dir
 from tasks.utils.shared.find_closest_matching_file import find_closest_matching_file
 from tasks.utils.shared.format_identifiers_as_code import format_identifiers_as_code
+from tasks.utils.shared.ignore_patterns import walk_with_ignore_patterns
+from tasks.utils.shared.lazy_import import lazy_import
 from tasks.utils.shared.path_helpers import standardize_path
 
+clipboard = lazy_import("clipboard")
+
+# Serializes path resolution of macros resolved in pool threads, which share
+# the file index with the main thread.
+_PATH_RESOLUTION_LOCK = threading.Lock()
+
 
 class AutomaticPromptInterpreter(MacroInterpreter):
     """
     Interpreter for creating a prompt from macros within text lines.
+
+    Macros running scripts, subprocesses, pylint, unittests, costum functions
+    and meta macros with arguments are resolved through defer, so with
+    max_concurrent_macros above 1 they run concurrently while their output
+    keeps the order of the lines.
     """
 
     def _check_exists(self, file_path, usage_description):
@@ -72,6 +87,37 @@ class AutomaticPromptInterpreter(MacroInterpreter):
             msg = f"Cannot read file {file_path} for {usage_description}. "
             raise UnicodeDecodeError(msg) from e
 
+    def _find_closest_file(self, sloppy_string):
+        with _PATH_RESOLUTION_LOCK:
+            return find_closest_matching_file(
+                sloppy_string,
+                self.profile.root,
+                self.current_file,
+                index_dir=self.profile.data_dir,
+                ignore_patterns=self.profile.ignore_patterns,
+            )
+
+    def _find_closest_dir(self, partial_path):
+        with _PATH_RESOLUTION_LOCK:
+            return find_closest_matching_dir(
+                partial_path,
+                self.profile.root,
+                self.current_file,
+                index_dir=self.profile.data_dir,
+                ignore_patterns=self.profile.ignore_patterns,
+            )
+
+    def _process_tagged_arguments(self, args):
+        with _PATH_RESOLUTION_LOCK:
+            args = process_tagged_arguments(
+                args,
+                self.profile.root,
+                self.current_file,
+                index_dir=self.profile.data_dir,
+                ignore_patterns=self.profile.ignore_patterns,
+            )
+        return [str(arg) for arg in args]
+
     def validate_begin_text_macro(self, line):
         if result := line_validation_for_begin_text(line):
             result = format_identifiers_as_code(result)
@@ -102,9 +148,8 @@ class AutomaticPromptInterpreter(MacroInterpreter):
             return macro_data
         return None
 
-    def _extract_line_ranges(self, text, line_ranges):
+    def _extract_line_ranges(self, lines, line_ranges):
         text_chunks = []
-        lines = text.splitlines(True)
         length = len(lines)
         for start, stop in line_ranges:
             start -= 1
@@ -123,17 +168,17 @@ class AutomaticPromptInterpreter(MacroInterpreter):
             file_names, line_ranges = result
             macro_data_list = []
             for file_name in file_names:
-                file_path = find_closest_matching_file(
-                    file_name, self.profile.root, self.current_file
-                )
-                file_content = self._read_file(file_path, "paste files reference")
+                file_path = self._find_closest_file(file_name)
                 if line_ranges and file_path.lower().endswith(".py"):
-                    file_content = self._extract_line_ranges(file_content, line_ranges)
+                    self._check_exists(file_path, "paste files reference")
+                    lines = get_declaration_index(file_path).lines
+                    file_content = self._extract_line_ranges(lines, line_ranges)
                     # Enables merging of consecutive line ranges and declaration
                     # blocks into a single code snippet
                     macro_type = MACROS.PASTE_DECLARATION_BLOCK
                 else:
                     macro_type = MACROS.PASTE_FILE
+                    file_content = self._read_file(file_path, "paste files reference")
                     file_content = render_to_markdown_code_block(
                         file_content, extension=file_path.split(".")[-1]
                     )
@@ -145,19 +190,15 @@ class AutomaticPromptInterpreter(MacroInterpreter):
     def validate_paste_folder_files_macro(self, line):
         if result := line_validation_for_paste_folder_files(line):
             folder_name, title_level, excluded_dirs, excluded_files = result
-            folder_path = find_closest_matching_dir(
-                folder_name, self.profile.root, self.current_file
-            )
-            excluded_dirs = [
-                find_closest_matching_dir(dir_, self.profile.root, self.current_file)
-                for dir_ in excluded_dirs
-            ]
+            folder_path = self._find_closest_dir(folder_name)
+            excluded_dirs = [self._find_closest_dir(dir_) for dir_ in excluded_dirs]
             excluded_files = [
-                find_closest_matching_file(file, self.profile.root, self.current_file)
-                for file in excluded_files
+                self._find_closest_file(file) for file in excluded_files
             ]
             macros_data = []
-            for root, _, files in os.walk(folder_path):
+            for root, _, files in walk_with_ignore_patterns(
+                folder_path, self.profile.ignore_patterns, self.profile.root
+            ):
                 root = standardize_path(root)
                 if root in excluded_dirs:
                     continue
@@ -186,13 +227,10 @@ class AutomaticPromptInterpreter(MacroInterpreter):
     def validate_paste_declaration_block_macro(self, line):
         if result := line_validation_for_paste_declaration_block(line):
             file_name, declaration_name, only_declaration_and_docstring = result
-            file_path = find_closest_matching_file(
-                file_name, self.profile.root, self.current_file
-            )
+            file_path = self._find_closest_file(file_name)
 
-            declaration_block = get_declaration_block(
-                name=declaration_name,
-                script=file_path,
+            declaration_block = get_declaration_index(file_path).get_declaration_block(
+                declaration_name,
                 only_declaration_and_docstring=only_declaration_and_docstring,
             )
             macro_data = {
@@ -228,23 +266,24 @@ class AutomaticPromptInterpreter(MacroInterpreter):
         if result := line_validation_for_meta_macros_with_args(line):
             name, args = result
             if args:
-                args = process_tagged_arguments(
-                    args, self.profile.root, self.current_file
-                )
-                args = [str(arg) for arg in args]
+                args = self._process_tagged_arguments(args)
             dir_ = self.profile.meta_macros_with_args_dir
             template_file = os.path.join(dir_, f"{name}.py")
             self._check_exists(template_file, "meta macros with args reference")
-            macros_text = execute_python_module(
-                module=template_file,
-                args=args,
-                env_python_path=self.profile.runner_python_env,
-                cwd=self.profile.cwd,
-            )
-            macros_data, _ = self.extract_macros_from_text(macros_text)
-            return macros_data
+            return self.defer(self._resolve_meta_macros_with_args, template_file, args)
         return None
 
+    def _resolve_meta_macros_with_args(self, template_file, args):
+        macros_text = execute_python_module(
+            module=template_file,
+            args=args,
+            env_python_path=self.profile.runner_python_env,
+            cwd=self.profile.cwd,
+            use_worker=self.profile.warm_python_workers,
+        )
+        macros_data, _ = self.extract_macros_from_text(macros_text)
+        return macros_data
+
     def validate_meta_macros(self, line):
         if result := line_validation_for_meta_macros(line):
             name = result
@@ -259,55 +298,61 @@ class AutomaticPromptInterpreter(MacroInterpreter):
         if result := line_validation_for_costum_function(line):
             name, args = result
             if args:
-                args = process_tagged_arguments(
-                    args, self.profile.root, self.current_file
-                )
-                args = [str(arg) for arg in args]
+                args = self._process_tagged_arguments(args)
             costum_functions_dir = self.profile.costum_functions_dir
             costum_file = find_file_in_1st_level_subdir(
                 name, costum_functions_dir, prettify=True
             )
-            output = execute_python_module(
-                costum_file,
-                args=args,
-                env_python_path=self.profile.runner_python_env,
-                cwd=self.profile.cwd,
-            )
-            macro_data = {"type": MACROS.COSTUM_FUNCTION, "text": output}
-            return macro_data
+            return self.defer(self._resolve_costum_function, costum_file, args)
         return None
 
+    def _resolve_costum_function(self, costum_file, args):
+        output = execute_python_module(
+            costum_file,
+            args=args,
+            env_python_path=self.profile.runner_python_env,
+            cwd=self.profile.cwd,
+            use_worker=self.profile.warm_python_workers,
+        )
+        macro_data = {"type": MACROS.COSTUM_FUNCTION, "text": output}
+        return macro_data
+
     def validate_run_pyscript_macro(self, line):
         if result := line_validation_for_run_pyscript(line):
-            script_path = find_closest_matching_file(result, self.profile.root, self.current_file)
-            environment_path = self.profile.runner_python_env
-            script_output = execute_python_module(
-                script_path,
-                environment_path,
-                cwd=self.profile.cwd,
-            )
-            script_output = render_to_markdown_code_block(
-                script_output, language="shell"
-            )
-            macro_data = {"type": MACROS.RUN_PYSCRIPT, "text": script_output}
-            return macro_data
+            script_path = self._find_closest_file(result)
+            return self.defer(self._resolve_run_pyscript, script_path)
         return None
 
+    def _resolve_run_pyscript(self, script_path):
+        environment_path = self.profile.runner_python_env
+        script_output = execute_python_module(
+            script_path,
+            environment_path,
+            cwd=self.profile.cwd,
+            use_worker=self.profile.warm_python_workers,
+        )
+        script_output = render_to_markdown_code_block(script_output, language="shell")
+        macro_data = {"type": MACROS.RUN_PYSCRIPT, "text": script_output}
+        return macro_data
+
     def validate_run_bash_script_macro(self, line):
         if result := line_validation_for_run_bash_script(line):
-            script_path = find_closest_matching_file(result, self.profile.root, self.current_file)
-            output = subprocess.run(
-                [script_path],
-                shell=True,
-                capture_output=True,
-                text=True,
-            )
-            output = output.stderr if output.returncode != 0 else output.stdout
-            output = render_to_markdown_code_block(output, language="shell")
-            macro_data = {"type": MACROS.RUN_BASH_SCRIPT, "text": output}
-            return macro_data
+            script_path = self._find_closest_file(result)
+            return self.defer(self._resolve_run_bash_script, script_path)
         return None
 
+    def _resolve_run_bash_script(self, script_path):
+        output = subprocess.run(
+            [script_path],
+            shell=True,
+            capture_output=True,
+            text=True,
+        )
+        output = output.stderr if output.returncode != 0 else output.stdout
+        output = render_to_markdown_code_block(output, language="shell")
+        macro_data = {"type": MACROS.RUN_BASH_SCRIPT, "text": output}
+        return macro_data
+
     def validate_run_subprocess_macro(self, line):
         if result := line_validation_for_run_subprocess(line):
             command, kwargs = result
@@ -315,48 +360,56 @@ class AutomaticPromptInterpreter(MacroInterpreter):
             # Force 'capture_output' and 'text' kwargs to True
             kwargs["capture_output"] = True
             kwargs["text"] = True
-            output = subprocess.run(command, **kwargs)
-            output = output.stderr if output.returncode != 0 else output.stdout
-            text = "$ " + command + "\n" + output
-            macro_data = {"type": MACROS.RUN_SUBPROCESS, "text": text}
-            return macro_data
+            return self.defer(self._resolve_run_subprocess, command, kwargs)
         return None
 
+    def _resolve_run_subprocess(self, command, kwargs):
+        output = subprocess.run(command, **kwargs)
+        output = output.stderr if output.returncode != 0 else output.stdout
+        text = "$ " + command + "\n" + output
+        macro_data = {"type": MACROS.RUN_SUBPROCESS, "text": text}
+        return macro_data
+
     def validate_run_pylint_macro(self, line):
         if result := line_validation_for_run_pylint(line):
-            script_path = find_closest_matching_file(result, self.profile.root, self.current_file)
-            environment_path = self.profile.runner_python_env
-            pylint_output = execute_pylint(script_path, environment_path)
-            pylint_output = render_to_markdown_code_block(
-                pylint_output, language="shell"
-            )
-            macro_data = {"type": MACROS.RUN_PYLINT, "text": pylint_output}
-            return macro_data
+            script_path = self._find_closest_file(result)
+            return self.defer(self._resolve_run_pylint, script_path)
         return None
 
+    def _resolve_run_pylint(self, script_path):
+        environment_path = self.profile.runner_python_env
+        pylint_output = execute_pylint(script_path, environment_path)
+        pylint_output = render_to_markdown_code_block(pylint_output, language="shell")
+        macro_data = {"type": MACROS.RUN_PYLINT, "text": pylint_output}
+        return macro_data
+
     def validate_run_unittest_macro(self, line):
         if result := line_validation_for_run_unittest(line):
             name, verbosity = result
-            script_path = find_closest_matching_file(name, self.profile.root, self.current_file)
-            python_env = self.profile.runner_python_env
-            cwd = self.profile.cwd
-            unittest_output = execute_python_module(
-                module=execute_unittests_from_file,
-                args=[script_path, cwd, str(verbosity)],
-                env_python_path=python_env,
-                cwd=cwd,
-            )
-            unittest_output = render_to_markdown_code_block(
-                unittest_output, language="shell"
-            )
-            macro_data = {"type": MACROS.RUN_UNITTEST, "text": unittest_output}
-            return macro_data
+            script_path = self._find_closest_file(name)
+            return self.defer(self._resolve_run_unittest, script_path, verbosity)
         return None
 
+    def _resolve_run_unittest(self, script_path, verbosity):
+        python_env = self.profile.runner_python_env
+        cwd = self.profile.cwd
+        unittest_output = execute_python_module(
+            module=execute_unittests_from_file,
+            args=[script_path, cwd, str(verbosity)],
+            env_python_path=python_env,
+            cwd=cwd,
+            use_worker=self.profile.warm_python_workers,
+        )
+        unittest_output = render_to_markdown_code_block(
+            unittest_output, language="shell"
+        )
+        macro_data = {"type": MACROS.RUN_UNITTEST, "text": unittest_output}
+        return macro_data
+
     def validate_directory_tree_macro(self, line):
         if result := line_validation_for_directory_tree(line):
             dir_, max_depth, include_files, ignore_list = result
-            dir_ = find_closest_matching_dir(dir_, self.profile.root, self.current_file)
+            dir_ = self._find_closest_dir(dir_)
             directory_tree = generate_directory_tree(
                 dir_, max_depth, include_files, ignore_list
             )
@@ -370,10 +423,13 @@ class AutomaticPromptInterpreter(MacroInterpreter):
     def validate_summarize_python_script_macro(self, line):
         if result := line_validation_for_summarize_python_script(line):
             name, include_definitions_without_docstrings = result
-            script_path = find_closest_matching_file(name, self.profile.root, self.current_file)
-            script_summary = summarize_python_file(
-                script_path, include_definitions_without_docstrings
-            )
+            script_path = self._find_closest_file(name)
+            with SummaryCache(self.profile.data_dir) as summary_cache:
+                script_summary = summarize_python_files(
+                    [script_path],
+                    include_definitions_without_docstrings,
+                    summary_cache=summary_cache,
+                )[0]
             macro_data = {
                 "type": MACROS.SUMMARIZE_PYTHON_SCRIPT,
                 "text": script_summary,
@@ -390,19 +446,15 @@ class AutomaticPromptInterpreter(MacroInterpreter):
                 excluded_dirs,
                 excluded_files,
             ) = result
-            folder_path = find_closest_matching_dir(
-                folder_path, self.profile.root, self.current_file
-            )
-            excluded_dirs = [
-                find_closest_matching_dir(dir_, self.profile.root, self.current_file)
-                for dir_ in excluded_dirs
-            ]
+            folder_path = self._find_closest_dir(folder_path)
+            excluded_dirs = [self._find_closest_dir(dir_) for dir_ in excluded_dirs]
             excluded_files = [
-                find_closest_matching_file(file, self.profile.root, self.current_file)
-                for file in excluded_files
+                self._find_closest_file(file) for file in excluded_files
             ]
-            macros_data = []
-            for root, _, files in os.walk(folder_path):
+            python_files = []
+            for root, _, files in walk_with_ignore_patterns(
+                folder_path, self.profile.ignore_patterns, self.profile.root
+            ):
                 root = standardize_path(root)
                 if root in excluded_dirs:
                     continue
@@ -411,23 +463,31 @@ class AutomaticPromptInterpreter(MacroInterpreter):
                     file = standardize_path(file)
                     if file in excluded_files or not file.endswith(".py"):
                         continue
-                    if script_summary := summarize_python_file(
-                        file, include_definitions_without_docstrings
-                    ):  
-                        rel_file = os.path.relpath(file, folder_path)
-                        title = "#" * title_level + " " + rel_file
-                        macros_data.append({
-                            "type": MACROS.TITLE,
-                            "text": title,
-                        })
-                        script_summary = render_to_markdown_code_block(
-                            script_summary, language="python"
-                        )
-                        macro_data = {
-                            "type": MACROS.SUMMARIZE_PYTHON_SCRIPT,
-                            "text": script_summary,
-                        }
-                        macros_data.append(macro_data)
+                    python_files.append(file)
+
+            with SummaryCache(self.profile.data_dir) as summary_cache:
+                script_summaries = summarize_python_files(
+                    python_files,
+                    include_definitions_without_docstrings,
+                    summary_cache=summary_cache,
+                )
+            macros_data = []
+            for file, script_summary in zip(python_files, script_summaries):
+                if script_summary:
+                    rel_file = os.path.relpath(file, folder_path)
+                    title = "#" * title_level + " " + rel_file
+                    macros_data.append({
+                        "type": MACROS.TITLE,
+                        "text": title,
+                    })
+                    script_summary = render_to_markdown_code_block(
+                        script_summary, language="python"
+                    )
+                    macro_data = {
+                        "type": MACROS.SUMMARIZE_PYTHON_SCRIPT,
+                        "text": script_summary,
+                    }
+                    macros_data.append(macro_data)
             return macros_data
         return None
 
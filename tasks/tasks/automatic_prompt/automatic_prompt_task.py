@@ -153,7 +153,9 @@ class AutomaticPromptTask(TaskBase):
         Executes the AutomaticPrompt task to format the prompt and interact
         with AI.
         """
-        interpreter = AutomaticPromptInterpreter(self.profile)
+        interpreter = AutomaticPromptInterpreter(
+            self.profile, max_concurrent_macros=self.profile.max_concurrent_macros
+        )
         backup_handler = BackupHandler(
             self.profile.backup_dir, self.profile.max_backups
         )
@@ -1,9 +1,10 @@
 import os
 
-import pyperclip
-
 from tasks.utils.for_automatic_prompt.extract_python_code import extract_python_code
 from tasks.utils.for_automatic_prompt.send_prompt import send_prompt
+from tasks.utils.shared.lazy_import import lazy_import
+
+pyperclip = lazy_import("pyperclip")
 
 
 class ChatManager:
@@ -3,7 +3,9 @@ from tasks.utils.shared.find_closest_matching_dir import find_closest_matching_d
 from tasks.utils.shared.find_closest_matching_file import find_closest_matching_file
 
 
-def process_tagged_arguments(arguments, root_dir, reference_file):
+def process_tagged_arguments(
+    arguments, root_dir, reference_file, index_dir=None, ignore_patterns=None
+):
     """
     Process arguments that include special tags for files or directories.
 
@@ -15,6 +17,12 @@ def process_tagged_arguments(arguments, root_dir, reference_file):
         The root directory to use for finding files and directories.
     reference_file (str)
         The reference file to use for finding files
+    index_dir (str, optional)
+        Directory of the persistent file index used for finding files and
+        directories.
+    ignore_patterns (list, optional)
+        Gitignore-style patterns of files and directories that are not
+        searched.
 
     Returns
     -------
@@ -29,9 +37,13 @@ def process_tagged_arguments(arguments, root_dir, reference_file):
             continue
         if arg.startswith(f"{CURRENT_FILE_TAG}="):
             arg = arg.replace(f"{CURRENT_FILE_TAG}=", "")
-            arg = find_closest_matching_file(arg.strip(), root_dir, reference_file)
+            arg = find_closest_matching_file(
+                arg.strip(), root_dir, reference_file, index_dir, ignore_patterns
+            )
         elif arg.startswith(f"{CURRENT_DIRECTORY_TAG}="):
             arg = arg.replace(f"{CURRENT_DIRECTORY_TAG}=", "")
-            arg = find_closest_matching_dir(arg.strip(), root_dir, reference_file)
+            arg = find_closest_matching_dir(
+                arg.strip(), root_dir, reference_file, index_dir, ignore_patterns
+            )
         updated_arguments.append(arg)
     return tuple(updated_arguments)
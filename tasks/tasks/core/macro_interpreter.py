@@ -1,5 +1,24 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 import inspect
+import threading
+
+
+class DeferredMacro:
+    """
+    Placeholder for the macro data of a macro resolved in the background. It
+    keeps the position of the macro until the data is available.
+
+    Parameters
+    ----------
+    future (concurrent.futures.Future)
+        The future resolving to the macro data, a dictionary or a list of
+        dictionaries.
+    """
+
+    def __init__(self, future):
+        self.future = future
+
 
 class MacroInterpreter(ABC):
     """
@@ -14,6 +33,9 @@ class MacroInterpreter(ABC):
     ----------
     profile (object)
         The current profile object of the running task.
+    max_concurrent_macros (int)
+        The maximum number of macros resolved concurrently. Validation methods
+        opt in by passing their expensive, side-effect-free work to defer.
 
     Methods
     -------
@@ -25,7 +47,7 @@ class MacroInterpreter(ABC):
         macros.
     """
 
-    def __init__(self, profile):
+    def __init__(self, profile, max_concurrent_macros=1):
         """
         Initializes the MacroInterpreter with the provided profile.
 
@@ -33,8 +55,14 @@ class MacroInterpreter(ABC):
         ----------
         profile (object)
             The profile object of the running task.
+        max_concurrent_macros (int)
+            The maximum number of macros resolved concurrently. 1 resolves
+            the macros one after another. Default is 1.
         """
         self.profile = profile
+        self.max_concurrent_macros = max_concurrent_macros
+        self._executor = None
+        self._executor_thread = None
         self.initialize_validation_methods()
 
     def initialize_validation_methods(self):
@@ -57,6 +85,40 @@ class MacroInterpreter(ABC):
         ]
 
 
+    def defer(self, function, *args, **kwargs):
+        """
+        Resolves macro data by calling function. During a concurrent
+        extraction, the call is submitted to the thread pool and a placeholder
+        is returned, which extract_macros_from_text replaces by the result in
+        the original order of the macros. Otherwise, and when called from a
+        pool thread, the function is called directly.
+
+        Parameters
+        ----------
+        function (callable)
+            The function returning the macro data.
+        args (tuple)
+            The positional arguments of the function.
+        kwargs (dict)
+            The keyword arguments of the function.
+
+        Returns
+        -------
+        dict, list or DeferredMacro
+            The macro data or a placeholder for it.
+        """
+        if self._executor is None or threading.get_ident() != self._executor_thread:
+            return function(*args, **kwargs)
+        return DeferredMacro(self._executor.submit(function, *args, **kwargs))
+
+    def _validate_line(self, line, start=0):
+        # Returns the first non-empty result of the validation methods from
+        # start on, and the index of the method.
+        for index in range(start, len(self.validation_methods)):
+            if result := self.validation_methods[index](line):
+                return result, index
+        return None, None
+
     def extract_macros_from_text(self, text, post_process=False):
         """
         Extracts macros and updated text from the input text based on
@@ -73,21 +135,35 @@ class MacroInterpreter(ABC):
         Returns:
             - tuple: macros_data or the post-processed macros.
         """
+        if self._executor is None and self.max_concurrent_macros > 1:
+            self._executor = ThreadPoolExecutor(self.max_concurrent_macros)
+            self._executor_thread = threading.get_ident()
+            try:
+                return self.extract_macros_from_text(text, post_process)
+            finally:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+                self._executor_thread = None
+
+        validated_lines = [
+            (line, *self._validate_line(line.strip())) for line in text.splitlines()
+        ]
         macros = []
         updated_text_lines = []
 
-        for line in text.splitlines():
-            result = None
-            stripped_line = line.strip()
-            for val in self.validation_methods:
-                if result := val(stripped_line):
-                    if isinstance(result, list):
-                        macros.extend(result)
-                    else:
-                        macros.append(result)
-                    break
+        for line, result, index in validated_lines:
+            while isinstance(result, DeferredMacro):
+                result = result.future.result()
+                if not result:
+                    # As in a sequential extraction, the next validation
+                    # methods are tried for the line.
+                    result, index = self._validate_line(line.strip(), index + 1)
             if not result:
                 updated_text_lines.append(line)
+            elif isinstance(result, list):
+                macros.extend(result)
+            else:
+                macros.append(result)
         updated_text = "\n".join(updated_text_lines)
 
         if post_process:
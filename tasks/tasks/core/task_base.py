@@ -15,6 +15,9 @@ class TaskBase(ABC):
     ----------
     NAME (str)
         A class-level attribute that identifies the name of the task.
+    skipped (bool)
+        Set by tasks that found nothing to do for their input, e.g. a file
+        unchanged since it was last processed.
     """
 
     NAME = None
@@ -36,6 +39,7 @@ class TaskBase(ABC):
         self.default_root = default_root
         self.default_args = default_args
         self._force_defaults = False
+        self.skipped = False
         self.line_sep = "-" * 120 + "\n"
 
     def force_defaults(self):
@@ -83,10 +87,11 @@ class TaskBase(ABC):
         Cleans up the task environment. Removes the tasks_cache directory if it
         exists.
         """
+        # Errors are ignored, as tasks running in parallel share the caches.
         if self.tasks_cache_dir and os.path.exists(self.tasks_cache_dir):
-            shutil.rmtree(self.tasks_cache_dir)
+            shutil.rmtree(self.tasks_cache_dir, ignore_errors=True)
         if self.runners_cache_dir and os.path.exists(self.runners_cache_dir):
-            shutil.rmtree(self.runners_cache_dir)
+            shutil.rmtree(self.runners_cache_dir, ignore_errors=True)
 
     def _print_execution_start(self):
         """
@@ -4,8 +4,8 @@ on a directory of files.
 
 The DirectoryRunnerTask class sets up the environment, reads configurations
 from a JSON file, and executes the specified task on each file within a
-directory. It supports resuming from the last stopped file and excludes
-specified files and directories.
+directory. It supports resuming from the last stopped file, running the task on
+several files in parallel and excludes specified files and directories.
 
 Available tasks: FormatPythonTask Formats Python files by removing or
 refactoring specific parts based on macros. AutomaticPromptTask Generates
@@ -14,11 +14,18 @@ automatic prompts based on macro statements.
 The module includes the following key functionalities:
 - Reading configuration from a JSON file.
 - Initializing and setting up the task environment.
-- Tracking the execution status of each file.
+- Tracking the execution status of each file in a SQLite database, exported
+to CSV after each run.
 - Logging outputs to a specified file.
 - Handling backups of files before modifications.
 - Supporting resumption from the last stopped file in case of
 interruptions.
+- Running the task on several files in a process pool, configured by the
+optional "max_workers" key of the configuration.
+- Timing the strategies of a Format Python sweep, enabled by the optional
+"strategy_timing" key of the configuration. The timings of all files are
+collected in a JSON lines file in the log directory and summarized as a table
+of where the time went.
 
 Usage example:
 ```python
@@ -28,22 +35,46 @@ DirectoryRunnerTask(root_directory, config_json).main()
 ```
 
 TODO when adding new tasks:
-1. Ensure the task class is imported and recognized in _get_task_class method.
+1. Ensure the task class is registered in SUBTASKS.
 2. Update the configuration JSON schema if new attributes are needed.
 3. Implement necessary methods in the task class for integration.
 """
 
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import importlib
 import json
 import os
 
-from tasks.tasks.automatic_prompt.automatic_prompt_task import AutomaticPromptTask
+from tasks.configs.defaults import (
+    DIRECTORY_RUNNER_MAX_WORKERS_DEFAULT,
+    DIRECTORY_RUNNER_STRATEGY_TIMING_DEFAULT,
+)
 from tasks.tasks.core.task_base import TaskBase
-from tasks.tasks.format_python.format_python_task import FormatPythonTask
-from tasks.tasks.pylint_report.pylint_report_task import PylintReportTask
-from tasks.utils.for_directory_runner.file_execution_tracker import FileExecutionTracker
 from tasks.utils.for_directory_runner.log_outputs_to_file import log_outputs_to_file
+from tasks.utils.for_directory_runner.run_subtask import run_subtask
+from tasks.utils.for_directory_runner.sqlite_file_execution_tracker import (
+    open_execution_tracker,
+)
+from tasks.utils.for_format_python.strategy_timing import (
+    format_timings_table,
+    load_timing_records,
+)
 from tasks.utils.shared.backup_handler import BackupHandler
 
+# The module and class of each supported subtask by its name. Only the module of
+# the requested subtask is imported.
+SUBTASKS = {
+    "Format Python": (
+        "tasks.tasks.format_python.format_python_task",
+        "FormatPythonTask",
+    ),
+    "Automatic Prompt": (
+        "tasks.tasks.automatic_prompt.automatic_prompt_task",
+        "AutomaticPromptTask",
+    ),
+}
+
 
 class DirectoryRunnerTask(TaskBase):
     """
@@ -76,13 +107,24 @@ class DirectoryRunnerTask(TaskBase):
                 setattr(self, key, text)
             else:
                 setattr(self, key, directory_runner_args[key])
+        self.max_workers = directory_runner_args.get(
+            "max_workers", DIRECTORY_RUNNER_MAX_WORKERS_DEFAULT
+        )
+        if not isinstance(self.max_workers, int) or self.max_workers < 1:
+            msg = f"max_workers must be a positive integer, got {self.max_workers}."
+            raise ValueError(msg)
+        self.strategy_timing = directory_runner_args.get(
+            "strategy_timing", DIRECTORY_RUNNER_STRATEGY_TIMING_DEFAULT
+        )
+        if self.strategy_timing and self.task_name != "Format Python":
+            msg = "strategy_timing is only supported by the Format Python task."
+            raise ValueError(msg)
 
     def _get_task_class(self, task_name):
-        if task_name == FormatPythonTask.NAME:
-            return FormatPythonTask
-        if task_name == AutomaticPromptTask.NAME:
-            return AutomaticPromptTask
-        if task_name == PylintReportTask.NAME:
+        if task_name in SUBTASKS:
+            module_name, class_name = SUBTASKS[task_name]
+            return getattr(importlib.import_module(module_name), class_name)
+        if task_name == "Pylint Report":
             msg = "PylintReportTask is currently not supported, Comming soon."
             raise ValueError(msg)
         msg = f"Task {task_name} is not supported."
@@ -96,6 +138,133 @@ class DirectoryRunnerTask(TaskBase):
             msg += "file must be the Directory Runner JSON."
             raise ValueError(msg)
         self._set_attributes_from_json(self.current_file)
+        self.subtask_attributes = {}
+
+    def _run_sequentially(self, execution_tracker, output_log_file, log_append):
+        """
+        Runs the subtask on the pending files one after another.
+        """
+        pendings_at_start = execution_tracker.get_status_count().get("pending")
+        counts = {"completed": 0, "skipped": 0, "failed": 0}
+        while True:
+            file_path = execution_tracker.take_next_pending()
+            if file_path is None:
+                break
+
+            subtask_class = self._get_task_class(self.task_name)
+            subtask = subtask_class(self.task_runner_root, file_path, self.macros_text)
+            for name, value in self.subtask_attributes.items():
+                setattr(subtask, name, value)
+            subtask.force_defaults()  # Prevents the task from using the command line arguments
+            try:
+                with log_outputs_to_file(output_log_file, append=log_append):
+                    log_append = True
+                    subtask.main()
+                    print(f"\n\n")
+                if subtask.skipped:
+                    execution_tracker.mark_file_as_skipped(file_path)
+                    counts["skipped"] += 1
+                else:
+                    execution_tracker.mark_running_as_completed()
+                    counts["completed"] += 1
+            except Exception as e:
+                execution_tracker.mark_running_as_failed(e)
+                counts["failed"] += 1
+
+            self._print_progress(file_path, counts, pendings_at_start)
+        return counts
+
+    def _run_in_pool(self, execution_tracker, output_log_file, log_append):
+        """
+        Runs the subtask on the pending files in a process pool. At most
+        max_workers files are marked 'running' at a time, and the output of
+        each file is written to the log as one section once it finishes.
+        """
+        pendings_at_start = execution_tracker.get_status_count().get("pending")
+        subtask_class = self._get_task_class(self.task_name)
+        counts = {"completed": 0, "skipped": 0, "failed": 0}
+        mode = "a" if log_append else "w"
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            with open(output_log_file, mode) as log_file:
+                # The file path of each running future.
+                futures = {}
+                broken = False
+                # A file taken from the tracker but not submitted to a pool.
+                unsubmitted_file = None
+                while True:
+                    if broken and not futures:
+                        # A worker that died broke the pool, the remaining
+                        # files are run in a new one.
+                        executor.shutdown()
+                        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                        broken = False
+                    while not broken and len(futures) < self.max_workers:
+                        file_path = (
+                            unsubmitted_file or execution_tracker.take_next_pending()
+                        )
+                        if file_path is None:
+                            break
+                        try:
+                            future = executor.submit(
+                                run_subtask,
+                                subtask_class,
+                                self.task_runner_root,
+                                file_path,
+                                self.macros_text,
+                                self.subtask_attributes,
+                            )
+                        except BrokenProcessPool:
+                            unsubmitted_file = file_path
+                            broken = True
+                            break
+                        unsubmitted_file = None
+                        futures[future] = file_path
+                    if not futures and not broken:
+                        break
+
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        file_path = futures.pop(future)
+                        output, error, skipped = self._get_pool_result(future)
+                        if isinstance(future.exception(), BrokenProcessPool):
+                            broken = True
+                        log_file.write(output)
+                        log_file.flush()
+                        if error is not None:
+                            execution_tracker.mark_file_as_failed(file_path, error)
+                            counts["failed"] += 1
+                        elif skipped:
+                            execution_tracker.mark_file_as_skipped(file_path)
+                            counts["skipped"] += 1
+                        else:
+                            execution_tracker.mark_file_as_completed(file_path)
+                            counts["completed"] += 1
+
+                        self._print_progress(file_path, counts, pendings_at_start)
+        finally:
+            executor.shutdown()
+        return counts
+
+    @staticmethod
+    def _get_pool_result(future):
+        """
+        Returns the output, the error message and the skipped flag of a
+        subtask run in the pool. A worker failing outside the subtask, e.g.
+        killed, fails the file.
+        """
+        try:
+            _, output, error, skipped = future.result()
+        except Exception as e:
+            return "", f"{type(e).__name__}: {e}", False
+        return output, error, skipped
+
+    def _print_progress(self, file_path, counts, pendings_at_start):
+        print(f"Task '{self.task_name}' completed for file: {file_path}")
+        print(f"Completed: {counts['completed']} / {pendings_at_start}")
+        print(f"Skipped: {counts['skipped']} / {pendings_at_start}")
+        print(f"Failed: {counts['failed']} / {pendings_at_start}")
+        print("-" * 40)
 
     def execute(self):
         """
@@ -109,6 +278,14 @@ class DirectoryRunnerTask(TaskBase):
         file_execution_csv = os.path.join(execution_tracks_dir, csv_name)
         output_log_name = csv_name.replace("_execution_tracks.csv", "_output.log")
         output_log_file = os.path.join(self.profile.log_dir, output_log_name)
+        timing_log_name = csv_name.replace(
+            "_execution_tracks.csv", "_strategy_timings.jsonl"
+        )
+        timing_log_file = os.path.join(self.profile.log_dir, timing_log_name)
+        if self.strategy_timing:
+            if not self.resume_from_last_stopped and os.path.exists(timing_log_file):
+                os.remove(timing_log_file)
+            self.subtask_attributes["timing_log_file"] = timing_log_file
 
         backup_handler = BackupHandler(
             self.profile.backup_dir, self.profile.max_backups
@@ -120,9 +297,44 @@ class DirectoryRunnerTask(TaskBase):
             msg = f"Directory path {self.directory_path} does not exist."
             raise ValueError(msg)
 
-        execution_tracker = FileExecutionTracker(file_execution_csv)
+        execution_tracker = open_execution_tracker(file_execution_csv)
+        try:
+            counts = self._run_tracked_files(execution_tracker, output_log_file)
+        finally:
+            execution_tracker.export_csv(file_execution_csv)
+            execution_tracker.close()
+
+        print("\nExecution Summary")
+        print("=" * 40)
+        print(f"Total files processed: {sum(counts.values())}")
+        print(f"Successfully completed: {counts['completed']}")
+        print(f"Skipped (unchanged): {counts['skipped']}")
+        print(f"Failed: {counts['failed']}")
+        print("=" * 40)
+        if self.strategy_timing and os.path.exists(timing_log_file):
+            self._report_strategy_timings(timing_log_file)
+
+    def _report_strategy_timings(self, timing_log_file):
+        """
+        Prints the timings of the strategies aggregated over the files of the
+        sweep, and saves the table next to the timings.
+        """
+        table = format_timings_table(load_timing_records(timing_log_file))
+        table_file = timing_log_file.replace(".jsonl", ".txt")
+        with open(table_file, "w", encoding="utf-8") as f:
+            f.write(table + "\n")
+        print("\nStrategy Timings")
+        print(table)
+        print(f"Timings of every file: {timing_log_file}")
+
+    def _run_tracked_files(self, execution_tracker, output_log_file):
+        """
+        Initializes or resumes the execution tracks and runs the subtask on
+        the pending files.
+        """
         if self.resume_from_last_stopped:
             execution_tracker.verify_tracks()
+            execution_tracker.reset_running_to_pending()
             log_append = True
         else:
             execution_tracker.clear_tracks()
@@ -131,47 +343,21 @@ class DirectoryRunnerTask(TaskBase):
                 excluded_files=self.excluded_files,
                 excluded_dirs=self.excluded_dirs,
                 extensions=[".py"],
+                ignore_patterns=self.profile.ignore_patterns,
+                ignore_root=self.profile.root,
             )
             log_append = False
 
-        print(f"\nExecution Tracker initialized: {file_execution_csv}")
+        print(f"\nExecution Tracker initialized: {execution_tracker.db_path}")
         print(f"Output log file: {output_log_file}\n")
         count_status = execution_tracker.get_status_count()
         pendings_at_start = count_status.get("pending")
         print(f"Number of files pending at start: {pendings_at_start}\n")
 
-        completed_files = 0
-        failed_files = 0
-        while True:
-            file_path = execution_tracker.take_next_pending()
-            if file_path is None:
-                break
-
-            subtask_class = self._get_task_class(self.task_name)
-            subtask = subtask_class(self.task_runner_root, file_path, self.macros_text)
-            subtask.force_defaults()  # Prevents the task from using the command line arguments
-            try:
-                with log_outputs_to_file(output_log_file, append=log_append):
-                    log_append = True
-                    subtask.main()
-                    print(f"\n\n")
-                execution_tracker.mark_running_as_completed()
-                completed_files += 1
-            except Exception as e:
-                execution_tracker.mark_running_as_failed(e)
-                failed_files += 1
-
-            print(f"Task '{self.task_name}' completed for file: {file_path}")
-            print(f"Completed: {completed_files} / {pendings_at_start}")
-            print(f"Failed: {failed_files} / {pendings_at_start}")
-            print("-" * 40)
-
-        print("\nExecution Summary")
-        print("=" * 40)
-        print(f"Total files processed: {completed_files + failed_files}")
-        print(f"Successfully completed: {completed_files}")
-        print(f"Failed: {failed_files}")
-        print("=" * 40)
+        if self.max_workers > 1:
+            print(f"Running with {self.max_workers} workers\n")
+            return self._run_in_pool(execution_tracker, output_log_file, log_append)
+        return self._run_sequentially(execution_tracker, output_log_file, log_append)
 
 
 if __name__ == "__main__":
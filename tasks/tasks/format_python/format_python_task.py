@@ -34,6 +34,14 @@ Available strategies:
 | EN           | Ensure newline at end              | Needs to be forced                 |
 | PL           | Execute Pylint                     |                                    |
 
+Files formatted successfully are recorded in a cache in the data directory, so
+rerunning the task with the same strategies, tool versions and configuration on
+an unchanged file skips it. Checkpointing runs bypass the cache.
+
+The strategies are timed if the profile attribute strategy_timing_sink is set,
+"log" appends the timings to strategy_timings.jsonl in the log directory and
+"stdout" prints them.
+
 Usage example:
 ```python
 macros_text = "#only RL, FD\n#checkpointing"
@@ -48,21 +56,34 @@ TODO when adding new macros:
 
 import os
 
-from rich.console import Console
-from rich.table import Table
 from tasks.tasks.core.task_base import TaskBase
 from tasks.tasks.format_python.format_python_interpreter import FormatPythonInterpreter
-from tasks.utils.for_format_python.format_python_file import format_python_file
+from tasks.utils.for_format_python.format_cache import (
+    FormatCache,
+    get_format_cache_key,
+)
+from tasks.utils.for_format_python.format_python_file import (
+    format_python_file,
+    select_strategies,
+)
+from tasks.utils.for_format_python.strategy_timing import (
+    JsonLinesTimingSink,
+    get_timing_sink,
+)
 from tasks.utils.shared.backup_handler import BackupHandler
+from tasks.utils.shared.lazy_import import lazy_import
+
+rich_console = lazy_import("rich.console")
+rich_table = lazy_import("rich.table")
 
 requirements = ["black", "pylint"]
 
 
 def print_help():
-    console = Console()
+    console = rich_console.Console()
 
     # Macros Table
-    macros_table = Table(title="Macros")
+    macros_table = rich_table.Table(title="Macros")
     macros_table.add_column("Macro", style="cyan", justify="center")
     macros_table.add_column("Purpose", style="green")
     macros_table.add_column("Args", style="magenta")
@@ -74,7 +95,7 @@ def print_help():
     macros_table.add_row("#checkpointing", "Insert checkpoints", "-")
 
     # Strategies Table
-    strategies_table = Table(title="Strategies")
+    strategies_table = rich_table.Table(title="Strategies")
     strategies_table.add_column("Abbr", style="cyan", justify="center")
     strategies_table.add_column("Description", style="green")
     strategies_table.add_column("Notes", style="magenta")
@@ -101,9 +122,17 @@ class FormatPythonTask(TaskBase):
     """
     A task for formatting python files by removing or refactoring specific
     parts based on macros.
+
+    Attributes
+    ----------
+    timing_log_file (str)
+        A JSON lines file the timings of the strategies are appended to,
+        overriding the profile attribute strategy_timing_sink. Set by the
+        directory runner to collect the timings of a sweep. Default is None.
     """
 
     NAME = "Format Python"
+    timing_log_file = None
 
     def _handle_options_if_present(self, text):
         stripped = text.strip()
@@ -148,6 +177,8 @@ class FormatPythonTask(TaskBase):
         )
         interpreter = FormatPythonInterpreter(self.profile)
 
+        with open(current_file, "r", encoding="utf-8") as file:
+            content = file.read()
         if self.macros_text:
             macros_data, updated_text = interpreter.extract_macros_from_text(
                 self.macros_text, post_process=True
@@ -157,8 +188,7 @@ class FormatPythonTask(TaskBase):
                     "Not able to process the following macros:\n" + updated_text
                 )
 
-            with open(current_file, "r", encoding="utf-8") as file:
-                updated_content = file.read()
+            updated_content = content
         else:
             macros_data, updated_content = interpreter.extract_macros_from_file(
                 current_file
@@ -171,13 +201,38 @@ class FormatPythonTask(TaskBase):
         if not checkpointing:
             checkpoint_dir = None
 
+        # Files unchanged since they were formatted with the same
+        # configuration are skipped, without storing a backup. Files with
+        # macros are formatted, as the macros are removed from the file.
+        format_cache = None if checkpointing else FormatCache(self.profile.data_dir)
+        if format_cache is not None and updated_content == content:
+            cache_key = get_format_cache_key(
+                updated_content,
+                current_file,
+                select_strategies(select_only, select_not, force_select_of),
+                environment_path,
+                self.profile.modules_info,
+            )
+            if format_cache.contains(cache_key):
+                print(f"Skipped {current_file}, unchanged since formatted.")
+                self.skipped = True
+                format_cache.close()
+                return
+
+        if self.timing_log_file:
+            timing_sink = JsonLinesTimingSink(self.timing_log_file)
+        else:
+            timing_sink = get_timing_sink(
+                self.profile.strategy_timing_sink, self.profile.log_dir
+            )
+
         backup_handler.store_backup(
             current_file, "Before modification from format python task."
         )
         with open(current_file, "w", encoding="utf-8") as file:
             file.write(updated_content)
 
-        format_python_file(
+        formatted = format_python_file(
             file_path=current_file,
             select_only=select_only,
             select_not=select_not,
@@ -185,7 +240,13 @@ class FormatPythonTask(TaskBase):
             checkpoint_dir=checkpoint_dir,
             python_env_path=environment_path,
             modules_info=self.profile.modules_info,
+            black_mode=self.profile.black_formatting_mode,
+            format_cache=format_cache,
+            timing_sink=timing_sink,
         )
+        self.skipped = not formatted
+        if format_cache is not None:
+            format_cache.close()
 
 
 if __name__ == "__main__":
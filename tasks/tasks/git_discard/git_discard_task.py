@@ -107,12 +107,22 @@ class GitDiscardTask(TaskBase):
         for path in paths:
             path = path.strip()
             try:
-                file_path = find_closest_matching_file(path, self.profile.root, self.current_file)
+                file_path = find_closest_matching_file(
+                    path,
+                    self.profile.root,
+                    self.current_file,
+                    index_dir=self.profile.data_dir,
+                    ignore_patterns=self.profile.ignore_patterns,
+                )
                 processed_paths.append(file_path)
             except FileNotFoundError:
                 try:
                     dir_path = find_closest_matching_dir(
-                        path, self.profile.root, os.path.dirname(self.current_file)
+                        path,
+                        self.profile.root,
+                        os.path.dirname(self.current_file),
+                        index_dir=self.profile.data_dir,
+                        ignore_patterns=self.profile.ignore_patterns,
                     )
                     processed_paths.extend(
                         self._get_not_ignored_and_modified_files(dir_path)
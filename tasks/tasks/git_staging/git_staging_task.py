@@ -51,12 +51,22 @@ class GitStagingTask(TaskBase):
         for path in paths:
             path = path.strip()
             try:
-                file_path = find_closest_matching_file(path, self.profile.root, self.current_file)
+                file_path = find_closest_matching_file(
+                    path,
+                    self.profile.root,
+                    self.current_file,
+                    index_dir=self.profile.data_dir,
+                    ignore_patterns=self.profile.ignore_patterns,
+                )
                 processed_paths.append(file_path)
             except FileNotFoundError:
                 try:
                     dir_path = find_closest_matching_dir(
-                        path, self.profile.root, os.path.dirname(self.current_file)
+                        path,
+                        self.profile.root,
+                        os.path.dirname(self.current_file),
+                        index_dir=self.profile.data_dir,
+                        ignore_patterns=self.profile.ignore_patterns,
                     )
                     processed_paths.append(dir_path)
                 except FileNotFoundError as e:
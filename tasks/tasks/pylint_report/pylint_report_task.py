@@ -22,7 +22,8 @@ directory_for_report. directory_for_report can be defined with 'sloppy' string
 
 Highlights:
 - Dynamically finds Python files in a given directory.
-- Executes pylint on each file and extracts scoring information.
+- Executes pylint on all files of a directory in batched runs and extracts
+scoring information per file.
 - Writes the pylint report to a file, organizing entries by score (worst
 to best).
 """
@@ -30,9 +31,11 @@ to best).
 from datetime import datetime
 import os
 
+from tasks.configs.defaults import PYLINT_CHUNK_SIZE_DEFAULT, PYLINT_JOBS_DEFAULT
 from tasks.tasks.core.task_base import TaskBase
-from tasks.utils.shared.execute_pylint import execute_pylint
+from tasks.utils.shared.execute_pylint import execute_pylint, execute_pylint_batch
 from tasks.utils.shared.find_closest_matching_dir import find_closest_matching_dir
+from tasks.utils.shared.ignore_patterns import walk_with_ignore_patterns
 
 
 class PylintReportTask(TaskBase):
@@ -57,7 +60,9 @@ class PylintReportTask(TaskBase):
         Gets all python files in the specified directory.
         """
         python_files = []
-        for root, _, files in os.walk(directory):
+        for root, _, files in walk_with_ignore_patterns(
+            directory, self.profile.ignore_patterns, self.profile.root
+        ):
             for file in files:
                 if file.endswith(".py"):
                     python_files.append(os.path.join(root, file))
@@ -96,6 +101,30 @@ class PylintReportTask(TaskBase):
         print()
         return self._process_pylint_output(file, output)
 
+    def _execute_pylint_batch(self, files):
+        """
+        Runs pylint on the specified files in batched runs and processes the
+        output of each file. Files missing in the batched results are linted
+        one by one.
+        """
+        python_env = self.profile.runner_python_env
+        print(f"Running pylint on {len(files)} files")
+        outputs = execute_pylint_batch(
+            files,
+            python_env,
+            jobs=PYLINT_JOBS_DEFAULT,
+            chunk_size=PYLINT_CHUNK_SIZE_DEFAULT,
+        )
+        results = []
+        for file in files:
+            if file in outputs:
+                output = outputs[file]
+                print(f"Output for {file}: \n", output)
+                results.append((file, *self._process_pylint_output(file, output)))
+            else:
+                results.append((file, *self._execute_pylint(file)))
+        return results
+
     def _write_report(self, logs):
         """
         Writes the pylint report to a file.
@@ -139,10 +168,11 @@ class PylintReportTask(TaskBase):
                     partial_path=self.dir_for_report,
                     root_dir=self.task_runner_root,
                     reference_dir=os.path.dirname(self.current_file),
+                    index_dir=self.profile.data_dir,
+                    ignore_patterns=self.profile.ignore_patterns,
                 )
             python_files = self._get_python_files(self.dir_for_report)
-            for file in python_files:
-                output, score = self._execute_pylint(file)
+            for file, output, score in self._execute_pylint_batch(python_files):
                 logs.append((file, output, float(score)))
 
         else:
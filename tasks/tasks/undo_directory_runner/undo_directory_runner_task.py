@@ -15,10 +15,14 @@ UndoDirectoryRunnerTask(root_directory, config_json).main()
 ```
 """
 
+import json
 import os
 
+from tasks.configs.defaults import DIRECTORY_RUNNER_MAX_WORKERS_DEFAULT
 from tasks.tasks.core.task_base import TaskBase
-from tasks.utils.for_directory_runner.file_execution_tracker import FileExecutionTracker
+from tasks.utils.for_directory_runner.sqlite_file_execution_tracker import (
+    open_execution_tracker,
+)
 from tasks.utils.shared.backup_handler import BackupHandler
 
 
@@ -37,6 +41,15 @@ class UndoDirectoryRunnerTask(TaskBase):
             msg += "file must be the Directory Runner JSON from which to undo."
             raise ValueError(msg)
 
+    def _get_max_workers(self):
+        # Files are restored with as many workers as the directory runner used.
+        with open(self.current_file, "r", encoding="utf-8") as f:
+            content = json.load(f)
+        directory_runner_args = content.get("directory_runner_config", {})
+        return directory_runner_args.get(
+            "max_workers", DIRECTORY_RUNNER_MAX_WORKERS_DEFAULT
+        )
+
     def execute(self):
         """
         Executes the directory runner task, running the specified task
@@ -47,29 +60,33 @@ class UndoDirectoryRunnerTask(TaskBase):
             os.path.basename(self.current_file).split(".")[0] + "_execution_tracks.csv"
         )  # Same as the one in directory_runner_task.py
         file_execution_csv = os.path.join(execution_tracks_dir, csv_name)
-        execution_tracker = FileExecutionTracker(file_execution_csv)
+        execution_tracker = open_execution_tracker(file_execution_csv)
         backup_handler = BackupHandler(
             self.profile.backup_dir, self.profile.max_backups
         )
 
-        completed_files = execution_tracker.get_completed_files()
-        completed_count = len(completed_files)
-
-        if completed_count == 0:
-            print("\nNo files to undo.\n")
-            return
-
-        print(f"Undoing {completed_count} completed file(s):")
-
-        for file in completed_files:
-            print(f"Undoing file: {file}")
-            execution_tracker.remove_file(file)
-            try:
-                backup_handler.recover_backup(
-                    file
-                )  # Assumes the last backup is the correct one
-            except FileNotFoundError:
-                print(f"Backup not found for file: {file}")
+        try:
+            completed_files = execution_tracker.get_completed_files()
+            completed_count = len(completed_files)
+
+            if completed_count == 0:
+                print("\nNo files to undo.\n")
+                return
+
+            print(f"Undoing {completed_count} completed file(s):")
+
+            for file in completed_files:
+                print(f"Undoing file: {file}")
+            execution_tracker.remove_files(completed_files)
+            # Assumes the last backup of each file is the correct one
+            failures = backup_handler.recover_backups(
+                completed_files, max_workers=self._get_max_workers()
+            )
+            for file, error_message in failures.items():
+                print(f"Backup not recovered for file: {file} ({error_message})")
+        finally:
+            execution_tracker.export_csv(file_execution_csv)
+            execution_tracker.close()
 
         print("\nUndo process completed.\n")
 
@@ -0,0 +1,113 @@
+import os
+import shutil
+import tempfile
+import unittest
+import warnings
+
+from tasks.utils.for_automatic_prompt.get_declaration_block import (
+    DeclarationIndex,
+    get_declaration_block,
+    get_declaration_index,
+)
+
+SOURCE = '''import os
+
+
+class Outer:
+    """Outer docstring."""
+
+    def method(self):
+        """Method docstring."""
+        return 1
+
+    class Inner:
+        def method(self):
+            return 2
+
+
+def function(a, b):
+    """
+    Function docstring.
+    """
+    return a + b
+'''
+
+
+class TestDeclarationIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.script = os.path.join(self.temp_dir, "script.py")
+        self._write(SOURCE)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, text):
+        with open(self.script, "w", encoding="utf-8") as f:
+            f.write(text)
+
+    def test_declaration_infos(self):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            index = DeclarationIndex(SOURCE)
+        self.assertEqual(len(caught), 1)
+        infos = index.declaration_infos
+        self.assertEqual(
+            list(infos), ["Outer", "method", "Inner", "method_2", "function"]
+        )
+        self.assertEqual(infos["Outer"]["qualified_name"], "Outer")
+        self.assertEqual(infos["method_2"]["qualified_name"], "Outer.Inner.method")
+        self.assertEqual((infos["Outer"]["start"], infos["Outer"]["stop"]), (3, 15))
+        self.assertEqual((infos["method"]["start"], infos["method"]["stop"]), (6, 10))
+        self.assertEqual(infos["function"]["stop"], len(SOURCE.splitlines()))
+
+    def test_nested_in_duplicate_declarations(self):
+        source = SOURCE + "\n\nclass Outer:\n    def method(self):\n        return 3\n"
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            index = DeclarationIndex(source)
+        self.assertEqual(
+            list(index.qualified_names)[-2:], ["Outer_2", "Outer_2.method"]
+        )
+        self.assertEqual(
+            index.get_declaration_block("Outer_2.method"),
+            "    def method(self):\n        return 3",
+        )
+        self.assertEqual(
+            index.get_declaration_block("Outer.method"),
+            '    def method(self):\n        """Method docstring."""\n        return 1',
+        )
+
+    def test_lookup_by_name_and_qualified_name(self):
+        self.assertEqual(
+            get_declaration_block("Outer.Inner.method", self.script),
+            get_declaration_block("method_2", self.script),
+        )
+        self.assertEqual(
+            get_declaration_block("Outer.method", self.script),
+            '    def method(self):\n        """Method docstring."""\n        return 1',
+        )
+        with self.assertRaises(ValueError):
+            get_declaration_block("missing", self.script)
+
+    def test_only_declaration_and_docstring(self):
+        self.assertEqual(
+            get_declaration_block("function", self.script, True),
+            'def function(a, b):\n    """\n    Function docstring.\n    """',
+        )
+
+    def test_index_is_cached_until_the_file_changes(self):
+        index = get_declaration_index(self.script)
+        self.assertIs(get_declaration_index(self.script), index)
+        self._write(SOURCE + "\n\ndef added():\n    pass\n")
+        os.utime(self.script, ns=(0, 0))
+        updated_index = get_declaration_index(self.script)
+        self.assertIsNot(updated_index, index)
+        self.assertEqual(
+            get_declaration_block("added", self.script), "def added():\n    pass"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
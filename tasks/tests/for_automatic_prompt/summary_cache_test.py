@@ -0,0 +1,118 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+import tasks.utils.for_automatic_prompt.summarize_python_script as summarize_python_script
+from tasks.utils.for_automatic_prompt.summarize_python_script import (
+    summarize_python_file,
+    summarize_python_files,
+)
+from tasks.utils.for_automatic_prompt.summary_cache import (
+    SummaryCache,
+    get_file_signature,
+)
+
+SOURCE = (
+    "class Documented:\n"
+    '    """Class docstring."""\n\n'
+    "    def method(self):\n"
+    '        """Method docstring."""\n\n\n'
+    "def undocumented(a, b):\n"
+    "    return a + b\n"
+)
+
+
+class TestSummaryCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = SummaryCache(os.path.join(self.temp_dir, "cache"))
+        self.file_paths = []
+        for index in range(10):
+            file_path = os.path.join(self.temp_dir, f"module_{index}.py")
+            with open(file_path, "w", encoding="utf-8") as f:
+                f.write(SOURCE.replace("Documented", f"Documented{index}"))
+            self.file_paths.append(file_path)
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _expected(self, include_all=False):
+        return [summarize_python_file(path, include_all) for path in self.file_paths]
+
+    def test_summaries_match_uncached(self):
+        for include_all in (False, True):
+            summaries = summarize_python_files(
+                self.file_paths, include_all, summary_cache=self.cache
+            )
+            self.assertEqual(summaries, self._expected(include_all))
+        self.assertIn("def undocumented(a, b):", summaries[0])
+
+    def test_parallel_parsing_keeps_order(self):
+        summaries = summarize_python_files(self.file_paths, max_workers=2)
+        self.assertEqual(summaries, self._expected())
+
+    def test_unchanged_files_are_not_parsed(self):
+        summarize_python_files(self.file_paths, summary_cache=self.cache)
+        with mock.patch.object(
+            summarize_python_script, "summarize_python_file"
+        ) as summarize_mock:
+            summaries = summarize_python_files(
+                self.file_paths, summary_cache=self.cache
+            )
+        summarize_mock.assert_not_called()
+        self.assertEqual(summaries, self._expected())
+
+    def test_changed_file_is_summarized_again(self):
+        summarize_python_files(self.file_paths, summary_cache=self.cache)
+        with open(self.file_paths[0], "a", encoding="utf-8") as f:
+            f.write('\n\ndef added():\n    """Added docstring."""\n')
+        summaries = summarize_python_files(self.file_paths, summary_cache=self.cache)
+        self.assertIn("def added():", summaries[0])
+        self.assertEqual(summaries, self._expected())
+
+    def test_lru_eviction(self):
+        signatures = [get_file_signature(path) for path in self.file_paths]
+        with SummaryCache(
+            os.path.join(self.temp_dir, "small_cache"), max_entries=3
+        ) as cache:
+            for path, signature in zip(self.file_paths[:3], signatures):
+                cache.add(path, False, signature, "summary")
+            self.assertEqual(
+                cache.get(self.file_paths[0], False, signatures[0]), "summary"
+            )
+            cache.add(self.file_paths[3], False, signatures[3], "summary")
+            self.assertIsNotNone(cache.get(self.file_paths[0], False, signatures[0]))
+            self.assertIsNone(cache.get(self.file_paths[1], False, signatures[1]))
+
+    def test_size_cap(self):
+        signatures = [get_file_signature(path) for path in self.file_paths]
+        with SummaryCache(
+            os.path.join(self.temp_dir, "small_cache"), max_size=10
+        ) as cache:
+            cache.add(self.file_paths[0], False, signatures[0], "x" * 6)
+            cache.add(self.file_paths[1], False, signatures[1], "x" * 6)
+            self.assertIsNone(cache.get(self.file_paths[0], False, signatures[0]))
+            self.assertIsNotNone(cache.get(self.file_paths[1], False, signatures[1]))
+
+    def test_no_eviction_below_caps(self):
+        statements = []
+        self.cache.connection.set_trace_callback(statements.append)
+        summarize_python_files(self.file_paths, summary_cache=self.cache)
+        self.assertFalse(
+            [statement for statement in statements if statement.startswith("DELETE")]
+        )
+
+    def test_context_manager_closes_connection(self):
+        with SummaryCache(os.path.join(self.temp_dir, "cache")) as cache:
+            summarize_python_files(self.file_paths, summary_cache=cache)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            cache.connection.execute("SELECT 1")
+
+
+if __name__ == "__main__":
+    unittest.main()
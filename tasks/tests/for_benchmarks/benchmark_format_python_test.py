@@ -0,0 +1,92 @@
+import ast
+import os
+import shutil
+import tempfile
+import unittest
+
+from tasks.benchmarks.benchmark_format_python import (
+    BENCHMARKED_STRATEGIES,
+    PIPELINE,
+    compare_results,
+    load_results,
+    main,
+    run_benchmark,
+    save_results,
+)
+from tasks.benchmarks.synthetic_corpus import generate_corpus, generate_module
+
+
+class TestSyntheticCorpus(unittest.TestCase):
+
+    def test_module_is_valid_python(self):
+        code = generate_module(num_functions=30, num_imports=25)
+        ast.parse(code)
+        self.assertEqual(code.count("def "), 30)
+        self.assertEqual(code, generate_module(num_functions=30, num_imports=25))
+
+    def test_densities(self):
+        code = generate_module(20, docstring_density=0, exception_density=0)
+        self.assertNotIn("raise", code)
+        self.assertEqual(code.count('"""'), 2)  # The module docstring
+        code = generate_module(20, docstring_density=1, exception_density=1)
+        self.assertEqual(code.count("raise"), 20)
+        self.assertEqual(code.count('"""'), 42)
+        with self.assertRaises(ValueError):
+            generate_module(20, docstring_density=1.5)
+
+    def test_generate_corpus(self):
+        temp_dir = tempfile.mkdtemp()
+        try:
+            file_paths = generate_corpus(temp_dir, 3, num_functions=2)
+            self.assertEqual(len(file_paths), 3)
+            self.assertTrue(all(os.path.isfile(path) for path in file_paths))
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+class TestBenchmarkFormatPython(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_run_benchmark(self):
+        results = run_benchmark(sizes=[2, 4], repeat=1)
+        self.assertEqual([entry["size"] for entry in results["results"]], [2, 4])
+        for entry in results["results"]:
+            self.assertEqual(
+                set(entry["timings"]), set(BENCHMARKED_STRATEGIES + [PIPELINE])
+            )
+        json_path = os.path.join(self.temp_dir, "results.json")
+        save_results(results, json_path)
+        self.assertEqual(load_results(json_path), results)
+
+    def test_compare_results(self):
+        baseline = {"results": [{"size": 10, "timings": {"RT": 1.0, "AE": 1.0}}]}
+        results = {
+            "results": [
+                {"size": 10, "timings": {"RT": 1.1, "AE": 2.0}},
+                {"size": 20, "timings": {"RT": 1.0}},
+            ]
+        }
+        comparisons = compare_results(results, baseline, tolerance=0.25)
+        self.assertEqual(len(comparisons), 2)
+        regressions = [c["name"] for c in comparisons if c["regression"]]
+        self.assertEqual(regressions, ["AE"])
+
+    def test_main_fails_on_regression(self):
+        baseline = {
+            "results": [
+                {"size": 2, "timings": {name: 1e-9 for name in BENCHMARKED_STRATEGIES}}
+            ]
+        }
+        baseline_path = os.path.join(self.temp_dir, "baseline.json")
+        save_results(baseline, baseline_path)
+        argv = ["--sizes", "2", "--repeat", "1", "--baseline", baseline_path]
+        self.assertEqual(main(argv), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -87,6 +87,34 @@ class TestFileExecutionTracker(unittest.TestCase):
             for row, path in zip(rows, expected_paths):
                 self.assertEqual(row, [path, "pending", "-"])
 
+    def test_write_files_from_directory_with_ignore_patterns(self):
+        for dir_ in ["subdir", "venv", "__pycache__", os.path.join("keep", "build")]:
+            os.makedirs(os.path.join(self.temp_dir.name, dir_), exist_ok=True)
+        file_paths = [
+            os.path.join(self.temp_dir.name, "file1.py"),
+            os.path.join(self.temp_dir.name, "subdir", "file2.py"),
+            os.path.join(self.temp_dir.name, "venv", "file3.py"),
+            os.path.join(self.temp_dir.name, "__pycache__", "file4.py"),
+            os.path.join(self.temp_dir.name, "keep", "build", "file5.py"),
+            os.path.join(self.temp_dir.name, "subdir", "temp.py"),
+        ]
+        for path in file_paths:
+            with open(path, "w") as f:
+                f.write("Test")
+
+        self.tracker.add_files_from_directory(
+            self.temp_dir.name,
+            extensions=[".py"],
+            ignore_patterns=["venv/", "__pycache__/", "/build/", "temp.py"],
+        )
+        with open(self.test_csv_path, "r", newline="") as file:
+            reader = csv.reader(file)
+            next(reader)
+
+            rows = list(reader)
+            expected_paths = file_paths[:2] + file_paths[4:5]
+            self.assertEqual([row[0] for row in rows], expected_paths)
+
     def test_verify_csv(self):
         files = ["file_1", "file_2", "file_3"]
         self.tracker.add_files(files)
@@ -176,6 +204,36 @@ class TestFileExecutionTracker(unittest.TestCase):
             self.assertEqual(rows[0], ["file_1", "failed", "Some error occurred"])
             self.assertEqual(rows[1], ["file_2", "pending", "-"])
 
+    def test_mark_file_as_completed_and_failed(self):
+        files = ["file_1", "file_2", "file_3"]
+        self.tracker.add_files(files)
+        self.tracker.take_next_pending()
+        self.tracker.take_next_pending()
+
+        self.tracker.mark_file_as_completed("file_2")
+        self.tracker.mark_file_as_failed("file_1", "Some error occurred")
+
+        with open(self.test_csv_path, "r", newline="") as file:
+            reader = csv.reader(file)
+            next(reader)
+            rows = list(reader)
+            self.assertEqual(rows[0], ["file_1", "failed", "Some error occurred"])
+            self.assertEqual(rows[1], ["file_2", "completed", "-"])
+            self.assertEqual(rows[2], ["file_3", "pending", "-"])
+
+    def test_reset_running_to_pending(self):
+        files = ["file_1", "file_2", "file_3"]
+        self.tracker.add_files(files)
+        self.tracker.take_next_pending()
+        self.tracker.take_next_pending()
+        self.tracker.verify_tracks()
+
+        reset_count = self.tracker.reset_running_to_pending()
+
+        self.assertEqual(reset_count, 2)
+        self.assertEqual(self.tracker.get_status_count()["pending"], 3)
+        self.assertEqual(self.tracker.take_next_pending(), "file_1")
+
     def test_clear_tracks(self):
         files = ["file_1", "file_2"]
         self.tracker.add_files(files)
@@ -252,6 +310,16 @@ class TestFileExecutionTracker(unittest.TestCase):
 
             self.assertNotIn(["file_2", "pending", "-"], rows)
 
+    def test_remove_files(self):
+        files = ["file_1", "file_2", "file_3"]
+        self.tracker.add_files(files)
+        self.tracker.remove_files(["file_1", "file_3"])
+
+        with open(self.test_csv_path, "r", newline="") as file:
+            reader = csv.reader(file)
+            rows = list(reader)
+            self.assertEqual(rows[1:], [["file_2", "pending", "-"]])
+
 
 if __name__ == "__main__":
     unittest.main()
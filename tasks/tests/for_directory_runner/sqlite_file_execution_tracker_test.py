@@ -0,0 +1,119 @@
+import csv
+import os
+import tempfile
+import unittest
+
+from tasks.utils.for_directory_runner.file_execution_tracker import FileExecutionTracker
+from tasks.utils.for_directory_runner.sqlite_file_execution_tracker import (
+    SQLiteFileExecutionTracker,
+    open_execution_tracker,
+)
+
+
+class TestSQLiteFileExecutionTracker(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.temp_dir.name, "test_files.db")
+        self.tracker = SQLiteFileExecutionTracker(self.db_path)
+
+    def tearDown(self):
+        self.tracker.close()
+        self.temp_dir.cleanup()
+
+    def test_take_next_pending_and_mark(self):
+        self.tracker.add_files(["file_1", "file_2", "file_3"])
+
+        self.assertEqual(self.tracker.take_next_pending(), "file_1")
+        self.tracker.mark_running_as_completed()
+        self.assertEqual(self.tracker.take_next_pending(), "file_2")
+        self.tracker.mark_running_as_failed(ValueError("Some error occurred"))
+
+        self.assertEqual(self.tracker.get_completed_files(), ["file_1"])
+        self.assertEqual(self.tracker.get_failed_files(), ["file_2"])
+        self.assertEqual(
+            self.tracker.get_status_count(),
+            {"pending": 1, "running": 0, "completed": 1, "skipped": 0, "failed": 1},
+        )
+        self.assertEqual(self.tracker.take_next_pending(), "file_3")
+        self.assertIsNone(self.tracker.take_next_pending())
+
+    def test_mark_file_and_reset_running(self):
+        self.tracker.add_files(["file_1", "file_2", "file_3"])
+        self.tracker.take_next_pending()
+        self.tracker.take_next_pending()
+        self.tracker.mark_file_as_completed("file_2")
+
+        self.assertEqual(self.tracker.reset_running_to_pending(), 1)
+        self.assertEqual(self.tracker.take_next_pending(), "file_1")
+
+    def test_tracks_persist_after_reopening(self):
+        self.tracker.add_files(["file_1", "file_2"])
+        self.tracker.take_next_pending()
+        self.tracker.close()
+
+        self.tracker = SQLiteFileExecutionTracker(self.db_path)
+        self.tracker.verify_tracks()
+        self.assertEqual(self.tracker.get_status_count()["running"], 1)
+
+    def test_verify_without_previous_tracks(self):
+        with self.assertRaises(FileNotFoundError):
+            self.tracker.verify_tracks()
+        csv_path = os.path.join(self.temp_dir.name, "missing_tracks.csv")
+        tracker = open_execution_tracker(csv_path)
+        try:
+            with self.assertRaises(FileNotFoundError):
+                tracker.verify_tracks()
+        finally:
+            tracker.close()
+
+    def test_remove_file_and_clear_tracks(self):
+        self.tracker.add_files(["file_1", "file_2", "file_3"])
+        self.tracker.remove_file("file_2")
+        self.assertEqual(self.tracker.get_status_count()["pending"], 2)
+        self.tracker.remove_files(["file_1", "file_3"])
+        self.assertEqual(self.tracker.get_status_count()["pending"], 0)
+
+        self.tracker.clear_tracks()
+        self.assertEqual(sum(self.tracker.get_status_count().values()), 0)
+
+    def test_export_csv(self):
+        self.tracker.add_files(["file_1", "file_2"])
+        self.tracker.take_next_pending()
+        self.tracker.mark_running_as_failed("Some error occurred")
+        csv_path = os.path.join(self.temp_dir.name, "test_files.csv")
+
+        self.tracker.export_csv(csv_path)
+
+        with open(csv_path, "r", newline="") as file:
+            rows = list(csv.reader(file))
+        self.assertEqual(
+            rows,
+            [
+                ["File Path", "Status", "Comments"],
+                ["file_1", "failed", "Some error occurred"],
+                ["file_2", "pending", "-"],
+            ],
+        )
+        self.assertEqual(FileExecutionTracker(csv_path).get_failed_files(), ["file_1"])
+
+    def test_open_execution_tracker_imports_csv(self):
+        csv_path = os.path.join(self.temp_dir.name, "tracks.csv")
+        csv_tracker = FileExecutionTracker(csv_path)
+        csv_tracker.add_files(["file_1", "file_2"])
+        csv_tracker.take_next_pending()
+        csv_tracker.mark_running_as_completed()
+
+        tracker = open_execution_tracker(csv_path)
+        try:
+            self.assertEqual(
+                tracker.db_path, os.path.join(self.temp_dir.name, "tracks.db")
+            )
+            self.assertEqual(tracker.get_completed_files(), ["file_1"])
+            self.assertEqual(tracker.take_next_pending(), "file_2")
+        finally:
+            tracker.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
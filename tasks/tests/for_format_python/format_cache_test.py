@@ -0,0 +1,88 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from tasks.utils.for_format_python.format_cache import (
+    FormatCache,
+    get_format_cache_key,
+)
+import tasks.utils.for_format_python.format_python_file as format_python_file_module
+from tasks.utils.for_format_python.format_python_file import format_python_file
+
+CODE = "def function():   \n    return 1   \n"
+
+
+class TestFormatCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, "script.py")
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write(CODE)
+        self.cache = FormatCache(os.path.join(self.temp_dir, "data"))
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _format(self, select_only):
+        return format_python_file(
+            self.file_path, select_only=select_only, format_cache=self.cache
+        )
+
+    def test_unchanged_file_is_skipped(self):
+        self.assertTrue(self._format(["RT"]))
+        self.assertFalse(self._format(["RT"]))
+
+    def test_changed_file_is_formatted(self):
+        self.assertTrue(self._format(["RT"]))
+        with open(self.file_path, "a", encoding="utf-8") as f:
+            f.write("x = 1   \n")
+        self.assertTrue(self._format(["RT"]))
+        with open(self.file_path, "r", encoding="utf-8") as f:
+            self.assertTrue(f.read().endswith("x = 1\n"))
+
+    def test_other_strategies_are_not_skipped(self):
+        self.assertTrue(self._format(["RT"]))
+        self.assertTrue(self._format(["RT", "EN"]))
+
+    def test_failed_black_formatting_is_not_cached(self):
+        def format_code_with_black(code, *args, **kwargs):
+            return code, "Formatting error: Cannot parse"
+
+        with mock.patch.object(
+            format_python_file_module, "format_code_with_black", format_code_with_black
+        ):
+            for _ in range(2):
+                formatted = format_python_file(
+                    self.file_path,
+                    select_only=["BF"],
+                    python_env_path=sys.prefix,
+                    format_cache=self.cache,
+                )
+                self.assertTrue(formatted)
+
+    def test_key_depends_on_black_configuration(self):
+        key = get_format_cache_key(CODE, self.file_path, ["BF"])
+        with open(
+            os.path.join(self.temp_dir, "pyproject.toml"), "w", encoding="utf-8"
+        ) as f:
+            f.write("[tool.black]\nline-length = 60\n")
+        self.assertNotEqual(key, get_format_cache_key(CODE, self.file_path, ["BF"]))
+
+    def test_least_recently_used_keys_are_dropped(self):
+        self.cache.max_entries = 2
+        for key in ["key_1", "key_2"]:
+            self.cache.add(key)
+        self.assertTrue(self.cache.contains("key_1"))
+        self.cache.add("key_3")
+        self.assertTrue(self.cache.contains("key_1"))
+        self.assertFalse(self.cache.contains("key_2"))
+        self.assertTrue(self.cache.contains("key_3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
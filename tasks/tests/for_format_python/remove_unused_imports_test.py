@@ -0,0 +1,43 @@
+import unittest
+
+from tasks.utils.for_format_python.collect_used_names import collect_used_names
+from tasks.utils.for_format_python.remove_unused_imports import remove_unused_imports
+
+
+class TestRemoveUnusedImports(unittest.TestCase):
+
+    def test_collect_used_names(self):
+        code = "import os as operating_system\nx = os.path.join(y)\ndef func(): pass\n"
+        self.assertEqual(
+            collect_used_names(code), {"x", "os", "path", "join", "y", "func"}
+        )
+        self.assertIn(
+            "operating_system", collect_used_names(code, include_imports=True)
+        )
+
+    def test_remove_unused_statement(self):
+        code = "import os\nimport sys\n\nprint(sys.argv)\n"
+        self.assertEqual(remove_unused_imports(code), "import sys\n\nprint(sys.argv)\n")
+
+    def test_remove_unused_specifiers(self):
+        code = "from os import path, sep as separator, getcwd\n\nprint(path, getcwd())\n"
+        self.assertEqual(
+            remove_unused_imports(code),
+            "from os import path, getcwd\n\nprint(path, getcwd())\n",
+        )
+
+    def test_remove_unused_multiline_statement(self):
+        code = "from math import (\n    sqrt,\n    ceil,\n)\nimport os\nprint(os)\n"
+        self.assertEqual(remove_unused_imports(code), "import os\nprint(os)\n")
+
+    def test_remove_unused_statement_on_last_line(self):
+        code = "print('Hello')\nimport os"
+        self.assertEqual(remove_unused_imports(code), "print('Hello')\n")
+
+    def test_keeps_used_imports(self):
+        code = "import numpy as np\n\ndef func():\n    return np.zeros(1)\n"
+        self.assertEqual(remove_unused_imports(code), code)
+
+
+if __name__ == "__main__":
+    unittest.main()
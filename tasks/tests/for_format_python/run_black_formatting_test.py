@@ -0,0 +1,85 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from tasks.utils.for_format_python.run_black_formatting import (
+    close_black_workers,
+    format_code_with_black,
+    get_environment_black_version,
+)
+
+ENVIRONMENT_PATH = sys.prefix
+CODE = (
+    "def function(argument_one, argument_two, argument_three, argument_four):\n"
+    "    return {'one': argument_one, 'two': argument_two}\n"
+)
+
+
+@unittest.skipUnless(
+    get_environment_black_version(ENVIRONMENT_PATH),
+    "Black is not installed in the current environment.",
+)
+class TestFormatCodeWithBlack(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        with open(
+            os.path.join(self.temp_dir, "pyproject.toml"), "w", encoding="utf-8"
+        ) as f:
+            f.write("[tool.black]\nline-length = 60\n")
+        self.file_path = os.path.join(self.temp_dir, "script.py")
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write(CODE)
+
+    def tearDown(self):
+        close_black_workers()
+        shutil.rmtree(self.temp_dir)
+
+    def test_modes_produce_same_code(self):
+        results = {
+            mode: format_code_with_black(
+                CODE, self.file_path, ENVIRONMENT_PATH, mode=mode
+            )
+            for mode in ["in_process", "worker", "subprocess"]
+        }
+        expected_code, message = results["subprocess"]
+        self.assertIn('"one"', expected_code)
+        self.assertEqual(message, "")
+        for mode in ["in_process", "worker"]:
+            self.assertEqual(results[mode], (expected_code, ""), mode)
+
+    def test_modes_do_not_format_with_check_option(self):
+        with open(
+            os.path.join(self.temp_dir, "pyproject.toml"), "a", encoding="utf-8"
+        ) as f:
+            f.write("check = true\n")
+        for mode in ["in_process", "worker", "subprocess"]:
+            formatted_code, _ = format_code_with_black(
+                CODE, self.file_path, ENVIRONMENT_PATH, mode=mode
+            )
+            self.assertEqual(formatted_code, CODE, mode)
+
+    def test_in_memory_modes_do_not_write_file(self):
+        for mode in ["in_process", "worker"]:
+            format_code_with_black(CODE, self.file_path, ENVIRONMENT_PATH, mode=mode)
+            with open(self.file_path, "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), CODE)
+
+    def test_invalid_code_returns_error(self):
+        code = "def function(:\n"
+        for mode in ["in_process", "worker"]:
+            formatted_code, message = format_code_with_black(
+                code, self.file_path, ENVIRONMENT_PATH, mode=mode
+            )
+            self.assertEqual(formatted_code, code)
+            self.assertTrue(message.startswith("Formatting error"))
+
+    def test_invalid_mode_raises(self):
+        with self.assertRaises(ValueError):
+            format_code_with_black(CODE, self.file_path, ENVIRONMENT_PATH, mode="x")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,38 @@
+import ast
+import unittest
+from unittest.mock import patch
+
+from tasks.utils.for_format_python.is_specifier_used import is_specifier_used
+from tasks.utils.for_format_python.source_document import (
+    SourceDocument,
+    get_source_document,
+)
+
+
+class TestSourceDocument(unittest.TestCase):
+
+    def test_tree_is_parsed_once(self):
+        document = SourceDocument("x = 1\n")
+        with patch("ast.parse", wraps=ast.parse) as parse:
+            tree = document.tree
+            self.assertIsInstance(tree, ast.Module)
+            self.assertIs(document.tree, tree)
+        self.assertEqual(parse.call_count, 1)
+
+    def test_last_document_is_reused(self):
+        document = get_source_document("x = 1\n")
+        self.assertIs(get_source_document("x = 1\n"), document)
+        updated_document = get_source_document("x = 2\n")
+        self.assertIsNot(updated_document, document)
+        self.assertEqual(updated_document.code, "x = 2\n")
+
+    def test_specifier_lookups_share_parse(self):
+        code = "a = b + c\n"
+        with patch("ast.parse", wraps=ast.parse) as parse:
+            for name in ["a", "b", "c", "d"]:
+                is_specifier_used(name, code)
+        self.assertEqual(parse.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import glob
+import os
+import unittest
+
+from tasks.benchmarks.synthetic_corpus import generate_module
+from tasks.configs.constants import TASKS_ROOT
+from tasks.utils.for_format_python.format_python_file import (
+    STRATEGIES,
+    STRATEGY_PROBES,
+)
+
+DATA_DIR = os.path.join(TASKS_ROOT, "tasks", "tests", "data")
+
+# Code without any of the patterns the probed strategies act on.
+PLAIN_CODE = "import os\n\n\ndef function(path):\n    print(os.listdir(path))\n"
+APPLICABLE_CODES = {
+    "AE": "with open(path) as f:\n    f.read()\n",
+    "RUE": "if x:\n    return 1\nelse:\n    return 2\n",
+    "RF": 'print(f"text")\n',
+    "FE": 'raise ValueError("Invalid value")\n',
+    "FD": 'def function():\n    """\n    Docstring.\n    """\n',
+}
+
+
+def _get_sample_codes():
+    codes = [PLAIN_CODE, generate_module(num_functions=10)]
+    codes += list(APPLICABLE_CODES.values())
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, "*.py"))):
+        with open(path, "r", encoding="utf-8") as f:
+            codes.append(f.read())
+    return codes
+
+
+class TestStrategyProbes(unittest.TestCase):
+
+    def test_probes_fail_without_pattern(self):
+        for abbreviation, probe in STRATEGY_PROBES.items():
+            with self.subTest(strategy=abbreviation):
+                self.assertFalse(probe(PLAIN_CODE))
+                self.assertTrue(probe(APPLICABLE_CODES[abbreviation]))
+
+    def test_skipped_strategies_would_not_change_code(self):
+        # A failed probe must only skip strategies that would change no more
+        # than the line endings.
+        for code in _get_sample_codes():
+            for abbreviation, probe in STRATEGY_PROBES.items():
+                function = STRATEGIES[abbreviation][0]
+                if probe(code):
+                    continue
+                with self.subTest(strategy=abbreviation, code=code[:40]):
+                    self.assertEqual(function(code).splitlines(), code.splitlines())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from tasks.utils.for_format_python.format_python_file import format_python_file
+from tasks.utils.for_format_python.strategy_timing import (
+    STRATEGY_TIMINGS_FILE,
+    JsonLinesTimingSink,
+    MemoryTimingSink,
+    aggregate_timings,
+    format_timings_table,
+    get_timing_sink,
+    load_timing_records,
+)
+
+CODE = "with open(path) as f:   \n    content = f.read()\n"
+
+
+class TestStrategyTiming(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.temp_dir, "script.py")
+        with open(self.file_path, "w", encoding="utf-8") as f:
+            f.write(CODE)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_records_of_format_python_file(self):
+        sink = MemoryTimingSink()
+        format_python_file(
+            self.file_path, select_only=["RT", "AE", "EN"], timing_sink=sink
+        )
+        self.assertEqual(
+            [record["strategy"] for record in sink.records], ["RT", "AE", "EN"]
+        )
+        rt, ae, en = sink.records
+        self.assertEqual(rt["file_path"], self.file_path)
+        self.assertEqual(rt["input_size"], len(CODE))
+        self.assertEqual(rt["output_size"], len(CODE) - 3)
+        self.assertTrue(rt["changed"])
+        self.assertTrue(ae["changed"])
+        self.assertFalse(en["changed"])
+        self.assertEqual(en["input_size"], en["output_size"])
+        self.assertGreaterEqual(ae["wall_time"], 0)
+        self.assertGreaterEqual(ae["cpu_time"], 0)
+        self.assertIsNone(ae["checkpoint"])
+
+    def test_skipped_strategies_are_recorded(self):
+        sink = MemoryTimingSink()
+        format_python_file(self.file_path, select_only=["AE", "FD"], timing_sink=sink)
+        ae, fd = sink.records
+        self.assertFalse(ae["skipped"])
+        self.assertTrue(fd["skipped"])
+        self.assertFalse(fd["changed"])
+        totals = aggregate_timings(sink.records)
+        self.assertEqual(totals["FD"]["skipped"], 1)
+
+    def test_json_lines_sink(self):
+        log_file = os.path.join(self.temp_dir, STRATEGY_TIMINGS_FILE)
+        sink = get_timing_sink("log", self.temp_dir)
+        self.assertIsInstance(sink, JsonLinesTimingSink)
+        format_python_file(self.file_path, select_only=["RT", "AE"], timing_sink=sink)
+        format_python_file(self.file_path, select_only=["RT", "AE"], timing_sink=sink)
+        with open(log_file, "a", encoding="utf-8") as f:
+            f.write('{"strategy": "RT", "wall')  # Partially written record
+        records = load_timing_records(log_file)
+        self.assertEqual(len(records), 4)
+        totals = aggregate_timings(records)
+        self.assertEqual(list(totals), ["RT", "AE"])
+        self.assertEqual(totals["RT"]["runs"], 2)
+        self.assertEqual(totals["RT"]["changed"], 1)
+        table = format_timings_table(records)
+        self.assertEqual(len(table.splitlines()), 3)
+        self.assertIn("strategy", table.splitlines()[0])
+
+    def test_get_timing_sink(self):
+        self.assertIsNone(get_timing_sink(None, self.temp_dir))
+        with self.assertRaises(ValueError):
+            get_timing_sink("file", self.temp_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+from contextlib import contextmanager
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import tasks.management.task_daemon as task_daemon
+from tasks.management.task_daemon import TaskDaemon, request_task
+
+ECHO_TASK = """import os
+import sys
+
+print("args:", " ".join(sys.argv[1:]))
+print("cwd:", os.getcwd())
+print("env:", os.environ.get("TASK_DAEMON_TEST"))
+if sys.argv[2:] == ["fail"]:
+    raise ValueError("Task failed")
+sys.exit(int(sys.argv[2]) if len(sys.argv) > 2 else 0)
+"""
+
+
+@contextmanager
+def _redirect_stdout_fd(output_file):
+    # The daemon writes to the file descriptors of the client.
+    saved_fd = os.dup(1)
+    with open(output_file, "w", encoding="utf-8") as f:
+        os.dup2(f.fileno(), 1)
+    try:
+        yield
+    finally:
+        os.dup2(saved_fd, 1)
+        os.close(saved_fd)
+
+
+class TestTaskDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.temp_dir, "daemon.sock")
+        self.output_file = os.path.join(self.temp_dir, "output.txt")
+        os.makedirs(os.path.join(self.temp_dir, "echo"))
+        with open(
+            os.path.join(self.temp_dir, "echo", "echo_task.py"), "w", encoding="utf-8"
+        ) as f:
+            f.write(ECHO_TASK)
+        patchers = [
+            patch.object(task_daemon, "TASKS_DIR", self.temp_dir),
+            patch.object(task_daemon, "TASK_NAMES", ["echo"]),
+            patch.object(TaskDaemon, "_import_tasks"),
+            patch.object(TaskDaemon, "_warm_runner"),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.daemon_pid = os.fork()
+        if self.daemon_pid == 0:
+            try:
+                with open(os.devnull, "w", encoding="utf-8") as devnull:
+                    os.dup2(devnull.fileno(), 1)
+                TaskDaemon(self.socket_path).serve_forever()
+            finally:
+                os._exit(0)
+        for _ in range(100):
+            if os.path.exists(self.socket_path):
+                break
+            time.sleep(0.05)
+
+    def tearDown(self):
+        os.kill(self.daemon_pid, signal.SIGTERM)
+        os.waitpid(self.daemon_pid, 0)
+        shutil.rmtree(self.temp_dir)
+
+    def _request(self, args):
+        with _redirect_stdout_fd(self.output_file):
+            exit_code = request_task("echo", "runner_root", args, self.socket_path)
+        with open(self.output_file, "r", encoding="utf-8") as f:
+            return exit_code, f.read()
+
+    def test_task_output_and_exit_code(self):
+        with patch.dict(os.environ, {"TASK_DAEMON_TEST": "value"}):
+            exit_code, output = self._request(["3"])
+        self.assertEqual(exit_code, 3)
+        self.assertIn("args: runner_root 3", output)
+        self.assertIn(f"cwd: {os.getcwd()}", output)
+        self.assertIn("env: value", output)
+
+        exit_code, output = self._request([])
+        self.assertEqual(exit_code, 0)
+
+    def test_failing_task(self):
+        exit_code, _ = self._request(["fail"])
+        self.assertEqual(exit_code, 1)
+
+    def test_invalid_cwd(self):
+        with patch.object(task_daemon.os, "getcwd", return_value="/nonexistent"):
+            exit_code, output = self._request(["0"])
+        self.assertEqual(exit_code, 1)
+        self.assertNotIn("args:", output)
+        # The child failed without taking over the daemon or its socket.
+        self.assertTrue(os.path.exists(self.socket_path))
+        self.assertEqual(self._request(["0"])[0], 0)
+
+    def test_malformed_requests(self):
+        requests = [b"[1]\n", b'{"task_name": "echo"}\n', b'{"task_name": 1}\n']
+        for request in requests:
+            with self.subTest(request=request):
+                connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                connection.connect(self.socket_path)
+                socket.send_fds(connection, [b"\0"], [0, 1, 2])
+                connection.sendall(request)
+                # The daemon rejects the request by closing the connection.
+                self.assertEqual(connection.recv(1), b"")
+                connection.close()
+        self.assertTrue(os.path.exists(self.socket_path))
+        self.assertEqual(self._request(["0"])[0], 0)
+
+    def test_no_daemon(self):
+        missing_socket = os.path.join(self.temp_dir, "missing.sock")
+        self.assertIsNone(request_task("echo", "runner_root", [], missing_socket))
+        with self.assertRaises(ValueError):
+            request_task("unknown", "runner_root", [], self.socket_path)
+
+    def test_daemon_is_already_running(self):
+        with self.assertRaises(RuntimeError):
+            TaskDaemon(self.socket_path)._bind()  # pylint: disable=protected-access
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        probe.connect(self.socket_path)
+        probe.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
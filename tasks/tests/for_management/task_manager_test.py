@@ -1,6 +1,9 @@
 from enum import Enum
 import json
+import multiprocessing
 import os
+import subprocess
+import sys
 import tempfile
 import unittest
 from unittest.mock import patch, MagicMock
@@ -8,7 +11,10 @@ import warnings
 
 import tasks
 from tasks.management.standardize_path import standardize_path
-from tasks.management.task_manager import TaskManager as Manager
+from tasks.management.task_manager import (
+    TaskManager as Manager,
+    _update_runner_capturing_output,
+)
 from tasks.management.task_runner_profile import TaskRunnerProfile
 
 class AttrNamesMock(Enum):
@@ -380,6 +386,75 @@ class TestTaskManager(unittest.TestCase):
                 self.assertTrue(os.path.exists(old_value1))
                 self.assertTrue(os.path.exists(new_value2))
 
+    def _register_runners_for_update(self):
+        runner_roots = [
+            standardize_path(os.path.join(self.temp_dir.name, name))
+            for name in ("runner_a", "runner_failing", "runner_c")
+        ]
+        with open(self.json_mock, "w", encoding="utf-8") as f:
+            json.dump({root: root for root in runner_roots}, f)
+
+        def update_runner(runner_root):
+            if runner_root.endswith("failing"):
+                raise ValueError("Update failed.")
+            with open(runner_root + ".updated", "w", encoding="utf-8") as f:
+                f.write("")
+
+        return runner_roots, update_runner
+
+    def _assert_update_results(self, runner_roots, failures):
+        self.assertEqual(list(failures), [runner_roots[1]])
+        self.assertIn("ValueError: Update failed.", failures[runner_roots[1]])
+        for runner_root in (runner_roots[0], runner_roots[2]):
+            self.assertTrue(os.path.exists(runner_root + ".updated"))
+
+    def test_update_registered_runners_continues_after_failure(self):
+        runner_roots, update_runner = self._register_runners_for_update()
+        with patch.object(Manager, "update_runner", new=update_runner):
+            failures = Manager.update_registered_runners()
+        self._assert_update_results(runner_roots, failures)
+
+    @unittest.skipUnless(
+        multiprocessing.get_start_method() == "fork",
+        "The patched update is only inherited by forked processes.",
+    )
+    def test_update_registered_runners_in_parallel(self):
+        runner_roots, update_runner = self._register_runners_for_update()
+        with patch.object(Manager, "update_runner", new=update_runner):
+            failures = Manager.update_registered_runners(max_workers=2)
+        self._assert_update_results(runner_roots, failures)
+
+    def test_update_captures_output_of_subprocesses(self):
+        def update_runner(runner_root):
+            print("Python output")
+            subprocess.run(
+                [sys.executable, "-c", "print('Subprocess output')"], check=True
+            )
+
+        with patch.object(Manager, "update_runner", new=update_runner):
+            runner_root, output, error = _update_runner_capturing_output(
+                self.runner_root
+            )
+        self.assertEqual(runner_root, self.runner_root)
+        self.assertEqual(output.splitlines(), ["Python output", "Subprocess output"])
+        self.assertIsNone(error)
+
+    @unittest.skipUnless(
+        multiprocessing.get_start_method() == "fork",
+        "The patched update is only inherited by forked processes.",
+    )
+    def test_update_registered_runners_with_dying_worker(self):
+        runner_roots, _ = self._register_runners_for_update()
+
+        def update_runner(runner_root):
+            if runner_root.endswith("failing"):
+                os._exit(1)
+
+        with patch.object(Manager, "update_runner", new=update_runner):
+            failures = Manager.update_registered_runners(max_workers=2)
+        self.assertIn(runner_roots[1], failures)
+        self.assertIn("BrokenProcessPool", failures[runner_roots[1]])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -336,6 +336,82 @@ class TestTaskRunnerProfile(unittest.TestCase):
             self.assertEqual(profile.attr_3, "value3")
             self.assertEqual(profile.attr_4, "new_value4")
 
+    def test_update_attributes_with_new_attribute(self):
+        UpdateMappingMock = {"cwd": "cwd", "python_env": "python_env"}
+        with patch(
+            "tasks.configs.constants.REGISTERED_RUNNERS_JSON", self.json_mock
+        ), patch(
+            "tasks.configs.profile_attributes.ProfileAttrNames", AttrNamesMock
+        ), patch(
+            "tasks.configs.profile_attributes.UPDATE_MAPPING", UpdateMappingMock
+        ):
+            profile = TaskRunnerProfile(
+                self.runner_root, load_attributes_from_storage=False
+            )
+            profile.load_attributes_from_dict({"cwd": "test_dir"})
+
+            profile.update_attributes(
+                {"cwd": "new_test_dir", "python_env": "new_test_env"}
+            )
+            self.assertEqual(profile.cwd, "test_dir")
+            self.assertEqual(profile.python_env, "new_test_env")
+
+    def test_lazy_load_attributes_from_storage(self):
+        with patch(
+            "tasks.configs.constants.REGISTERED_RUNNERS_JSON", self.json_mock
+        ), patch(
+            "tasks.configs.profile_attributes.ProfileAttrNames",
+            AttrNamesMockExtended,
+        ):
+            with open(
+                os.path.join(self.profile_dir, "configs.json"), "w", encoding="utf-8"
+            ) as f:
+                json.dump({"cwd": "test_dir", "python_env": "test_env"}, f, indent=4)
+            with open(os.path.join(self.profile_dir, "other_configs.pkl"), "wb") as f:
+                pickle.dump({"attr_5": "value5", "attr_6": "value6"}, f)
+
+            profile = TaskRunnerProfile(self.runner_root)
+            self.assertEqual(profile.cwd, "test_dir")
+            self.assertEqual(profile._pending_files, ["other_configs.pkl"])
+            self.assertEqual(profile.attr_6, "value6")
+            self.assertEqual(profile._pending_files, [])
+            self.assertEqual(
+                profile.attributes,
+                {
+                    "cwd": "test_dir",
+                    "python_env": "test_env",
+                    "attr_5": "value5",
+                    "attr_6": "value6",
+                },
+            )
+            self.assertFalse(hasattr(profile, "attr_3"))
+
+    def test_profile_files_are_loaded_once_per_version(self):
+        with patch(
+            "tasks.configs.constants.REGISTERED_RUNNERS_JSON", self.json_mock
+        ), patch(
+            "tasks.configs.profile_attributes.ProfileAttrNames", AttrNamesMock
+        ):
+            configs_json = os.path.join(self.profile_dir, "configs.json")
+            with open(configs_json, "w", encoding="utf-8") as f:
+                json.dump({"cwd": "test_dir", "python_env": "test_env"}, f)
+
+            with patch(
+                "tasks.management.task_runner_profile.json.load", wraps=json.load
+            ) as load_mock:
+                for _ in range(3):
+                    profile = TaskRunnerProfile(self.runner_root)
+                    self.assertEqual(profile.cwd, "test_dir")
+                # The registered runners and the configs file
+                self.assertEqual(load_mock.call_count, 2)
+
+                with open(configs_json, "w", encoding="utf-8") as f:
+                    json.dump({"cwd": "other_dir", "python_env": "test_env"}, f)
+                os.utime(configs_json, ns=(0, 0))
+                profile = TaskRunnerProfile(self.runner_root)
+                self.assertEqual(profile.cwd, "other_dir")
+                self.assertEqual(load_mock.call_count, 3)
+
 
 if __name__ == "__main__":
     unittest.main()
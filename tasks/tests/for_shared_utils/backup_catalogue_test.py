@@ -0,0 +1,110 @@
+import csv
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import tasks.utils.shared.backup_catalogue as backup_catalogue
+from tasks.utils.shared.backup_catalogue import BackupCatalogue
+
+
+class TestBackupCatalogue(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file = os.path.join(self.temp_dir, "backup_context.csv")
+        self.catalogue = BackupCatalogue(self.log_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _read_rows(self):
+        with open(self.log_file, "r", newline="", encoding="utf-8") as csvfile:
+            return list(csv.reader(csvfile))
+
+    def test_latest_backup_lookup(self):
+        first_id = self.catalogue.add("a.py", "blob_1", "First")
+        self.catalogue.add("b.py", "blob_2", "Second")
+        third_id = self.catalogue.add("a.py", "blob_3", "Third")
+        self.assertEqual(self.catalogue.get_latest_backup_id("a.py"), third_id)
+        self.assertEqual(self.catalogue.get_backup_ids("a.py"), [first_id, third_id])
+        self.assertEqual(self.catalogue.get_latest_backup_id(), third_id)
+        self.assertEqual(self.catalogue.get_oldest_backup_id(), first_id)
+        self.catalogue.remove(third_id)
+        self.assertEqual(self.catalogue.get_latest_backup_id("a.py"), first_id)
+        self.assertIsNone(self.catalogue.get_latest_backup_id("c.py"))
+        with self.assertRaises(KeyError):
+            self.catalogue.remove(third_id)
+
+    def test_backup_file_references(self):
+        first_id = self.catalogue.add("a.py", "blob", None)
+        second_id = self.catalogue.add("b.py", "blob", None)
+        self.catalogue.remove(first_id)
+        self.assertTrue(self.catalogue.is_referenced("blob"))
+        self.catalogue.remove(second_id)
+        self.assertFalse(self.catalogue.is_referenced("blob"))
+
+    def test_changes_are_appended(self):
+        backup_id = self.catalogue.add("a.py", "blob_1", "First")
+        self.catalogue.commit()
+        self.catalogue.add("b.py", "blob_2", "Second")
+        self.catalogue.remove(backup_id)
+        self.catalogue.commit()
+        rows = self._read_rows()
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[-1][3], backup_catalogue.REMOVE_ACTION)
+
+        other_catalogue = BackupCatalogue(self.log_file)
+        other_catalogue.refresh()
+        self.assertEqual(other_catalogue.entries, self.catalogue.entries)
+
+    def test_refresh_reads_appended_rows(self):
+        other_catalogue = BackupCatalogue(self.log_file)
+        self.catalogue.add("a.py", "blob_1", "First")
+        self.catalogue.commit()
+        other_catalogue.refresh()
+        self.catalogue.add("a.py", "blob_2", "Second")
+        self.catalogue.commit()
+        with patch.object(other_catalogue, "_reset") as reset:
+            other_catalogue.refresh()
+        reset.assert_not_called()
+        self.assertEqual(other_catalogue.get_latest_backup_id("a.py"), 2)
+
+        os.remove(self.log_file)
+        other_catalogue.refresh()
+        self.assertEqual(len(other_catalogue), 0)
+
+    def test_compaction(self):
+        with patch.object(backup_catalogue, "COMPACTION_MIN_ROWS", 4):
+            for i in range(3):
+                backup_id = self.catalogue.add("a.py", f"blob_{i}", None)
+                self.catalogue.commit()
+                self.catalogue.remove(backup_id)
+                self.catalogue.commit()
+        rows = self._read_rows()
+        self.assertLessEqual(len(rows), 5)
+
+        other_catalogue = BackupCatalogue(self.log_file)
+        other_catalogue.refresh()
+        self.assertEqual(len(other_catalogue), 0)
+        self.assertEqual(other_catalogue.add("a.py", "blob", None), backup_id + 1)
+
+    def test_legacy_log(self):
+        with open(self.log_file, "w", newline="", encoding="utf-8") as csvfile:
+            writer = csv.writer(csvfile)
+            writer.writerow(["previous_file_path", "backup_file_name", "comment"])
+            writer.writerow(["a.py", "a_1.py", "First"])
+            writer.writerow(["a.py", "a_2.py", "Second"])
+        self.catalogue.refresh()
+        backup_id = self.catalogue.get_latest_backup_id("a.py")
+        self.assertEqual(
+            self.catalogue.entries[backup_id]["backup_file_name"], "a_2.py"
+        )
+        self.catalogue.commit()
+        self.assertEqual(self._read_rows()[0], backup_catalogue.FIELDNAMES)
+        self.assertEqual(len(self._read_rows()), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+from concurrent.futures import ProcessPoolExecutor
 import csv
 import os
 import shutil
@@ -17,6 +18,10 @@ TEXT_FILE_3_PATH = os.path.join(DATA_DIR, "reference_1.py")
 TEXT_FILE_3_PATH = os.path.normpath(TEXT_FILE_3_PATH)
 
 
+def _store_backup(backup_dir, file_path):
+    BackupHandler(backup_dir, 100).store_backup(file_path, "Concurrent backup")
+
+
 class TestBackupHandler(unittest.TestCase):
 
     def setUp(self):
@@ -35,6 +40,9 @@ class TestBackupHandler(unittest.TestCase):
             os.remove(TEXT_FILE_2_PATH)
 
         shutil.rmtree(self.backup_dir)
+        # The lock file is kept next to the backup directory.
+        if os.path.exists(self.backup_handler.lock_file):
+            os.remove(self.backup_handler.lock_file)
 
     def test_store_and_recover_backup(self):
         source_file = TEXT_FILE_1_PATH
@@ -67,7 +75,7 @@ class TestBackupHandler(unittest.TestCase):
         self.assertEqual(len(os.listdir(self.backup_dir)) - 1, 2)
 
         for file_name in os.listdir(self.backup_dir):
-            if file_name.endswith(".txt"):
+            if file_name.endswith(".txt" + BackupHandler.BLOB_SUFFIX):
                 os.remove(os.path.join(self.backup_dir, file_name))
                 break
 
@@ -134,7 +142,7 @@ class TestBackupHandler(unittest.TestCase):
         self.assertEqual(len(rows), 3)
 
         for file_name in os.listdir(self.backup_dir):
-            if file_name.endswith(".txt"):
+            if file_name.endswith(".txt" + BackupHandler.BLOB_SUFFIX):
                 os.remove(os.path.join(self.backup_dir, file_name))
                 break
 
@@ -169,13 +177,36 @@ class TestBackupHandler(unittest.TestCase):
     def test_max_backups_limit(self):
         source_file = TEXT_FILE_1_PATH
 
+        for i in range(self.max_backups + 1):
+            with open(source_file, "w", encoding="utf-8") as f:
+                f.write(f"Sample content {i}")
+            self.backup_handler.store_backup(source_file, f"Backup comment {i}")
+
+        self.assertEqual(len(os.listdir(self.backup_dir)) - 1, self.max_backups)
+
+        self.backup_handler.recover_backup(source_file)
+        with open(source_file, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), f"Sample content {self.max_backups}")
+
+    def test_identical_backups_are_stored_once(self):
+        source_file = TEXT_FILE_1_PATH
+
         with open(source_file, "w", encoding="utf-8") as f:
             f.write("Sample content")
 
         for i in range(self.max_backups + 1):
             self.backup_handler.store_backup(source_file, f"Backup comment {i}")
 
-        self.assertEqual(len(os.listdir(self.backup_dir)) - 1, self.max_backups)
+        context = self.backup_handler.get_backup_context()
+        self.assertEqual(len(context), self.max_backups)
+        self.assertEqual(len({entry[1] for entry in context}), 1)
+        self.assertEqual(len(os.listdir(self.backup_dir)) - 1, 1)
+
+        for _ in range(self.max_backups):
+            self.backup_handler.recover_backup(source_file)
+            with open(source_file, "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "Sample content")
+        self.assertEqual(os.listdir(self.backup_dir), [BackupHandler.CONTEXT_FILE_NAME])
 
     def test_recover_backup_success(self):
         original_file = TEXT_FILE_1_PATH
@@ -209,12 +240,36 @@ class TestBackupHandler(unittest.TestCase):
         self.assertEqual(len(os.listdir(self.backup_dir)) - 1, 1)
 
         for file_name in os.listdir(self.backup_dir):
-            if file_name.endswith(".txt"):
+            if file_name.endswith(".txt" + BackupHandler.BLOB_SUFFIX):
                 os.remove(os.path.join(self.backup_dir, file_name))
                 with self.assertRaises(FileNotFoundError):
                     self.backup_handler.recover_backup(file_name)
                 break
 
+    def test_recover_backups(self):
+        with open(TEXT_FILE_1_PATH, "w", encoding="utf-8") as f:
+            f.write("Content 1")
+        with open(TEXT_FILE_2_PATH, "w", encoding="utf-8") as f:
+            f.write("Content 2")
+        self.backup_handler.store_backup(TEXT_FILE_1_PATH, "Backup comment 1")
+        self.backup_handler.store_backup(TEXT_FILE_2_PATH, "Backup comment 2")
+        os.remove(TEXT_FILE_1_PATH)
+        os.remove(TEXT_FILE_2_PATH)
+
+        failures = self.backup_handler.recover_backups(
+            [TEXT_FILE_1_PATH, TEXT_FILE_2_PATH, TEXT_FILE_3_PATH], max_workers=2
+        )
+
+        self.assertEqual(list(failures), [TEXT_FILE_3_PATH])
+        for file_path, content in [
+            (TEXT_FILE_1_PATH, "Content 1"),
+            (TEXT_FILE_2_PATH, "Content 2"),
+        ]:
+            with open(file_path, "r", encoding="utf-8") as f:
+                self.assertEqual(f.read(), content)
+        self.assertEqual(self.backup_handler.get_backup_context(), [])
+        self.assertEqual(os.listdir(self.backup_dir), [BackupHandler.CONTEXT_FILE_NAME])
+
     def test_recover_last_backup_successful(self):
         with open(TEXT_FILE_1_PATH, "w", encoding="utf-8") as f:
             f.write("Original content")
@@ -285,6 +340,31 @@ class TestBackupHandler(unittest.TestCase):
         backup_path = self.backup_handler.get_backup_path(source_file)
         self.assertTrue(os.path.exists(backup_path))
         self.assertTrue(backup_path.startswith(self.backup_dir))
+        with open(backup_path, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "Sample content")
+
+        self.backup_handler.cleanup_storage()
+        self.assertTrue(os.path.exists(backup_path))
+        self.backup_handler.recover_backup(source_file)
+        self.assertFalse(os.path.exists(backup_path))
+
+    def test_store_backup_concurrently(self):
+        source_file = TEXT_FILE_1_PATH
+        with open(source_file, "w", encoding="utf-8") as f:
+            f.write("Sample content")
+
+        with ProcessPoolExecutor(max_workers=4) as executor:
+            futures = [
+                executor.submit(_store_backup, self.backup_dir, source_file)
+                for _ in range(8)
+            ]
+            for future in futures:
+                future.result()
+
+        context = self.backup_handler.get_backup_context()
+        self.assertEqual(len(context), 8)
+        self.assertEqual(len({entry[1] for entry in context}), 1)
+        self.assertEqual(len(os.listdir(self.backup_dir)) - 1, 1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,89 @@
+import importlib.util
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+from tasks.utils.shared.execute_pylint import execute_pylint, execute_pylint_batch
+
+ENVIRONMENT_PATH = sys.prefix
+SOURCES = {
+    "module_a.py": (
+        "import os\n\n\ndef join(path):\n    return os.path.join(path, 'a')\n"
+    ),
+    "module_b.py": '"""Docstring only."""\n',
+    "module_c.py": "x=1\ny = undefined_name\n",
+}
+
+
+def _get_score(output):
+    if "Your code has been rated at " not in output:
+        return None
+    return output.split("Your code has been rated at ")[1].split("/10")[0]
+
+
+@unittest.skipUnless(importlib.util.find_spec("pylint"), "Pylint is not installed.")
+class TestExecutePylintBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.files = []
+        for name, source in SOURCES.items():
+            path = os.path.join(self.temp_dir, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(source)
+            self.files.append(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _assert_matches_single_runs(self, outputs):
+        self.assertEqual(set(outputs), set(self.files))
+        for file in self.files:
+            single_output = execute_pylint(file, ENVIRONMENT_PATH)
+            self.assertEqual(_get_score(outputs[file]), _get_score(single_output))
+            batch_messages = [
+                line for line in outputs[file].splitlines() if line.startswith(file)
+            ]
+            single_messages = [
+                line for line in single_output.splitlines() if line.startswith(file)
+            ]
+            self.assertEqual(batch_messages, single_messages)
+
+    def test_batch_matches_single_runs(self):
+        outputs = execute_pylint_batch(self.files, ENVIRONMENT_PATH, jobs=1)
+        self._assert_matches_single_runs(outputs)
+
+    def test_chunked_batch_matches_single_runs(self):
+        outputs = execute_pylint_batch(
+            self.files, ENVIRONMENT_PATH, jobs=2, chunk_size=2
+        )
+        self._assert_matches_single_runs(outputs)
+
+    def test_same_module_names_match_single_runs(self):
+        for directory in ("dir_a", "dir_b"):
+            os.mkdir(os.path.join(self.temp_dir, directory))
+        self.files = [
+            os.path.join(self.temp_dir, "dir_a", "module.py"),
+            os.path.join(self.temp_dir, "dir_b", "module.py"),
+        ]
+        for path, name in zip(self.files, ("module_c.py", "module_a.py")):
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(SOURCES[name])
+        outputs = execute_pylint_batch(self.files, ENVIRONMENT_PATH, jobs=1)
+        self._assert_matches_single_runs(outputs)
+        self.assertNotEqual(
+            _get_score(outputs[self.files[0]]), _get_score(outputs[self.files[1]])
+        )
+
+    def test_output_format(self):
+        outputs = execute_pylint_batch(self.files, ENVIRONMENT_PATH, jobs=1)
+        output = outputs[self.files[2]]
+        self.assertTrue(output.startswith("************* Module module_c\n"))
+        self.assertIn("(undefined-variable)", output)
+        self.assertIn("Your code has been rated at 0.00/10", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
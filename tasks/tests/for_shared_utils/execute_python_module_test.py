@@ -0,0 +1,105 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import tasks.utils.shared.execute_python_module as execute_python_module_
+from tasks.utils.shared.execute_python_module import (
+    PythonModuleWorker,
+    close_python_module_workers,
+    execute_python_module,
+)
+
+ENVIRONMENT_PATH = sys.prefix
+SCRIPTS = {
+    "print_args.py": (
+        "import os\nimport sys\n\n"
+        "print('args', sys.argv[1:])\n"
+        "print('cwd', os.path.basename(os.getcwd()))\n"
+        "print('name', __name__)\n"
+    ),
+    "import_helper.py": "import helper\n\nprint(helper.VALUE)\n",
+    "raise_error.py": "print('before')\nraise ValueError('broken')\n",
+    "exit_code.py": "import sys\n\nprint('exiting')\nsys.exit(3)\n",
+    "run_subprocess.py": (
+        "import subprocess\nimport sys\n\n"
+        "print('parent')\n"
+        "subprocess.run([sys.executable, '-c', 'print(\"child\")'])\n"
+    ),
+    "crash.py": "import os\n\nprint('crashing')\nos._exit(0)\n",
+}
+
+
+class TestExecutePythonModuleWithWorker(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for name, source in SCRIPTS.items():
+            self._write(name, source)
+        self._write("helper.py", "VALUE = 1\n")
+
+    def tearDown(self):
+        close_python_module_workers()
+        shutil.rmtree(self.temp_dir)
+
+    def _write(self, name, source):
+        with open(os.path.join(self.temp_dir, name), "w", encoding="utf-8") as f:
+            f.write(source)
+
+    def _execute(self, name, use_worker, args=None):
+        return execute_python_module(
+            os.path.join(self.temp_dir, name),
+            ENVIRONMENT_PATH,
+            cwd=self.temp_dir,
+            args=args,
+            use_worker=use_worker,
+        )
+
+    def _assert_same_output(self, name, args=None):
+        expected = self._execute(name, False, args)
+        # Runs twice, so the second run is served by the warm worker.
+        for _ in range(2):
+            self.assertEqual(self._execute(name, True, args), expected)
+
+    def test_output_and_arguments(self):
+        self._assert_same_output("print_args.py", args=["a", "b"])
+
+    def test_error_output(self):
+        output = self._execute("raise_error.py", True)
+        self.assertTrue(output.startswith("Error running script: "))
+        self.assertIn("Output: before", output)
+        self.assertIn("ValueError: broken", output)
+        self._assert_same_output("raise_error.py")
+        self._assert_same_output("exit_code.py")
+
+    def test_subprocess_output(self):
+        self._assert_same_output("run_subprocess.py")
+
+    def test_crash_recycles_worker(self):
+        self._assert_same_output("crash.py")
+        self._assert_same_output("print_args.py")
+
+    def test_user_modules_are_reloaded(self):
+        self.assertEqual(self._execute("import_helper.py", True), "1\n")
+        self._write("helper.py", "VALUE = 2\n")
+        self.assertEqual(self._execute("import_helper.py", True), "2\n")
+
+    def test_worker_is_reused_and_recycled(self):
+        self._execute("print_args.py", True)
+        idle_workers = execute_python_module_._IDLE_WORKERS[ENVIRONMENT_PATH]
+        self.assertEqual(len(idle_workers), 1)
+        worker = idle_workers[0]
+        self._execute("print_args.py", True)
+        self.assertIs(idle_workers[0], worker)
+        self.assertEqual(worker.jobs, 2)
+
+        worker = PythonModuleWorker(ENVIRONMENT_PATH, max_jobs=1)
+        worker.run(os.path.join(self.temp_dir, "print_args.py"))
+        self.assertTrue(worker.is_exhausted())
+        execute_python_module_._release_worker(ENVIRONMENT_PATH, worker)
+        self.assertFalse(worker.is_alive())
+
+
+if __name__ == "__main__":
+    unittest.main()
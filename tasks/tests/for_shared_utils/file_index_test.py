@@ -0,0 +1,130 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from tasks.utils.shared.file_index import INDEX_FILE_NAME, FileIndex
+from tasks.utils.shared.find_closest_matching_dir import find_closest_matching_dir
+from tasks.utils.shared.find_closest_matching_file import find_closest_matching_file
+
+
+class TestFileIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root_dir = os.path.join(self.temp_dir, "root")
+        self.index_dir = os.path.join(self.temp_dir, "data")
+        os.makedirs(os.path.join(self.root_dir, "project1", "module", "data"))
+        os.makedirs(os.path.join(self.root_dir, "project2", "module", "data"))
+        self.file1 = self._create_file("project1/module/data/main.py")
+        self.file2 = self._create_file("project2/module/data/main.py")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _create_file(self, rel_path):
+        path = os.path.join(self.root_dir, *rel_path.split("/"))
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("print('hello')")
+        return path
+
+    def test_files_named(self):
+        file_index = FileIndex(self.root_dir, self.index_dir)
+        file_index.refresh()
+        self.assertCountEqual(
+            file_index.files_named("main.py"), [self.file1, self.file2]
+        )
+
+    def test_dirs_named_includes_root(self):
+        file_index = FileIndex(self.root_dir, self.index_dir)
+        file_index.refresh()
+        self.assertEqual(file_index.dirs_named("root"), [self.root_dir])
+        self.assertEqual(len(file_index.dirs_named("module")), 2)
+
+    def test_refresh_detects_new_and_removed_files(self):
+        file_index = FileIndex(self.root_dir, self.index_dir)
+        file_index.refresh()
+        new_file = self._create_file("project1/module/other.py")
+        os.remove(self.file2)
+        self.assertTrue(file_index.refresh())
+        self.assertEqual(file_index.files_named("other.py"), [new_file])
+        self.assertEqual(file_index.files_named("main.py"), [self.file1])
+        self.assertFalse(file_index.refresh())
+
+    def test_index_is_persisted(self):
+        FileIndex(self.root_dir, self.index_dir).refresh()
+        self.assertTrue(os.path.isfile(os.path.join(self.index_dir, INDEX_FILE_NAME)))
+        file_index = FileIndex(self.root_dir, self.index_dir)
+        self.assertFalse(file_index.refresh())
+        self.assertEqual(len(file_index.files_named("main.py")), 2)
+
+    def test_lookup_refreshes_on_miss(self):
+        file_index = FileIndex(self.root_dir, self.index_dir)
+        file_index.refresh()
+        new_file = self._create_file("project2/module/new.py")
+        self.assertEqual(file_index.lookup("files_named", "new.py"), [new_file])
+
+    def test_fragments_match_endswith(self):
+        self._create_file("project1/module/mydata.py")
+        os.makedirs(os.path.join(self.root_dir, "project1", "module", "olddata"))
+        file_index = FileIndex(self.root_dir, self.index_dir)
+        file_index.refresh()
+        all_files = [
+            os.path.join(dirpath, name)
+            for dirpath, _, files in os.walk(self.root_dir)
+            for name in files
+        ]
+        fragments = [
+            os.path.join("data", "main.py"),
+            os.path.join("ta", "main.py"),
+            os.path.join("", "data", "main.py"),
+            os.path.join("project2", "module", "data", "main.py"),
+            os.path.join("root", "project1", "module", "mydata.py"),
+            os.path.join(self.root_dir, "project1", "module", "data", "main.py"),
+            os.path.join("module", "data", "missing.py"),
+        ]
+        for fragment in fragments:
+            expected = [path for path in all_files if path.endswith(fragment)]
+            self.assertCountEqual(file_index.files_ending_with(fragment), expected)
+
+    def test_dir_fragments_match_endswith(self):
+        os.makedirs(os.path.join(self.root_dir, "project1", "module", "olddata"))
+        file_index = FileIndex(self.root_dir, self.index_dir)
+        file_index.refresh()
+        all_dirs = [dirpath for dirpath, _, _ in os.walk(self.root_dir)]
+        fragments = [
+            os.path.join("module", "data"),
+            os.path.join("module", "ta"),
+            os.path.basename(self.temp_dir) + os.sep + "root",
+            os.path.join("root", "project1"),
+            os.path.join("", "module", "data"),
+        ]
+        for fragment in fragments:
+            expected = [path for path in all_dirs if path.endswith(fragment)]
+            self.assertCountEqual(file_index.dirs_ending_with(fragment), expected)
+
+    def test_resolvers_with_index(self):
+        reference = os.path.join(self.root_dir, "project2", "module")
+        result = find_closest_matching_file(
+            "main.py", self.root_dir, reference, index_dir=self.index_dir
+        )
+        self.assertEqual(result, self.file2)
+        result = find_closest_matching_file(
+            os.path.join("project1", "module", "data", "main.py"),
+            self.root_dir,
+            reference,
+            index_dir=self.index_dir,
+        )
+        self.assertEqual(result, self.file1)
+        result = find_closest_matching_dir(
+            "data", self.root_dir, reference, index_dir=self.index_dir
+        )
+        self.assertEqual(result, os.path.join(reference, "data"))
+        with self.assertRaises(FileNotFoundError):
+            find_closest_matching_file(
+                "missing.py", self.root_dir, reference, index_dir=self.index_dir
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from tasks.utils.shared.find_closest_matching_dir import find_closest_matching_dir
+from tasks.utils.shared.find_closest_matching_file import find_closest_matching_file
+from tasks.utils.shared.ignore_patterns import (
+    IgnorePatterns,
+    walk_with_ignore_patterns,
+)
+
+
+class TestIgnorePatterns(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root_dir = os.path.join(self.temp_dir, "root")
+        for dir_ in ["src/pkg", "venv/lib/pkg", "src/__pycache__", "build"]:
+            os.makedirs(os.path.join(self.root_dir, *dir_.split("/")))
+        for file in [
+            "src/pkg/module.py",
+            "venv/lib/pkg/module.py",
+            "src/__pycache__/module.pyc",
+            "build/output.py",
+            "src/notes.log",
+            "src/keep.log",
+        ]:
+            with open(os.path.join(self.root_dir, *file.split("/")), "w") as f:
+                f.write("Test")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_name_patterns_match_at_any_level(self):
+        patterns = IgnorePatterns(["__pycache__", "*.log"], self.root_dir)
+        self.assertTrue(patterns.match("src/__pycache__", is_dir=True))
+        self.assertTrue(patterns.match("a/b/c.log"))
+        self.assertFalse(patterns.match("src/pkg/module.py"))
+
+    def test_directory_only_patterns(self):
+        patterns = IgnorePatterns(["build/"], self.root_dir)
+        self.assertTrue(patterns.match("build", is_dir=True))
+        self.assertFalse(patterns.match("build", is_dir=False))
+
+    def test_anchored_patterns(self):
+        patterns = IgnorePatterns(["/build", "src/*.log"], self.root_dir)
+        self.assertTrue(patterns.match("build", is_dir=True))
+        self.assertFalse(patterns.match("src/build", is_dir=True))
+        self.assertTrue(patterns.match("src/notes.log"))
+        self.assertFalse(patterns.match("src/pkg/notes.log"))
+
+    def test_double_star_patterns(self):
+        patterns = IgnorePatterns(["**/pkg/*.py", "docs/**"], self.root_dir)
+        self.assertTrue(patterns.match("pkg/module.py"))
+        self.assertTrue(patterns.match("src/pkg/module.py"))
+        self.assertTrue(patterns.match("docs/a/b.md"))
+        self.assertFalse(patterns.match("src/module.py"))
+
+    def test_negated_patterns(self):
+        patterns = IgnorePatterns(["*.log", "!keep.log", "# comment", ""], self.root_dir)
+        self.assertTrue(patterns.match("src/notes.log"))
+        self.assertFalse(patterns.match("src/keep.log"))
+
+    def test_walk_prunes_directories(self):
+        walked_dirs = [
+            os.path.relpath(dirpath, self.root_dir)
+            for dirpath, _, _ in walk_with_ignore_patterns(
+                self.root_dir, ["venv/", "__pycache__/", "/build/"]
+            )
+        ]
+        self.assertCountEqual(walked_dirs, [".", "src", os.path.join("src", "pkg")])
+
+    def test_resolvers_respect_ignore_patterns(self):
+        reference = os.path.join(self.root_dir, "venv")
+        ignore_patterns = ["venv/"]
+        result = find_closest_matching_file(
+            "module.py", self.root_dir, reference, ignore_patterns=ignore_patterns
+        )
+        self.assertEqual(
+            result, os.path.join(self.root_dir, "src", "pkg", "module.py")
+        )
+        index_dir = os.path.join(self.temp_dir, "data")
+        result = find_closest_matching_dir(
+            "pkg",
+            self.root_dir,
+            reference,
+            index_dir=index_dir,
+            ignore_patterns=ignore_patterns,
+        )
+        self.assertEqual(result, os.path.join(self.root_dir, "src", "pkg"))
+        with self.assertRaises(FileNotFoundError):
+            find_closest_matching_file(
+                os.path.join("build", "output.py"),
+                self.root_dir,
+                reference,
+                index_dir=index_dir,
+                ignore_patterns=["build/"],
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import sys
+import unittest
+
+from tasks.utils.shared.lazy_import import LazyModule, lazy_import
+
+
+class TestLazyImport(unittest.TestCase):
+
+    def setUp(self):
+        self.saved_module = sys.modules.pop("tabnanny", None)
+
+    def tearDown(self):
+        sys.modules.pop("tabnanny", None)
+        if self.saved_module is not None:
+            sys.modules["tabnanny"] = self.saved_module
+
+    def test_module_is_imported_on_attribute_access(self):
+        tabnanny = lazy_import("tabnanny")
+        self.assertIsInstance(tabnanny, LazyModule)
+        self.assertNotIn("tabnanny", sys.modules)
+        self.assertTrue(callable(tabnanny.check))
+        self.assertIn("tabnanny", sys.modules)
+        self.assertIs(tabnanny.check, sys.modules["tabnanny"].check)
+
+    def test_imported_module_is_returned(self):
+        self.assertIs(lazy_import("unittest"), unittest)
+
+    def test_missing_module(self):
+        module = lazy_import("missing_module_for_lazy_import_test")
+        with self.assertRaises(ModuleNotFoundError):
+            module.attribute  # pylint: disable=pointless-statement
+
+
+if __name__ == "__main__":
+    unittest.main()
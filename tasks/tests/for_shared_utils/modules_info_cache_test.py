@@ -0,0 +1,87 @@
+import importlib.metadata
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import tasks.utils.shared.modules_info_cache as modules_info_cache
+from tasks.utils.shared.modules_info_cache import (
+    get_modules_info_fingerprint,
+    load_cached_modules_info,
+    store_modules_info,
+)
+from tasks.utils.shared.retrieve_modules import get_import_names, retrieve_modules
+
+
+class TestModulesInfoCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.env_path = os.path.join(self.temp_dir, "env")
+        self.site_packages = os.path.join(
+            self.env_path, "lib", "python3.11", "site-packages"
+        )
+        os.makedirs(os.path.join(self.site_packages, "foo-1.0.dist-info"))
+        self.cwd = os.path.join(self.temp_dir, "project")
+        os.makedirs(self.cwd)
+        cache_dir = os.path.join(self.temp_dir, "cache")
+        patcher = patch.object(modules_info_cache, "MODULES_INFO_CACHE_DIR", cache_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_fingerprint_tracks_distributions_and_cwd(self):
+        fingerprint = get_modules_info_fingerprint(self.env_path, self.cwd)
+        self.assertEqual(
+            get_modules_info_fingerprint(self.env_path, self.cwd), fingerprint
+        )
+        os.makedirs(os.path.join(self.site_packages, "bar-2.0.dist-info"))
+        updated_fingerprint = get_modules_info_fingerprint(self.env_path, self.cwd)
+        self.assertNotEqual(updated_fingerprint, fingerprint)
+        with open(os.path.join(self.cwd, "local_module.py"), "w") as f:
+            f.write("")
+        self.assertNotEqual(
+            get_modules_info_fingerprint(self.env_path, self.cwd), updated_fingerprint
+        )
+
+    def test_fingerprint_without_site_packages(self):
+        empty_env = os.path.join(self.temp_dir, "empty_env")
+        os.makedirs(empty_env)
+        self.assertIsNone(get_modules_info_fingerprint(empty_env, self.cwd))
+
+    def test_store_and_load(self):
+        modules_info = {"standard_library": ["os"], "third_party": [], "local": []}
+        fingerprint = get_modules_info_fingerprint(self.env_path, self.cwd)
+        self.assertIsNone(
+            load_cached_modules_info(self.env_path, self.cwd, fingerprint)
+        )
+        store_modules_info(self.env_path, self.cwd, fingerprint, modules_info)
+        self.assertEqual(
+            load_cached_modules_info(self.env_path, self.cwd, fingerprint),
+            modules_info,
+        )
+        self.assertIsNone(load_cached_modules_info(self.env_path, self.cwd, "other"))
+
+
+class TestRetrieveModules(unittest.TestCase):
+
+    def test_import_names_of_distributions(self):
+        self.assertIn(
+            "black", get_import_names(importlib.metadata.distribution("black"))
+        )
+        self.assertIn(
+            "yaml", get_import_names(importlib.metadata.distribution("PyYAML"))
+        )
+
+    def test_retrieve_modules(self):
+        modules_info = retrieve_modules(os.path.dirname(__file__))["modules_info"]
+        self.assertIn("os", modules_info["standard_library"])
+        self.assertIn("black", modules_info["third_party"])
+        self.assertIn("modules_info_cache_test", modules_info["local"])
+
+
+if __name__ == "__main__":
+    unittest.main()
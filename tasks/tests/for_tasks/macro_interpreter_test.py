@@ -0,0 +1,130 @@
+import time
+import unittest
+
+from tasks.tasks.core.macro_interpreter import MacroInterpreter
+
+DELAY = 0.2
+
+
+class SlowMacroInterpreter(MacroInterpreter):
+
+    def validate_slow_macro(self, line):
+        if line.startswith("#slow "):
+            return self.defer(self._resolve_slow_macro, line[len("#slow ") :])
+        return None
+
+    def _resolve_slow_macro(self, text):
+        time.sleep(DELAY)
+        return {"type": "slow", "text": text}
+
+    def validate_split_macro(self, line):
+        if line.startswith("#split "):
+            return self.defer(self._resolve_split_macro, line[len("#split ") :])
+        return None
+
+    def _resolve_split_macro(self, text):
+        time.sleep(DELAY)
+        return [{"type": "split", "text": part} for part in text.split(",")]
+
+    def validate_nested_macro(self, line):
+        if line.startswith("#nested "):
+            return self.defer(self._resolve_nested_macro, line[len("#nested ") :])
+        return None
+
+    def _resolve_nested_macro(self, text):
+        macros, _ = self.extract_macros_from_text(
+            "\n".join(f"#slow {part}" for part in text.split(","))
+        )
+        return macros
+
+    def validate_fast_macro(self, line):
+        if line.startswith("#fast "):
+            return {"type": "fast", "text": line[len("#fast ") :]}
+        return None
+
+    def validate_failing_macro(self, line):
+        if line.startswith("#fail"):
+            return self.defer(self._resolve_failing_macro)
+        return None
+
+    def _resolve_failing_macro(self):
+        msg = "Macro failed."
+        raise RuntimeError(msg)
+
+    def validate_empty_macro(self, line):
+        if line.startswith("#empty"):
+            return self.defer(self._resolve_empty_macro, line)
+        return None
+
+    def _resolve_empty_macro(self, line):
+        time.sleep(DELAY)
+        return [] if line.endswith("list") else None
+
+    def validate_fallback_macro(self, line):
+        if line.startswith("#empty fallback"):
+            return {"type": "fallback", "text": line}
+        return None
+
+    def post_process_macros(self, macros):
+        return macros
+
+
+TEXT = "\n".join(
+    [
+        "#slow 1",
+        "plain text",
+        "#fast 2",
+        "#split 3,4",
+        "#slow 5",
+        "#nested 6,7",
+        "#slow 8",
+    ]
+)
+EXPECTED_TEXTS = ["1", "2", "3", "4", "5", "6", "7", "8"]
+
+
+class TestMacroInterpreterConcurrency(unittest.TestCase):
+
+    def _extract(self, max_concurrent_macros):
+        interpreter = SlowMacroInterpreter(None, max_concurrent_macros)
+        start = time.perf_counter()
+        macros, updated_text = interpreter.extract_macros_from_text(TEXT)
+        return macros, updated_text, time.perf_counter() - start
+
+    def test_sequential_resolution(self):
+        macros, updated_text, _ = self._extract(1)
+        self.assertEqual([macro["text"] for macro in macros], EXPECTED_TEXTS)
+        self.assertEqual(updated_text, "plain text")
+
+    def test_concurrent_resolution_keeps_order(self):
+        macros, updated_text, _ = self._extract(8)
+        self.assertEqual([macro["text"] for macro in macros], EXPECTED_TEXTS)
+        self.assertEqual(updated_text, "plain text")
+
+    def test_concurrent_resolution_is_faster(self):
+        _, _, sequential_duration = self._extract(1)
+        _, _, concurrent_duration = self._extract(8)
+        self.assertLess(concurrent_duration, sequential_duration / 2)
+
+    def test_empty_results_keep_the_line(self):
+        text = "#empty\n#slow 1\n#empty list\n#empty fallback"
+        for max_concurrent_macros in (1, 4):
+            with self.subTest(max_concurrent_macros=max_concurrent_macros):
+                interpreter = SlowMacroInterpreter(None, max_concurrent_macros)
+                macros, updated_text = interpreter.extract_macros_from_text(text)
+                self.assertEqual(
+                    [macro["text"] for macro in macros], ["1", "#empty fallback"]
+                )
+                self.assertEqual(updated_text, "#empty\n#empty list")
+
+    def test_error_is_raised_and_pool_is_released(self):
+        interpreter = SlowMacroInterpreter(None, 4)
+        with self.assertRaises(RuntimeError):
+            interpreter.extract_macros_from_text("#slow 1\n#fail\n#slow 2")
+        self.assertIsNone(interpreter._executor)
+        macros, _ = interpreter.extract_macros_from_text("#slow 1")
+        self.assertEqual([macro["text"] for macro in macros], ["1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
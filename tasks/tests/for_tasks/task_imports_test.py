@@ -0,0 +1,75 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..")
+)
+
+# Heavy dependencies only some code paths of the tasks need.
+LAZY_DEPENDENCIES = {"clipboard", "openai", "PIL", "pyperclip", "rich", "tkinter"}
+
+# Third-party top level modules each task may load at startup. Extend with care,
+# as every addition slows down starting the task.
+ALLOWED_STARTUP_IMPORTS = {
+    "automatic_prompt": {"directory_tree"},
+    "directory_runner": set(),
+    "format_python": set(),
+    "git_discard": set(),
+    "git_staging": set(),
+    "pylint_report": set(),
+    "restore_file": set(),
+    "undo_directory_runner": set(),
+}
+
+LIST_IMPORTS_SCRIPT = """
+import json
+import sys
+
+before = set(sys.modules)
+import {module}
+imported = {{name.split(".")[0] for name in set(sys.modules) - before}}
+print(json.dumps(sorted(imported)))
+"""
+
+
+def get_startup_imports(task_name):
+    """
+    Returns the top level modules imported by the module of a task in a new
+    interpreter, besides the standard library and the tasks package.
+    """
+    module = f"tasks.tasks.{task_name}.{task_name}_task"
+    python_path = os.pathsep.join(
+        filter(None, [ROOT_DIR, os.environ.get("PYTHONPATH")])
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", LIST_IMPORTS_SCRIPT.format(module=module)],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=ROOT_DIR,
+        env={**os.environ, "PYTHONPATH": python_path},
+    )
+    return {
+        name
+        for name in json.loads(result.stdout)
+        if name not in sys.stdlib_module_names
+        and not name.startswith("_")
+        and name != "tasks"
+    }
+
+
+class TestTaskImports(unittest.TestCase):
+
+    def test_startup_imports_do_not_grow(self):
+        for task_name, allowed_imports in ALLOWED_STARTUP_IMPORTS.items():
+            with self.subTest(task=task_name):
+                imports = get_startup_imports(task_name)
+                self.assertFalse(imports & LAZY_DEPENDENCIES)
+                self.assertLessEqual(imports, allowed_imports)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import os
 import re
 import warnings
 
@@ -18,66 +19,200 @@ def _get_indent_level(line):
 DECLARATION_PATTERN = r"^\s*(def|class)\s+([a-zA-Z_][a-zA-Z0-9_]*)"
 
 
-def _move_dictionary_item(key, source, target):
-    value = source.pop(key)
-    target[key] = value
+class DeclarationIndex:
+    """
+    Index of the class and function declarations of a Python script, built in
+    a single pass over its lines.
+
+    Declarations are indexed by their name and by their qualified name, e.g.
+    "Outer.method". Duplicate names get a suffix "_2", "_3", ... in the order
+    of their occurrence.
+
+    Parameters
+    ----------
+    text (str)
+        The source code of the script.
+    script (str, optional)
+        The path to the script, used in messages. Defaults to None.
+
+    Attributes
+    ----------
+    lines (list)
+        The lines of the script including line endings.
+    declaration_infos (dict)
+        The declarations by name, sorted by their first line, with the kind
+        ("def" or "class"), the qualified name, the indentation level and the
+        line span [start, stop) of each declaration.
+    """
+
+    def __init__(self, text, script=None):
+        self.script = script
+        self.lines = text.splitlines(True)
+        self.declaration_infos = {}
+        self.qualified_names = {}
+        self._index_declarations()
+
+    @classmethod
+    def from_file(cls, script):
+        """
+        Builds the declaration index of a script file.
+
+        Parameters
+        ----------
+        script (str)
+            The path to the script.
+
+        Returns
+        -------
+        DeclarationIndex
+            The declaration index.
+        """
+        with open(script, "r", encoding="utf-8") as file:
+            return cls(file.read(), script)
+
+    @staticmethod
+    def _get_unique_name(name, names):
+        duplicate_count = 2
+        updated_name = name
+        while updated_name in names:
+            updated_name = f"{name}_{duplicate_count}"
+            duplicate_count += 1
+        return updated_name
+
+    def _index_declarations(self):
+        declarations = {}
+        # Enclosing declarations, whose indentation levels strictly increase
+        pending_declarations = []
+
+        for i, line in enumerate(self.lines):
+            if not line.strip():
+                continue
+            cur_indent = _get_indent_level(line)
+
+            while pending_declarations and (
+                pending_declarations[-1]["indent"] >= cur_indent
+            ):
+                pending_declarations.pop()["stop"] = i
 
+            if match := re.match(DECLARATION_PATTERN, line):
+                kind = match.group(1)  # def or class
+                name = match.group(2)  # name of the callable
 
-def _collect_declaration_infos(script):
-    with open(script, "r", encoding="utf-8") as file:
-        text = file.read()
-
-    declarations = {}
-    pending_declarations = {}
-    cur_indent = 0
-
-    lines = text.splitlines(True)
-
-    for i, line in enumerate(lines):
-        if not line.strip():
-            continue
-        cur_indent = _get_indent_level(line)
-
-        # Use a snapshot of items to avoid modifying dict during iteration
-        for key, value in list(pending_declarations.items()):
-            if value["indent"] >= cur_indent:
-                value.update({"stop": i})
-                _move_dictionary_item(key, pending_declarations, declarations)
-
-        if match := re.match(DECLARATION_PATTERN, line):
-            kind = match.group(1)  # def or class
-            name = match.group(2)  # name of the callable
-
-            declaration_info = {
-                "kind": kind,
-                "start": i,
-                "indent": cur_indent,
-                "stop": None,
-            }
-
-            duplicate_count = 2
-            updated_name = name
-            while (updated_name in pending_declarations) or (
-                updated_name in declarations
-            ):
-                updated_name = f"{name}_{duplicate_count}"
-                duplicate_count += 1
-            if updated_name != name:
-                warnings.warn(
-                    f"Duplicate declaration detected for '{name}' at line "
-                    f"{i + 1}. Renaming to '{updated_name}' to ensure "
-                    "unique identifiers in declaration infos."
+                qualified_name = ".".join(
+                    [info["qualified_name"] for info in pending_declarations[-1:]]
+                    + [name]
                 )
-                name = updated_name
+                declaration_info = {
+                    "kind": kind,
+                    "qualified_name": qualified_name,
+                    "start": i,
+                    "indent": cur_indent,
+                    "stop": None,
+                }
+
+                updated_name = self._get_unique_name(name, declarations)
+                if updated_name != name:
+                    warnings.warn(
+                        f"Duplicate declaration detected for '{name}' at line "
+                        f"{i + 1}. Renaming to '{updated_name}' to ensure "
+                        "unique identifiers in declaration infos."
+                    )
+                    name = updated_name
+                # Nested declarations are qualified by the unique name
+                qualified_name = self._get_unique_name(
+                    qualified_name, self.qualified_names
+                )
+                declaration_info["qualified_name"] = qualified_name
+
+                declarations[name] = declaration_info
+                self.qualified_names[qualified_name] = declaration_info
+                pending_declarations.append(declaration_info)
+
+        for declaration_info in pending_declarations:
+            declaration_info["stop"] = len(self.lines)
+        self.declaration_infos = declarations
+
+    def get_declaration_info(self, name):
+        """
+        Returns the declaration info of a declaration.
+
+        Parameters
+        ----------
+        name (str)
+            The name or the qualified name of the declaration.
+
+        Returns
+        -------
+        dict
+            The declaration info.
+        """
+        if name in self.declaration_infos:
+            return self.declaration_infos[name]
+        if name in self.qualified_names:
+            return self.qualified_names[name]
+        raise ValueError(
+            f"Callable {name} not found in {self.script}"
+        )
+
+    def get_declaration_block(self, name, only_declaration_and_docstring=False):
+        """
+        Returns the code of a declaration.
+
+        Parameters
+        ----------
+        name (str)
+            The name or the qualified name of the declaration.
+        only_declaration_and_docstring (bool, optional)
+            Whether to return only the declaration line and the docstring.
+            Defaults to False.
+
+        Returns
+        -------
+        str
+            The code of the declaration.
+        """
+        declaration_info = self.get_declaration_info(name)
+        code_snippet = "".join(
+            self.lines[declaration_info["start"] : declaration_info["stop"]]
+        ).rstrip()
+
+        if only_declaration_and_docstring:
+            code_snippet = _extract_declaration_and_docstring(code_snippet)
+
+        return code_snippet
+
 
-            pending_declarations[name] = declaration_info
+_DECLARATION_INDEXES = {}
 
-    for key, value in list(pending_declarations.items()):
-        value.update({"stop": len(lines)})
-        _move_dictionary_item(key, pending_declarations, declarations)
 
-    declarations = dict(sorted(declarations.items(), key=lambda item: item[1]["start"]))
-    return declarations
+def get_declaration_index(script):
+    """
+    Returns the declaration index of a script. Indexes are cached and rebuilt
+    when the modification time or the size of the script changes.
+
+    Parameters
+    ----------
+    script (str)
+        The path to the script.
+
+    Returns
+    -------
+    DeclarationIndex
+        The declaration index.
+    """
+    key = os.path.abspath(script)
+    stat = os.stat(key)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _DECLARATION_INDEXES.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+    declaration_index = DeclarationIndex.from_file(script)
+    _DECLARATION_INDEXES[key] = (signature, declaration_index)
+    return declaration_index
+
+
+def _collect_declaration_infos(script):
+    return get_declaration_index(script).declaration_infos
 
 
 def _extract_declaration_and_docstring(declaration_block):
@@ -105,23 +240,9 @@ def _extract_declaration_and_docstring(declaration_block):
 
 
 def get_declaration_block(name, script, only_declaration_and_docstring=False):
-    declaration_infos = _collect_declaration_infos(script)
-    if name not in declaration_infos:
-        raise ValueError(
-            f"Callable {name} not found in {script}"
-        )
-
-    declaration_info = declaration_infos[name]
-    with open(script, "r", encoding="utf-8") as file:
-        lines = file.readlines()
-        code_snippet = "".join(
-            lines[declaration_info["start"] : declaration_info["stop"]]
-        ).rstrip()
-
-    if only_declaration_and_docstring:
-        code_snippet = _extract_declaration_and_docstring(code_snippet)
-
-    return code_snippet
+    return get_declaration_index(script).get_declaration_block(
+        name, only_declaration_and_docstring
+    )
 
 
 if __name__ == "__main__":
@@ -1,10 +1,12 @@
-from openai import OpenAI
+from tasks.utils.shared.lazy_import import lazy_import
 
 try:
     from keys import OPENAI_KEY
 except ModuleNotFoundError:
     OPENAI_KEY = None
 
+openai = lazy_import("openai")
+
 def send_prompt(prompt_message, max_response_tokens=3000, model="gpt-4o"):
     """
     Sends a prompt to OpenAI's GPT model and returns the response.
@@ -24,7 +26,7 @@ def send_prompt(prompt_message, max_response_tokens=3000, model="gpt-4o"):
     if OPENAI_KEY is None:
         raise ValueError("OPENAI_KEY is not set. Please set it in keys.py.")
     
-    client = OpenAI(api_key=OPENAI_KEY)
+    client = openai.OpenAI(api_key=OPENAI_KEY)
 
     response = client.chat.completions.with_raw_response.create(
         messages=[
@@ -1,4 +1,12 @@
 import ast
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+from tasks.utils.for_automatic_prompt.summary_cache import get_file_signature
+
+# Files below this number are parsed in the calling process, as starting
+# worker processes costs more than parsing them.
+PARALLEL_PARSING_MIN_FILES = 8
 
 
 def summarize_python_file(file_path, include_definitions_without_docstrings=False):
@@ -74,6 +82,76 @@ def summarize_python_file(file_path, include_definitions_without_docstrings=Fals
     return "\n".join(summary)
 
 
+def summarize_python_files(
+    file_paths,
+    include_definitions_without_docstrings=False,
+    summary_cache=None,
+    max_workers=None,
+):
+    """
+    Summarizes Python files, see summarize_python_file. Summaries are taken
+    from the cache if the files are unchanged, and the remaining files are
+    parsed in parallel across processes.
+
+    Parameters
+    ----------
+    file_paths (list)
+        The paths to the Python files to be summarized.
+    include_definitions_without_docstrings (bool, optional)
+        Whether to include classes and functions without docstrings in the
+        summaries. Defaults to False.
+    summary_cache (SummaryCache, optional)
+        The cache of the summaries. Defaults to None.
+    max_workers (int, optional)
+        The maximum number of parsing processes. Defaults to the number of
+        CPUs.
+
+    Returns
+    -------
+    list
+        The summaries in the order of the file paths.
+    """
+    summaries = [None] * len(file_paths)
+    signatures = {}
+    missing_indices = []
+    for index, file_path in enumerate(file_paths):
+        if summary_cache is not None:
+            signatures[index] = get_file_signature(file_path)
+            summaries[index] = summary_cache.get(
+                file_path, include_definitions_without_docstrings, signatures[index]
+            )
+        if summaries[index] is None:
+            missing_indices.append(index)
+
+    missing_paths = [file_paths[index] for index in missing_indices]
+    include_all = [include_definitions_without_docstrings] * len(missing_paths)
+    max_workers = min(max_workers or os.cpu_count() or 1, len(missing_paths))
+    if max_workers > 1 and len(missing_paths) >= PARALLEL_PARSING_MIN_FILES:
+        chunksize = max(1, len(missing_paths) // (max_workers * 4))
+        with ProcessPoolExecutor(max_workers) as executor:
+            missing_summaries = list(
+                executor.map(
+                    summarize_python_file,
+                    missing_paths,
+                    include_all,
+                    chunksize=chunksize,
+                )
+            )
+    else:
+        missing_summaries = list(map(summarize_python_file, missing_paths, include_all))
+
+    for index, summary in zip(missing_indices, missing_summaries):
+        summaries[index] = summary
+        if summary_cache is not None:
+            summary_cache.add(
+                file_paths[index],
+                include_definitions_without_docstrings,
+                signatures[index],
+                summary,
+            )
+    return summaries
+
+
 if __name__ == "__main__":
     path = r"path/to/summarize_python_script.py"
     print(summarize_python_file(path))
@@ -0,0 +1,175 @@
+import os
+import sqlite3
+import threading
+import time
+
+from tasks.configs.defaults import (
+    SUMMARY_CACHE_MAX_ENTRIES_DEFAULT,
+    SUMMARY_CACHE_MAX_SIZE_DEFAULT,
+)
+
+CACHE_FILE_NAME = "summary_cache.db"
+
+
+def get_file_signature(file_path):
+    """
+    Returns the signature of a file the cached summaries are validated
+    against.
+
+    Parameters
+    ----------
+    file_path (str)
+        The path to the file.
+
+    Returns
+    -------
+    tuple
+        The modification time in nanoseconds and the size of the file.
+    """
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class SummaryCache:
+    """
+    Persistent cache of Python file summaries, keyed by the file path, its
+    modification time and size, and whether definitions without docstrings
+    are included. Entries of a file are replaced when the file changes. The
+    least recently used entries are dropped once max_entries or max_size,
+    the total length of the stored summaries, is exceeded. The cache can be
+    used from several threads, and as a context manager closing its
+    database connection.
+
+    Parameters
+    ----------
+    cache_dir (str)
+        The directory to store the cache in.
+    max_entries (int)
+        The maximum number of stored summaries.
+    max_size (int)
+        The maximum total length of the stored summaries in characters.
+    """
+
+    def __init__(
+        self,
+        cache_dir,
+        max_entries=SUMMARY_CACHE_MAX_ENTRIES_DEFAULT,
+        max_size=SUMMARY_CACHE_MAX_SIZE_DEFAULT,
+    ):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_path = os.path.join(cache_dir, CACHE_FILE_NAME)
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(
+            self.cache_path, timeout=30, check_same_thread=False
+        )
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "file_path TEXT NOT NULL, "
+                "include_all INTEGER NOT NULL, "
+                "mtime_ns INTEGER NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "summary TEXT NOT NULL, "
+                "last_used REAL NOT NULL, "
+                "PRIMARY KEY (file_path, include_all))"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS summaries_last_used "
+                "ON summaries (last_used)"
+            )
+
+    def get(self, file_path, include_definitions_without_docstrings, signature):
+        """
+        Returns the cached summary of a file and marks it as recently used.
+
+        Parameters
+        ----------
+        file_path (str)
+            The path to the file.
+        include_definitions_without_docstrings (bool)
+            Whether the summary includes definitions without docstrings.
+        signature (tuple)
+            The current signature of the file, see get_file_signature.
+
+        Returns
+        -------
+        str or None
+            The summary, or None if no summary of the current file content is
+            cached.
+        """
+        key = (os.path.abspath(file_path), int(include_definitions_without_docstrings))
+        with self.lock, self.connection:
+            row = self.connection.execute(
+                "SELECT summary FROM summaries WHERE file_path = ? "
+                "AND include_all = ? AND mtime_ns = ? AND size = ?",
+                (*key, *signature),
+            ).fetchone()
+            if row is None:
+                return None
+            self.connection.execute(
+                "UPDATE summaries SET last_used = ? "
+                "WHERE file_path = ? AND include_all = ?",
+                (time.time(), *key),
+            )
+        return row[0]
+
+    def add(
+        self, file_path, include_definitions_without_docstrings, signature, summary
+    ):
+        """
+        Stores the summary of a file.
+
+        Parameters
+        ----------
+        file_path (str)
+            The path to the file.
+        include_definitions_without_docstrings (bool)
+            Whether the summary includes definitions without docstrings.
+        signature (tuple)
+            The signature of the summarized file, see get_file_signature.
+        summary (str)
+            The summary.
+        """
+        key = (os.path.abspath(file_path), int(include_definitions_without_docstrings))
+        with self.lock, self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO summaries "
+                "(file_path, include_all, mtime_ns, size, summary, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (*key, *signature, summary, time.time()),
+            )
+            count, total_size = self.connection.execute(
+                "SELECT COUNT(*), TOTAL(LENGTH(summary)) FROM summaries"
+            ).fetchone()
+            if count <= self.max_entries and total_size <= self.max_size:
+                return
+            self.connection.execute(
+                "DELETE FROM summaries WHERE rowid IN (SELECT rowid FROM ("
+                "SELECT rowid, "
+                "ROW_NUMBER() OVER (ORDER BY last_used DESC) AS position, "
+                "SUM(LENGTH(summary)) OVER (ORDER BY last_used DESC "
+                "ROWS UNBOUNDED PRECEDING) AS total_size "
+                "FROM summaries) WHERE position > ? OR total_size > ?)",
+                (self.max_entries, self.max_size),
+            )
+
+    def clear(self):
+        """
+        Removes all summaries from the cache.
+        """
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM summaries")
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
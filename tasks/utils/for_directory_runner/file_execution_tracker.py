@@ -1,6 +1,8 @@
 import csv
 import os
 
+from tasks.utils.shared.ignore_patterns import walk_with_ignore_patterns
+
 
 class FileExecutionTracker:
     """
@@ -50,7 +52,13 @@ class FileExecutionTracker:
         return ext in extensions
 
     def add_files_from_directory(
-        self, directory, excluded_dirs=None, excluded_files=None, extensions=None
+        self,
+        directory,
+        excluded_dirs=None,
+        excluded_files=None,
+        extensions=None,
+        ignore_patterns=None,
+        ignore_root=None,
     ):
         """
         Add all files from a directory to the CSV file with status set to
@@ -67,6 +75,12 @@ class FileExecutionTracker:
         extensions (list)
             A list of file extensions to restrict the files. None for all
             files.
+        ignore_patterns (list)
+            Gitignore-style patterns of files and directories to skip. Ignored
+            directories are not descended into.
+        ignore_root (str)
+            The directory anchored ignore patterns are relative to. Defaults
+            to directory.
         """
         if excluded_dirs is None:
             excluded_dirs = []
@@ -77,7 +91,9 @@ class FileExecutionTracker:
         excluded_dirs = [os.path.abspath(dir_path) for dir_path in excluded_dirs]
 
         files = []
-        for root, _, filenames in os.walk(directory):
+        for root, _, filenames in walk_with_ignore_patterns(
+            directory, ignore_patterns, ignore_root
+        ):
             root = os.path.normpath(root)
             root = os.path.abspath(root)
             for excluded_dir in excluded_dirs:
@@ -101,11 +117,23 @@ class FileExecutionTracker:
         file_path (str)
             The file path to remove.
         """
+        self.remove_files([file_path])
+
+    def remove_files(self, file_paths):
+        """
+        Removes several files from the CSV file, rewriting it once.
+
+        Parameters
+        ----------
+        file_paths (list)
+            The file paths to remove.
+        """
+        file_paths = set(file_paths)
         rows = []
         with open(self.csv_path, "r", newline="", encoding="utf-8") as file:
             reader = csv.reader(file)
             for row in reader:
-                if row[0] != file_path:
+                if row[0] not in file_paths:
                     rows.append(row)
 
         with open(self.csv_path, "w", newline="", encoding="utf-8") as file:
@@ -115,8 +143,9 @@ class FileExecutionTracker:
     def verify_tracks(self):
         """
         Verifies the tracks in CSV file by checking if all files are either
-        'pending','running', or 'completed'. Raises ValueError if any other
-        status is found.
+        'pending', 'running', 'completed', 'skipped' or 'failed'. Raises
+        ValueError if any other status is found. Several files may be 'running' after an
+        interrupted parallel run.
         """
         if not os.path.isfile(self.csv_path):
             msg = f"File '{self.csv_path}' does not exist."
@@ -125,15 +154,42 @@ class FileExecutionTracker:
             reader = csv.reader(file)
             next(reader)
 
-            running_exists = False
             for row in reader:
-                if row[1] not in ["pending", "running", "completed", "failed"]:
+                if row[1] not in [
+                    "pending",
+                    "running",
+                    "completed",
+                    "skipped",
+                    "failed",
+                ]:
                     msg = f"Invalid status '{row[1]}' in file '{row[0]}'"
                     raise ValueError(msg)
+
+    def reset_running_to_pending(self):
+        """
+        Transforms all 'running' files to 'pending', so files interrupted in a
+        previous run are executed again.
+
+        Returns
+        -------
+        int
+            The number of files reset to 'pending'.
+        """
+        rows = []
+        reset_count = 0
+        with open(self.csv_path, "r", newline="", encoding="utf-8") as file:
+            reader = csv.reader(file)
+            for row in reader:
                 if row[1] == "running":
-                    if running_exists:
-                        msg = "More than one file is marked as 'running'"
-                        raise ValueError(msg)
+                    row[1] = "pending"
+                    reset_count += 1
+                rows.append(row)
+
+        with open(self.csv_path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerows(rows)
+
+        return reset_count
 
     def take_next_pending(self):
         """
@@ -202,6 +258,60 @@ class FileExecutionTracker:
             writer = csv.writer(file)
             writer.writerows(rows)
 
+    def mark_file_as_completed(self, file_path):
+        """
+        Transforms the 'running' file file_path to 'completed'. Other running
+        files are left unchanged.
+
+        Parameters
+        ----------
+        file_path (str)
+            The file path to mark.
+        """
+        self._mark_running_file(file_path, "completed")
+
+    def mark_file_as_skipped(self, file_path):
+        """
+        Transforms the 'running' file file_path to 'skipped', for files the
+        task found nothing to do for. Skipped files are not undone.
+
+        Parameters
+        ----------
+        file_path (str)
+            The file path to mark.
+        """
+        self._mark_running_file(file_path, "skipped")
+
+    def mark_file_as_failed(self, file_path, error_message):
+        """
+        Transforms the 'running' file file_path to 'failed' and writes the
+        error message in the third column. Other running files are left
+        unchanged.
+
+        Parameters
+        ----------
+        file_path (str)
+            The file path to mark.
+        error_message (str)
+            The error message to write in the comments column.
+        """
+        self._mark_running_file(file_path, "failed", error_message)
+
+    def _mark_running_file(self, file_path, status, comment=None):
+        rows = []
+        with open(self.csv_path, "r", newline="", encoding="utf-8") as file:
+            reader = csv.reader(file)
+            for row in reader:
+                if row[0] == file_path and row[1] == "running":
+                    row[1] = status
+                    if comment is not None:
+                        row[2] = comment
+                rows.append(row)
+
+        with open(self.csv_path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerows(rows)
+
     def get_status_count(self):
         """
         Returns the number of files with each status.
@@ -216,7 +326,13 @@ class FileExecutionTracker:
             reader = csv.reader(file)
             next(reader)
 
-            count_status = {"pending": 0, "running": 0, "completed": 0, "failed": 0}
+            count_status = {
+                "pending": 0,
+                "running": 0,
+                "completed": 0,
+                "skipped": 0,
+                "failed": 0,
+            }
             for row in reader:
                 count_status[row[1]] += 1
 
@@ -266,4 +382,4 @@ class FileExecutionTracker:
                 if row[1] == "failed":
                     failed_files.append(row[0])
 
-        return failed_files
\ No newline at end of file
+        return failed_files
@@ -0,0 +1,44 @@
+from contextlib import redirect_stderr, redirect_stdout
+import io
+
+
+def run_subtask(
+    task_class, task_runner_root, file_path, macros_text, task_attributes=None
+):
+    """
+    Runs a task on a single file, capturing its stdout and stderr. Used as the
+    work item of the directory runner's process pool, so the output of each
+    file can be logged as one section.
+
+    Parameters
+    ----------
+    task_class (type)
+        The task class to run.
+    task_runner_root (str)
+        The root directory of the task runner.
+    file_path (str)
+        The path to the file to run the task on.
+    macros_text (str)
+        The macros text passed to the task.
+    task_attributes (dict, optional)
+        Attributes set on the task before it runs. Default is None.
+
+    Returns
+    -------
+    tuple
+        The file path, the captured output, the error message, which is None
+        if the task succeeded, and whether the task skipped the file.
+    """
+    output = io.StringIO()
+    error = None
+    subtask = task_class(task_runner_root, file_path, macros_text)
+    for name, value in (task_attributes or {}).items():
+        setattr(subtask, name, value)
+    subtask.force_defaults()  # Prevents the task from using the command line arguments
+    with redirect_stdout(output), redirect_stderr(output):
+        try:
+            subtask.main()
+            print(f"\n\n")
+        except Exception as e:
+            error = str(e)
+    return file_path, output.getvalue(), error, subtask.skipped
@@ -0,0 +1,313 @@
+import csv
+import os
+import sqlite3
+
+from tasks.utils.for_directory_runner.file_execution_tracker import FileExecutionTracker
+
+STATUSES = ["pending", "running", "completed", "skipped", "failed"]
+
+
+class SQLiteFileExecutionTracker(FileExecutionTracker):
+    """
+    Class that tracks execution status of files in a SQLite database.
+
+    It provides the interface of FileExecutionTracker, but every status
+    transition is a single indexed update committed atomically, instead of a
+    rewrite of the whole CSV file. The tracks can be exported to and imported
+    from the CSV format of FileExecutionTracker.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        # Connecting creates the database, so whether tracks of a previous run
+        # exist is known only before.
+        self._created = not os.path.isfile(db_path)
+        self.connection = sqlite3.connect(db_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS tracks ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "file_path TEXT NOT NULL, "
+                "status TEXT NOT NULL, "
+                "comments TEXT NOT NULL DEFAULT '-')"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS tracks_status ON tracks (status, id)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS tracks_file_path ON tracks (file_path)"
+            )
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        self.connection.close()
+
+    def add_files(self, files):
+        """
+        Add files to the database with status set to 'pending'.
+
+        Parameters
+        ----------
+        files (list)
+            A list of file descriptions (strings).
+        """
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO tracks (file_path, status) VALUES (?, 'pending')",
+                [(file_path,) for file_path in files],
+            )
+
+    def remove_file(self, file_path):
+        """
+        Removes a file from the database.
+
+        Parameters
+        ----------
+        file_path (str)
+            The file path to remove.
+        """
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM tracks WHERE file_path = ?", (file_path,)
+            )
+
+    def remove_files(self, file_paths):
+        """
+        Removes several files from the database in a single transaction.
+
+        Parameters
+        ----------
+        file_paths (list)
+            The file paths to remove.
+        """
+        with self.connection:
+            self.connection.executemany(
+                "DELETE FROM tracks WHERE file_path = ?",
+                [(file_path,) for file_path in file_paths],
+            )
+
+    def verify_tracks(self):
+        """
+        Verifies the tracks in the database by checking if all files are
+        either 'pending', 'running', 'completed', 'skipped' or 'failed'. Raises
+        ValueError if any other status is found. Raises FileNotFoundError if
+        the database was created by this tracker and has no tracks.
+        """
+        first_row = self.connection.execute("SELECT 1 FROM tracks LIMIT 1").fetchone()
+        if self._created and first_row is None:
+            msg = f"File '{self.db_path}' does not exist."
+            raise FileNotFoundError(msg)
+        placeholders = ", ".join("?" for _ in STATUSES)
+        row = self.connection.execute(
+            f"SELECT file_path, status FROM tracks WHERE status NOT IN ({placeholders})"
+            " LIMIT 1",
+            STATUSES,
+        ).fetchone()
+        if row is not None:
+            msg = f"Invalid status '{row[1]}' in file '{row[0]}'"
+            raise ValueError(msg)
+
+    def reset_running_to_pending(self):
+        """
+        Transforms all 'running' files to 'pending', so files interrupted in a
+        previous run are executed again.
+
+        Returns
+        -------
+        int
+            The number of files reset to 'pending'.
+        """
+        with self.connection:
+            cursor = self.connection.execute(
+                "UPDATE tracks SET status = 'pending' WHERE status = 'running'"
+            )
+        return cursor.rowcount
+
+    def take_next_pending(self):
+        """
+        Transforms the first 'pending' file to 'running'. Returns the value of
+        the first column (file description) of the newly marked 'running'
+        file.
+
+        Returns
+        -------
+        str
+            The description of the file now marked as 'running', or None if no
+            file is pending.
+        """
+        with self.connection:
+            row = self.connection.execute(
+                "SELECT id, file_path FROM tracks WHERE status = 'pending' "
+                "ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            self.connection.execute(
+                "UPDATE tracks SET status = 'running' WHERE id = ?", (row[0],)
+            )
+        return row[1]
+
+    def mark_running_as_completed(self):
+        """
+        Transforms the 'running' files to 'completed'.
+        """
+        with self.connection:
+            self.connection.execute(
+                "UPDATE tracks SET status = 'completed' WHERE status = 'running'"
+            )
+
+    def mark_running_as_failed(self, error_message):
+        """
+        Transforms the 'running' files to 'failed' and writes the error
+        message in the comments column.
+
+        Parameters
+        ----------
+        error_message (str)
+            The error message to write in the comments column.
+        """
+        with self.connection:
+            self.connection.execute(
+                "UPDATE tracks SET status = 'failed', comments = ? "
+                "WHERE status = 'running'",
+                (str(error_message),),
+            )
+
+    def _mark_running_file(self, file_path, status, comment=None):
+        with self.connection:
+            if comment is None:
+                self.connection.execute(
+                    "UPDATE tracks SET status = ? "
+                    "WHERE file_path = ? AND status = 'running'",
+                    (status, file_path),
+                )
+            else:
+                self.connection.execute(
+                    "UPDATE tracks SET status = ?, comments = ? "
+                    "WHERE file_path = ? AND status = 'running'",
+                    (status, str(comment), file_path),
+                )
+
+    def get_status_count(self):
+        """
+        Returns the number of files with each status.
+
+        Returns
+        -------
+        dict
+            A dictionary with status as keys and the number of files with that
+            status as values.
+        """
+        count_status = {status: 0 for status in STATUSES}
+        for status, count in self.connection.execute(
+            "SELECT status, COUNT(*) FROM tracks GROUP BY status"
+        ):
+            count_status[status] = count
+        return count_status
+
+    def clear_tracks(self):
+        """
+        Removes all tracks from the database.
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM tracks")
+
+    def _get_files_with_status(self, status):
+        return [
+            row[0]
+            for row in self.connection.execute(
+                "SELECT file_path FROM tracks WHERE status = ? ORDER BY id",
+                (status,),
+            )
+        ]
+
+    def get_completed_files(self):
+        """
+        Returns the list of file paths marked as 'completed'.
+
+        Returns
+        -------
+        list
+            A list of file paths.
+        """
+        return self._get_files_with_status("completed")
+
+    def get_failed_files(self):
+        """
+        Returns the list of file paths marked as 'failed'.
+
+        Returns
+        -------
+        list
+            A list of file paths.
+        """
+        return self._get_files_with_status("failed")
+
+    def export_csv(self, csv_path):
+        """
+        Writes the tracks to a CSV file in the format of FileExecutionTracker.
+        The file is replaced atomically.
+
+        Parameters
+        ----------
+        csv_path (str)
+            The path to the CSV file.
+        """
+        temp_path = csv_path + ".tmp"
+        with open(temp_path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(["File Path", "Status", "Comments"])
+            writer.writerows(
+                self.connection.execute(
+                    "SELECT file_path, status, comments FROM tracks ORDER BY id"
+                )
+            )
+        os.replace(temp_path, csv_path)
+
+    def import_csv(self, csv_path):
+        """
+        Appends the tracks of a CSV file in the format of FileExecutionTracker.
+
+        Parameters
+        ----------
+        csv_path (str)
+            The path to the CSV file.
+        """
+        with open(csv_path, "r", newline="", encoding="utf-8") as file:
+            reader = csv.reader(file)
+            next(reader, None)
+            rows = [row[:3] for row in reader if len(row) >= 3]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO tracks (file_path, status, comments) VALUES (?, ?, ?)",
+                rows,
+            )
+
+
+def open_execution_tracker(csv_path):
+    """
+    Opens the SQLite execution tracker stored next to the CSV tracks of a
+    directory runner. If the database does not exist yet, existing CSV tracks
+    are imported, so runs started with the CSV tracker can be resumed.
+
+    Parameters
+    ----------
+    csv_path (str)
+        The path to the CSV tracks. The database has the same path with the
+        extension ".db".
+
+    Returns
+    -------
+    SQLiteFileExecutionTracker
+        The execution tracker.
+    """
+    db_path = os.path.splitext(csv_path)[0] + ".db"
+    is_new = not os.path.isfile(db_path)
+    execution_tracker = SQLiteFileExecutionTracker(db_path)
+    if is_new and os.path.isfile(csv_path):
+        execution_tracker.import_csv(csv_path)
+    return execution_tracker
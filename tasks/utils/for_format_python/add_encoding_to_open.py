@@ -1,6 +1,24 @@
 import re
 
 
+def is_add_encoding_to_open_applicable(code):
+    """
+    Fast check whether add_encoding_to_open can change more than the line
+    endings of the code.
+
+    Parameters
+    ----------
+    code (str)
+        The code to be checked.
+
+    Returns
+    -------
+    bool
+        False if the code has no 'with open(' pattern.
+    """
+    return "with open(" in code
+
+
 def add_encoding_to_open(code):
     """
     Checks for 'with open(<arguments>)' patterns in the given code and ensures
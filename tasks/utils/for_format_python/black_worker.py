@@ -0,0 +1,155 @@
+"""
+Formats Python code with the Black package of the interpreter running this
+module.
+
+The module is imported in-process by run_black_formatting when the tasks
+environment provides the same Black version as the runner environment, and is
+otherwise started as a long-lived worker process in the runner environment.
+The worker reads one JSON request per line from stdin, {"code": str,
+"file_path": str}, and writes one JSON response per line to stdout, {"code":
+str or None, "error": str or None, "unsupported": bool}.
+
+The module depends on the standard library and Black only, as it runs in the
+runner environment.
+"""
+
+import json
+import os
+import sys
+
+# Black options of pyproject.toml that are mapped to the formatting mode or do
+# not affect formatting a single file given by path. check and diff are not
+# supported, as the command line does not write the file with them.
+SUPPORTED_OPTIONS = {
+    "line_length",
+    "target_version",
+    "skip_string_normalization",
+    "skip_magic_trailing_comma",
+    "preview",
+    "unstable",
+    "enable_unstable_feature",
+    "pyi",
+    "ipynb",
+    "python_cell_magics",
+    "required_version",
+    "include",
+    "exclude",
+    "extend_exclude",
+    "fast",
+    "quiet",
+    "verbose",
+    "color",
+    "workers",
+}
+
+
+class UnsupportedConfiguration(Exception):
+    pass
+
+
+def get_black_mode(file_path):
+    """
+    Builds the Black mode the Black command line would use for the file,
+    reading the pyproject.toml found for the file.
+
+    Parameters
+    ----------
+    file_path (str)
+        The path of the file to format.
+
+    Returns
+    -------
+    black.Mode
+        The formatting mode.
+
+    Raises
+    ------
+    UnsupportedConfiguration
+        If the configuration contains options that are not reproduced
+        in-process.
+    """
+    import black
+
+    config = {}
+    pyproject_path = black.find_pyproject_toml((file_path,))
+    if pyproject_path:
+        config = black.parse_pyproject_toml(pyproject_path)
+    unsupported_options = set(config) - SUPPORTED_OPTIONS
+    if unsupported_options:
+        msg = f"Unsupported Black options: {', '.join(sorted(unsupported_options))}"
+        raise UnsupportedConfiguration(msg)
+    required_version = str(config.get("required_version", ""))
+    if required_version and required_version not in (
+        black.__version__,
+        black.__version__.split(".")[0],
+    ):
+        msg = f"Black version {black.__version__} is not {required_version}"
+        raise UnsupportedConfiguration(msg)
+
+    target_versions = {
+        black.TargetVersion[version.upper()]
+        for version in config.get("target_version", [])
+    }
+    return black.Mode(
+        target_versions=target_versions,
+        line_length=config.get("line_length", black.DEFAULT_LINE_LENGTH),
+        is_pyi=bool(config.get("pyi")) or file_path.endswith(".pyi"),
+        string_normalization=not config.get("skip_string_normalization", False),
+        magic_trailing_comma=not config.get("skip_magic_trailing_comma", False),
+        preview=config.get("preview", False),
+        unstable=config.get("unstable", False),
+        enabled_features={
+            black.Preview[feature]
+            for feature in config.get("enable_unstable_feature", [])
+        },
+    )
+
+
+def format_code(code, file_path):
+    """
+    Formats code with Black as the Black command line would format the file.
+
+    Parameters
+    ----------
+    code (str)
+        The code to format.
+    file_path (str)
+        The path of the file the code belongs to, used to find the
+        configuration.
+
+    Returns
+    -------
+    dict
+        The response with the formatted code or an error message. If the
+        configuration is not reproduced in-process, "unsupported" is True.
+    """
+    try:
+        import black
+
+        mode = get_black_mode(file_path)
+    except (ImportError, UnsupportedConfiguration) as e:
+        return {"code": None, "error": str(e), "unsupported": True}
+    except Exception as e:
+        return {"code": None, "error": f"Formatting error: {e}", "unsupported": False}
+
+    try:
+        formatted_code = black.format_file_contents(code, fast=False, mode=mode)
+    except black.NothingChanged:
+        formatted_code = code
+    except Exception as e:
+        return {"code": None, "error": f"Formatting error: {e}", "unsupported": False}
+    return {"code": formatted_code, "error": None, "unsupported": False}
+
+
+def main():
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        response = format_code(request["code"], os.path.abspath(request["file_path"]))
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
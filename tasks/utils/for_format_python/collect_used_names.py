@@ -0,0 +1,44 @@
+import ast
+
+from tasks.utils.for_format_python.source_document import get_source_document
+
+
+def collect_used_names(source, include_imports=False):
+    """
+    Collects the names referenced in Python source code by walking its syntax
+    tree once. Referenced are variable names, attribute names and names of
+    defined functions. Optionally also the original and alias names of import
+    statements are included.
+
+    Parameters
+    ----------
+    source (str)
+        The Python source code.
+    include_imports (bool)
+        Whether to include names of import statements.
+
+    Returns
+    -------
+    set
+        The referenced names.
+    """
+    document = get_source_document(source)
+    key = ("used_names", include_imports)
+    if key in document.analyses:
+        return document.analyses[key]
+
+    used_names = set()
+    for node in ast.walk(document.tree):
+        if isinstance(node, ast.Name):
+            used_names.add(node.id)
+        elif isinstance(node, ast.Attribute):
+            used_names.add(node.attr)
+        elif isinstance(node, ast.FunctionDef):
+            used_names.add(node.name)
+        elif include_imports and isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                used_names.add(alias.name)
+                if alias.asname:
+                    used_names.add(alias.asname)
+    document.analyses[key] = frozenset(used_names)
+    return document.analyses[key]
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from tasks.configs.defaults import FORMAT_CACHE_MAX_ENTRIES_DEFAULT
+from tasks.utils.shared.library_utils import get_environment_package_version
+
+# Increase when a change of the formatting strategies changes their output, so
+# files formatted by the previous implementation are formatted again.
+FORMAT_CACHE_VERSION = 2
+CACHE_FILE_NAME = "format_cache.db"
+
+
+def _hash_text(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _find_pyproject_toml(file_path):
+    directory = os.path.dirname(os.path.abspath(file_path))
+    while True:
+        pyproject_path = os.path.join(directory, "pyproject.toml")
+        if os.path.isfile(pyproject_path):
+            return pyproject_path
+        if any(os.path.exists(os.path.join(directory, vcs)) for vcs in (".git", ".hg")):
+            return None
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
+def get_format_cache_key(
+    code, file_path, strategy_keys, python_env_path=None, modules_info=None
+):
+    """
+    Returns the cache key of formatting code with a set of strategies. The
+    key covers everything the formatted output depends on: the code, the
+    strategies in the order they are applied, the Black and Pylint versions
+    of the runner environment, the Black configuration of the file and the
+    modules info.
+
+    Parameters
+    ----------
+    code (str)
+        The code to format.
+    file_path (str)
+        The path of the file the code belongs to.
+    strategy_keys (list)
+        The abbreviations of the applied strategies in application order.
+    python_env_path (str, optional)
+        The path to the runner Python environment.
+    modules_info (dict, optional)
+        The modules info used for rearranging imports.
+
+    Returns
+    -------
+    str
+        The cache key.
+    """
+    pyproject_path = _find_pyproject_toml(file_path)
+    pyproject_hash = None
+    if pyproject_path:
+        with open(pyproject_path, "r", encoding="utf-8") as f:
+            pyproject_hash = _hash_text(f.read())
+    tool_versions = {}
+    if python_env_path:
+        tool_versions = {
+            package: get_environment_package_version(python_env_path, package)
+            for package in ("black", "pylint")
+        }
+    key_parts = {
+        "version": FORMAT_CACHE_VERSION,
+        "python": sys.version_info[:2],
+        "code": _hash_text(code),
+        "strategies": list(strategy_keys),
+        "tool_versions": tool_versions,
+        "pyproject": pyproject_hash,
+        "modules_info": _hash_text(json.dumps(modules_info, sort_keys=True)),
+    }
+    return _hash_text(json.dumps(key_parts, sort_keys=True))
+
+
+class FormatCache:
+    """
+    Persistent set of cache keys of code that was formatted successfully, so
+    unchanged files can be skipped when formatted again with the same
+    configuration. The keys are stored in a SQLite database, which can be
+    shared by concurrent processes. The least recently used keys are dropped
+    once max_entries is exceeded.
+
+    Parameters
+    ----------
+    cache_dir (str)
+        The directory to store the cache in.
+    max_entries (int)
+        The maximum number of stored keys.
+    """
+
+    def __init__(self, cache_dir, max_entries=FORMAT_CACHE_MAX_ENTRIES_DEFAULT):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.cache_path = os.path.join(cache_dir, CACHE_FILE_NAME)
+        self.max_entries = max_entries
+        self.connection = sqlite3.connect(self.cache_path, timeout=30)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS formatted ("
+                "key TEXT PRIMARY KEY, file_path TEXT, last_used REAL)"
+            )
+            self.connection.execute(
+                "CREATE INDEX IF NOT EXISTS formatted_last_used "
+                "ON formatted (last_used)"
+            )
+
+    def contains(self, key):
+        """
+        Checks whether code with the key was formatted before and marks the
+        key as recently used.
+
+        Parameters
+        ----------
+        key (str)
+            The cache key, see get_format_cache_key.
+
+        Returns
+        -------
+        bool
+            True if the key is cached, False otherwise.
+        """
+        with self.connection:
+            cursor = self.connection.execute(
+                "UPDATE formatted SET last_used = ? WHERE key = ?", (time.time(), key)
+            )
+        return cursor.rowcount > 0
+
+    def add(self, key, file_path=None):
+        """
+        Stores the key of formatted code.
+
+        Parameters
+        ----------
+        key (str)
+            The cache key, see get_format_cache_key.
+        file_path (str, optional)
+            The path of the formatted file, stored for inspection.
+        """
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO formatted (key, file_path, last_used) "
+                "VALUES (?, ?, ?)",
+                (key, file_path, time.time()),
+            )
+            self.connection.execute(
+                "DELETE FROM formatted WHERE key IN (SELECT key FROM formatted "
+                "ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self):
+        """
+        Removes all keys from the cache.
+        """
+        with self.connection:
+            self.connection.execute("DELETE FROM formatted")
+
+    def close(self):
+        """
+        Closes the database connection.
+        """
+        self.connection.close()
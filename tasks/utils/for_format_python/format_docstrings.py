@@ -265,6 +265,23 @@ def _wrap_docstrings(docstrings):
     return wrapped_docstrings
 
 
+def is_format_docstrings_applicable(code):
+    """
+    Fast check whether format_docstrings can change the code.
+
+    Parameters
+    ----------
+    code (str)
+        The code to be checked.
+
+    Returns
+    -------
+    bool
+        False if the code has no docstring quotes.
+    """
+    return DOC_QUOTE in code
+
+
 def format_docstrings(code):
     """
     Formats the docstrings in the code.
@@ -133,6 +133,23 @@ def _construct_formatted_exception_code(exception_info):
     return formatted_exception
 
 
+def is_format_exceptions_applicable(code):
+    """
+    Fast check whether format_exceptions can change the code.
+
+    Parameters
+    ----------
+    code (str)
+        The code to be checked.
+
+    Returns
+    -------
+    bool
+        False if the code has no 'raise' and no 'warnings.warn'.
+    """
+    return "raise" in code or "warnings.warn" in code
+
+
 def format_exceptions(code):
     """
     Refactors the exception code in the provided code.
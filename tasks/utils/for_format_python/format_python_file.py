@@ -1,23 +1,40 @@
 import os
+import time
 import warnings
 
 from tasks.management.task_runner_profile import TaskRunnerProfile
-from tasks.utils.for_format_python.add_encoding_to_open import add_encoding_to_open
+from tasks.utils.for_format_python.add_encoding_to_open import (
+    add_encoding_to_open,
+    is_add_encoding_to_open_applicable,
+)
 from tasks.utils.for_format_python.ensure_newline_at_end import ensure_newline_at_end
+from tasks.utils.for_format_python.format_cache import get_format_cache_key
 from tasks.utils.for_format_python.format_comments import format_comments
-from tasks.utils.for_format_python.format_docstrings import format_docstrings
+from tasks.utils.for_format_python.format_docstrings import (
+    format_docstrings,
+    is_format_docstrings_applicable,
+)
 from tasks.utils.for_format_python.rearrange_imports import rearrange_imports
-from tasks.utils.for_format_python.format_exceptions import format_exceptions
+from tasks.utils.for_format_python.format_exceptions import (
+    format_exceptions,
+    is_format_exceptions_applicable,
+)
 from tasks.utils.for_format_python.remove_f_from_empty_fstrings import (
+    is_remove_f_from_empty_fstrings_applicable,
     remove_f_from_empty_fstrings,
 )
 from tasks.utils.for_format_python.remove_line_comments import remove_line_comments
 from tasks.utils.for_format_python.remove_trailing_parts import remove_trailing_parts
 from tasks.utils.for_format_python.remove_unnecessary_else import (
+    is_remove_unnecessary_else_applicable,
     remove_unnecessary_else,
 )
 from tasks.utils.for_format_python.remove_unused_imports import remove_unused_imports
-from tasks.utils.for_format_python.run_black_formatting import format_with_black
+from tasks.utils.for_format_python.run_black_formatting import (
+    format_code_with_black,
+    format_with_black,
+)
+from tasks.utils.for_format_python.strategy_timing import StdoutTimingSink
 from tasks.utils.shared.execute_pylint import execute_pylint
 
 STRATEGIES = {
@@ -37,6 +54,15 @@ STRATEGIES = {
     "EN": (ensure_newline_at_end, "Ensure newline at end", False, True),
     "PL": (execute_pylint, "Execute Pylint", True, False),
 }
+# Fast checks of the code before applying a strategy. If the check fails, the
+# strategy is skipped, as it would change at most the line endings.
+STRATEGY_PROBES = {
+    "AE": is_add_encoding_to_open_applicable,
+    "RUE": is_remove_unnecessary_else_applicable,
+    "RF": is_remove_f_from_empty_fstrings_applicable,
+    "FE": is_format_exceptions_applicable,
+    "FD": is_format_docstrings_applicable,
+}
 
 
 def make_checkpoint(file_path, updated_code, description, checkpoint_dir):
@@ -53,6 +79,11 @@ def make_checkpoint(file_path, updated_code, description, checkpoint_dir):
         Description of the changes made to the code.
     checkpoint_dir (str)
         Directory to save the checkpoint in.
+
+    Returns
+    -------
+    str
+        The path to the checkpoint.
     """
     if hasattr(make_checkpoint, "counter"):
         make_checkpoint.counter += 1
@@ -77,6 +108,52 @@ def make_checkpoint(file_path, updated_code, description, checkpoint_dir):
     with open(checkpoint_path, "w", encoding="utf-8") as file:
         file.write(updated_code)
     print(f"--------> Checkpoint created at {checkpoint_path}")
+    return checkpoint_path
+
+
+def select_strategies(select_only=None, select_not=None, force_select_of=None):
+    """
+    Selects the formatting strategies to apply, in the order they are
+    applied.
+
+    Parameters
+    ----------
+    select_only (list)
+        List of strategy abbreviations to apply exclusively.
+    select_not (list)
+        List of strategy abbreviations to exclude.
+    force_select_of (list)
+        List of strategy abbreviations to force apply.
+
+    Returns
+    -------
+    dict
+        The selected strategies keyed by abbreviation.
+    """
+    if select_only and select_not:
+        msg = "Cannot have both select_only and select_not options specified."
+        raise ValueError(msg)
+
+    is_forcable = {key: STRATEGIES[key][3] for key in STRATEGIES}
+    strategies = {}
+    if select_only:
+        # Also forcable strategies can be included in select_only
+        strategies = {key: STRATEGIES[key] for key in select_only}
+    elif select_not:
+        strategies = {
+            key: STRATEGIES[key]
+            for key in STRATEGIES
+            if key not in select_not and not is_forcable[key]
+        }
+    else:
+        strategies = {
+            key: value for key, value in STRATEGIES.items() if not is_forcable[key]
+        }
+
+    if force_select_of:
+        for key in force_select_of:
+            strategies[key] = STRATEGIES[key]
+    return strategies
 
 
 def format_python_file(
@@ -87,10 +164,14 @@ def format_python_file(
     checkpoint_dir=None,
     python_env_path=None,
     modules_info=None,
+    black_mode="auto",
+    format_cache=None,
+    timing_sink=None,
 ):
     """
     Apply formatting strategies to a python file. The strategies are applied in
-    the order they are defined in the STRATEGIES dictionary.
+    the order they are defined in the STRATEGIES dictionary. Strategies whose
+    probe in STRATEGY_PROBES fails for the current code are skipped.
 
     Parameters
     ----------
@@ -115,9 +196,24 @@ def format_python_file(
         A dictionary containing information about the loaded modules. Keys are
         'standard_library', 'third_party', and 'local'. Used for rearranging
         imports. If None skips rearranging imports.
-    """
-    selected_to_force = force_select_of
+    black_mode (str)
+        How Black formatting is run, one of "auto", "in_process", "worker" and
+        "subprocess". See format_code_with_black. Default is "auto".
+    format_cache (FormatCache)
+        Cache of successfully formatted code. If given, the file is skipped
+        when its code was formatted before with the same configuration, and
+        the formatted code is added to the cache unless Black formatting
+        failed. Default is None.
+    timing_sink (object)
+        Sink receiving a timing record for every applied strategy, see
+        strategy_timing. Default is None.
 
+    Returns
+    -------
+    bool
+        False if the file was skipped as unchanged since it was formatted,
+        True otherwise.
+    """
     if not file_path.endswith(".py"):
         msg = f"File {file_path} is not a python file"
         raise ValueError(msg)
@@ -132,33 +228,41 @@ def format_python_file(
     if checkpointing:
         os.makedirs(checkpoint_dir, exist_ok=True)
 
-    if select_only and select_not:
-        msg = "Cannot have both select_only and select_not options specified."
-        raise ValueError(msg)
+    strategies = select_strategies(select_only, select_not, force_select_of)
+    file_name = os.path.basename(file_path)
 
-    is_forcable = {key: STRATEGIES[key][3] for key in STRATEGIES}
-    strategies = {}
-    if select_only:
-        # Also forcable strategies can be included in select_only
-        strategies = {key: STRATEGIES[key] for key in select_only}
-    elif select_not:
-        strategies = {
-            key: STRATEGIES[key]
-            for key in STRATEGIES
-            if key not in select_not and not is_forcable[key]
-        }
-    else:
-        strategies = {
-            key: value for key, value in STRATEGIES.items() if not is_forcable[key]
-        }
-
-    if selected_to_force:
-        for key in selected_to_force:
-            strategies[key] = STRATEGIES[key]
+    if format_cache is not None:
+        cache_key = get_format_cache_key(
+            code, file_path, strategies, python_env_path, modules_info
+        )
+        if format_cache.contains(cache_key):
+            print(f"--------> Skipped {file_name}, unchanged since formatted")
+            return False
 
     updated_code = code
-    for _, (function, description, format_with_subprocess, _) in strategies.items():
-        if format_with_subprocess:
+    failed = False
+    for abbreviation, strategy in strategies.items():
+        function, description, format_with_subprocess, _ = strategy
+        input_code = updated_code
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        probe = STRATEGY_PROBES.get(abbreviation)
+        skipped = probe is not None and not probe(updated_code)
+        if skipped:
+            pass
+        elif function == format_with_black and black_mode != "subprocess":
+            if not python_env_path:
+                raise ValueError(
+                    "Python environment path is required for format with subprocess."
+                )
+            # Black formats the code in memory, the file is written at the end
+            updated_code, message = format_code_with_black(
+                updated_code, file_path, python_env_path, mode=black_mode
+            )
+            if message:
+                print(message)
+                failed = True
+        elif format_with_subprocess:
             if not python_env_path:
                 raise ValueError(
                     "Python environment path is required for format with subprocess."
@@ -169,6 +273,8 @@ def format_python_file(
 
             if message := function(file_path, python_env_path):
                 print(message)
+                # Black prints nothing to stdout, unless formatting failed
+                failed = failed or function == format_with_black
             with open(file_path, "r", encoding="utf-8") as file:
                 updated_code = file.read()
         elif function == rearrange_imports:
@@ -180,14 +286,43 @@ def format_python_file(
             updated_code = function(updated_code, modules_info)
         else:
             updated_code = function(updated_code)
-        file_name = os.path.basename(file_path)
-        print(f"--------> {description} applied to {file_name}")
-        if checkpointing:
-            make_checkpoint(file_path, updated_code, description, checkpoint_dir)
+        wall_time = time.perf_counter() - wall_start
+        cpu_time = time.process_time() - cpu_start
+        checkpoint_path = None
+        if skipped:
+            print(f"--------> {description} skipped for {file_name}, not applicable")
+        else:
+            print(f"--------> {description} applied to {file_name}")
+        if checkpointing and not skipped:
+            checkpoint_path = make_checkpoint(
+                file_path, updated_code, description, checkpoint_dir
+            )
+        if timing_sink is not None:
+            timing_sink.emit(
+                {
+                    "file_path": file_path,
+                    "strategy": abbreviation,
+                    "description": description,
+                    "wall_time": wall_time,
+                    "cpu_time": cpu_time,
+                    "input_size": len(input_code),
+                    "output_size": len(updated_code),
+                    "changed": updated_code != input_code,
+                    "skipped": skipped,
+                    "checkpoint": checkpoint_path,
+                }
+            )
 
     with open(file_path, "w", encoding="utf-8") as file:
         file.write(updated_code)
 
+    if format_cache is not None and not failed:
+        cache_key = get_format_cache_key(
+            updated_code, file_path, strategies, python_env_path, modules_info
+        )
+        format_cache.add(cache_key, file_path)
+    return True
+
 
 if __name__ == "__main__":
     path = r"tasks/tests/for_tasks/format_python_test.py"
@@ -198,6 +333,7 @@ if __name__ == "__main__":
         path,
         checkpoint_dir=profile.checkpoint_dir,
         python_env_path=profile.runner_python_env,
+        timing_sink=StdoutTimingSink(),
         # select_only=["FD"]
     )
     print(f"File Formatted at {path}")
@@ -1,5 +1,24 @@
 import re
 
+
+def is_remove_f_from_empty_fstrings_applicable(code):
+    """
+    Fast check whether remove_f_from_empty_fstrings can change more than the
+    line endings of the code.
+
+    Parameters
+    ----------
+    code (str)
+        The code to be checked.
+
+    Returns
+    -------
+    bool
+        False if the code has no 'f"' prefix.
+    """
+    return 'f"' in code
+
+
 def remove_f_from_empty_fstrings(code):
     """
     Removes the 'f' from f-strings that do not contain any interpolated
@@ -3,6 +3,26 @@ from tasks.configs.constants import INDENT_SPACES
 INTEND_LEN = len(INDENT_SPACES)
 
 
+def is_remove_unnecessary_else_applicable(code):
+    """
+    Fast check whether remove_unnecessary_else can change more than the line
+    endings of the code.
+
+    Parameters
+    ----------
+    code (str)
+        The code to be checked.
+
+    Returns
+    -------
+    bool
+        False if the code has no 'raise' or 'return', or no 'else:' or
+        'elif'.
+    """
+    has_exit = "return" in code or "raise" in code
+    return has_exit and ("else:" in code or "elif" in code)
+
+
 def remove_unnecessary_else(code):
     """
     Removes unnecessary 'else' statements that follow 'raise' or 'return'
@@ -1,10 +1,6 @@
 import os
-import re
 
-from tasks.utils.for_format_python.is_specifier_used import (
-    is_specifier_used,
-)
-from tasks.utils.for_format_python.separate_imports import separate_imports
+from tasks.utils.for_format_python.collect_used_names import collect_used_names
 from tasks.utils.for_format_python.split_import_statement import (
     split_import_statement,
 )
@@ -17,6 +13,39 @@ def reconstruct_specifier_string(specifier):
     return f"{original_name} as {alias_name}"
 
 
+def locate_import_statements(lines):
+    """
+    Locates the top-level import statements in the lines of a Python code
+    string, the same way separate_imports does.
+
+    Parameters
+    ----------
+    lines (list)
+        The lines of the code, including line endings.
+
+    Returns
+    -------
+    list
+        A list of tuples (start, stop, statement) with the line range of each
+        import statement and the stripped statement.
+    """
+    located_statements = []
+    index = 0
+    while index < len(lines):
+        line = lines[index]
+        if line.startswith("import ") or line.startswith("from "):
+            start = index
+            if "(" in line and ")" not in line:
+                while index + 1 < len(lines):
+                    index += 1
+                    if ")" in lines[index]:
+                        break
+            statement = "".join(lines[start : index + 1]).strip()
+            located_statements.append((start, index + 1, statement))
+        index += 1
+    return located_statements
+
+
 def remove_unused_imports(code_text):
     """
     Removes unused imports from a Python code string.
@@ -31,23 +60,40 @@ def remove_unused_imports(code_text):
     str
         The Python code string with unused imports removed.
     """
-    updated_code = code_text
-    import_statements, code_lines = separate_imports(code_text)
-    for statement in import_statements:
+    lines = code_text.splitlines(keepends=True)
+    located_statements = locate_import_statements(lines)
+    if not located_statements:
+        return code_text
+
+    # The names used outside of the top-level imports are collected once
+    code_lines = lines[:]
+    for start, stop, _ in located_statements:
+        code_lines[start:stop] = [""] * (stop - start)
+    used_names = collect_used_names("".join(code_lines), include_imports=True)
+
+    replacements = []
+    for start, stop, statement in located_statements:
         base, original_names, alias_names = split_import_statement(statement)
-        specifiers = zip(original_names, alias_names)
-        used_specifiers = []
-        for specifier in specifiers:
-            if is_specifier_used(specifier[1], code_lines, include_imports=True):
-                used_specifiers.append(specifier)
-        if used_specifiers == []:
-            pattern = rf"{statement} *\n"
-            updated_code = re.sub(pattern, "", updated_code)
-        elif used_specifiers != specifiers:
-            used_specifiers = list(map(reconstruct_specifier_string, used_specifiers))
-            restored_import_statement = base + " " + ", ".join(used_specifiers)
-            updated_code = updated_code.replace(statement, restored_import_statement)
-    return updated_code
+        used_specifiers = [
+            specifier
+            for specifier in zip(original_names, alias_names)
+            if specifier[1] in used_names
+        ]
+        if not used_specifiers:
+            replacements.append((start, stop, []))
+            continue
+        used_specifiers = list(map(reconstruct_specifier_string, used_specifiers))
+        restored_import_statement = base + " " + ", ".join(used_specifiers)
+        if restored_import_statement != statement:
+            line_ending = lines[stop - 1][len(lines[stop - 1].rstrip("\r\n")) :]
+            replacements.append(
+                (start, stop, [restored_import_statement + line_ending])
+            )
+
+    # Splice from the end, so the line ranges of earlier statements stay valid
+    for start, stop, new_lines in reversed(replacements):
+        lines[start:stop] = new_lines
+    return "".join(lines)
 
 
 def remove_unused_imports_from_file(file_path):
@@ -1,6 +1,16 @@
+import atexit
+import importlib.metadata
+import json
 import os
 import subprocess
 
+import tasks.utils.for_format_python.black_worker as black_worker
+from tasks.utils.shared.library_utils import get_environment_package_version
+
+BLACK_MODES = ["auto", "in_process", "worker", "subprocess"]
+
+_BLACK_WORKERS = {}
+
 
 def format_with_black(script_path, environment_path):
     """
@@ -39,6 +49,207 @@ def format_with_black(script_path, environment_path):
         return f"Formatting error: {e}\nOutput: {e.stdout}\nError Output: {e.stderr}"
 
 
+def get_environment_black_version(environment_path):
+    """
+    Returns the version of Black installed in a Python environment, read from
+    its package metadata without starting the environment's interpreter.
+
+    Parameters
+    ----------
+    environment_path (str)
+        The path to the Python environment.
+
+    Returns
+    -------
+    str or None
+        The Black version, or None if Black is not installed.
+    """
+    return get_environment_package_version(environment_path, "black")
+
+
+def is_in_process_black_compatible(environment_path):
+    """
+    Checks whether the Black package of the tasks environment has the same
+    version as the one of the runner environment.
+
+    Parameters
+    ----------
+    environment_path (str)
+        The path to the runner Python environment.
+
+    Returns
+    -------
+    bool
+        True if Black can be run in-process, False otherwise.
+    """
+    try:
+        tasks_black_version = importlib.metadata.version("black")
+    except importlib.metadata.PackageNotFoundError:
+        return False
+    return tasks_black_version == get_environment_black_version(environment_path)
+
+
+class BlackWorker:
+    """
+    Long-lived Black process in a runner environment that formats code sent
+    over a pipe, so Black is started only once for many files.
+
+    Parameters
+    ----------
+    environment_path (str)
+        The path to the runner Python environment.
+    """
+
+    def __init__(self, environment_path):
+        python_executable = os.path.join(
+            environment_path, "bin" if os.name == "posix" else "Scripts", "python"
+        )
+        self.process = subprocess.Popen(
+            [python_executable, "-u", black_worker.__file__],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+        )
+
+    def format_code(self, code, file_path):
+        """
+        Formats code in the worker process.
+
+        Parameters
+        ----------
+        code (str)
+            The code to format.
+        file_path (str)
+            The path of the file the code belongs to.
+
+        Returns
+        -------
+        dict
+            The response of the worker, see black_worker.format_code.
+        """
+        request = json.dumps({"code": code, "file_path": file_path})
+        try:
+            self.process.stdin.write(request + "\n")
+            self.process.stdin.flush()
+            response = self.process.stdout.readline()
+        except (BrokenPipeError, OSError):
+            response = ""
+        if not response:
+            self.close()
+            msg = "Black worker exited unexpectedly."
+            raise RuntimeError(msg)
+        return json.loads(response)
+
+    def is_alive(self):
+        return self.process.poll() is None
+
+    def close(self):
+        """
+        Terminates the worker process.
+        """
+        if self.is_alive():
+            self.process.stdin.close()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+
+
+def get_black_worker(environment_path):
+    """
+    Returns the running Black worker of the environment, starting it if
+    required.
+
+    Parameters
+    ----------
+    environment_path (str)
+        The path to the runner Python environment.
+
+    Returns
+    -------
+    BlackWorker
+        The Black worker.
+    """
+    worker = _BLACK_WORKERS.get(environment_path)
+    if worker is None or not worker.is_alive():
+        worker = BlackWorker(environment_path)
+        _BLACK_WORKERS[environment_path] = worker
+    return worker
+
+
+@atexit.register
+def close_black_workers():
+    """
+    Terminates all running Black workers.
+    """
+    for worker in _BLACK_WORKERS.values():
+        worker.close()
+    _BLACK_WORKERS.clear()
+
+
+def _format_with_black_subprocess(code, file_path, environment_path):
+    with open(file_path, "w", encoding="utf-8") as file:
+        file.write(code)
+    message = format_with_black(file_path, environment_path)
+    with open(file_path, "r", encoding="utf-8") as file:
+        return file.read(), message
+
+
+def format_code_with_black(code, file_path, environment_path, mode="auto"):
+    """
+    Formats code with Black without writing it to disk, as the Black command
+    line of the runner environment would format the file.
+
+    Parameters
+    ----------
+    code (str)
+        The code to format.
+    file_path (str)
+        The path of the file the code belongs to. Used to find the Black
+        configuration.
+    environment_path (str)
+        The path to the runner Python environment containing Black.
+    mode (str)
+        One of BLACK_MODES. "in_process" runs Black of the tasks environment,
+        "worker" a long-lived Black process in the runner environment and
+        "subprocess" the Black command line on the file. "auto" runs Black
+        in-process if the tasks environment has the Black version of the
+        runner environment, otherwise in a worker. Configurations that cannot
+        be reproduced fall back to the command line.
+
+    Returns
+    -------
+    tuple
+        The formatted code, or the unchanged code if formatting fails, and a
+        message, which is empty on success.
+    """
+    if mode not in BLACK_MODES:
+        msg = f"Black mode {mode} is not one of {BLACK_MODES}."
+        raise ValueError(msg)
+    file_path = os.path.abspath(file_path)
+    if mode == "auto":
+        if is_in_process_black_compatible(environment_path):
+            mode = "in_process"
+        else:
+            mode = "worker"
+
+    response = None
+    if mode == "in_process":
+        response = black_worker.format_code(code, file_path)
+    elif mode == "worker":
+        try:
+            response = get_black_worker(environment_path).format_code(code, file_path)
+        except (OSError, RuntimeError):
+            response = None
+    if response is None or response["unsupported"]:
+        return _format_with_black_subprocess(code, file_path, environment_path)
+    if response["error"]:
+        return code, response["error"]
+    return response["code"], ""
+
+
 if __name__ == "__main__":
     script_path = "/path/to/python/script.py"
     env_python_path = "/path/to/venv/bin/python"
@@ -0,0 +1,64 @@
+import ast
+
+_LAST_DOCUMENT = None
+
+
+class SourceDocument:
+    """
+    Python source code together with its syntax tree, which is parsed on
+    first access and cached.
+
+    Parameters
+    ----------
+    code (str)
+        The Python source code.
+
+    Attributes
+    ----------
+    analyses (dict)
+        Results of analyses of the code, e.g. the used names, keyed by the
+        analysis. They are dropped together with the document when the code
+        changes.
+    """
+
+    def __init__(self, code):
+        self.code = code
+        self._tree = None
+        self.analyses = {}
+
+    @property
+    def tree(self):
+        """
+        Returns the syntax tree of the code.
+
+        Returns
+        -------
+        ast.Module
+            The syntax tree of the code.
+        """
+        if self._tree is None:
+            self._tree = ast.parse(self.code)
+        return self._tree
+
+
+def get_source_document(code):
+    """
+    Returns the source document for the code. The most recently requested
+    document is reused if its code is unchanged, so repeated analyses of the
+    same code, e.g. is_specifier_used lookups of several names, share a
+    single parse.
+
+    Parameters
+    ----------
+    code (str)
+        The Python source code.
+
+    Returns
+    -------
+    SourceDocument
+        The source document for the code.
+    """
+    global _LAST_DOCUMENT
+    if _LAST_DOCUMENT is None or _LAST_DOCUMENT.code != code:
+        _LAST_DOCUMENT = SourceDocument(code)
+    return _LAST_DOCUMENT
@@ -0,0 +1,253 @@
+"""
+Instrumentation of the strategies applied by format_python_file.
+
+For every strategy a timing record is passed to a sink. A record is a dict
+with the keys:
+- file_path: The formatted file.
+- strategy: The abbreviation of the strategy.
+- description: The description of the strategy.
+- wall_time: The elapsed time in seconds.
+- cpu_time: The CPU time of the formatting process in seconds, without the
+time spent in subprocesses.
+- input_size and output_size: The characters of the code before and after.
+- changed: Whether the strategy changed the code.
+- skipped: Whether the strategy was skipped as its probe failed, the times
+are then the times of the probe.
+- checkpoint: The path to the checkpoint of the strategy, or None.
+
+Sinks have an emit method receiving the records, see the sinks below.
+"""
+
+import json
+import os
+
+STRATEGY_TIMINGS_FILE = "strategy_timings.jsonl"
+TIMING_SINKS = ["log", "stdout"]
+
+
+class JsonLinesTimingSink:
+    """
+    Appends timing records to a JSON lines file. Every record is written with
+    a single append, so processes formatting in parallel can share the file.
+
+    Attributes
+    ----------
+    log_file (str)
+        The path to the JSON lines file.
+    """
+
+    def __init__(self, log_file):
+        """
+        Initialize the JsonLinesTimingSink instance.
+
+        Parameters
+        ----------
+        log_file (str)
+            The path to the JSON lines file.
+        """
+        self.log_file = log_file
+
+    def emit(self, record):
+        """
+        Appends a record to the file.
+
+        Parameters
+        ----------
+        record (dict)
+            The timing record.
+        """
+        line = json.dumps(record) + "\n"
+        with open(self.log_file, "a", encoding="utf-8") as f:
+            f.write(line)
+
+
+class MemoryTimingSink:
+    """
+    Collects timing records in memory.
+
+    Attributes
+    ----------
+    records (list)
+        The collected records.
+    """
+
+    def __init__(self):
+        self.records = []
+
+    def emit(self, record):
+        """
+        Collects a record.
+
+        Parameters
+        ----------
+        record (dict)
+            The timing record.
+        """
+        self.records.append(record)
+
+
+class StdoutTimingSink:
+    """
+    Prints timing records, one line per record.
+    """
+
+    def emit(self, record):
+        """
+        Prints a record.
+
+        Parameters
+        ----------
+        record (dict)
+            The timing record.
+        """
+        if record["skipped"]:
+            changed = "skipped"
+        else:
+            changed = "changed" if record["changed"] else "unchanged"
+        print(
+            f"--------> {record['strategy']} took "
+            f"{record['wall_time'] * 1000:.2f} ms wall, "
+            f"{record['cpu_time'] * 1000:.2f} ms CPU, "
+            f"{record['input_size']} -> {record['output_size']} chars, {changed}"
+        )
+
+
+def get_timing_sink(sink_name, log_dir):
+    """
+    Returns the timing sink configured by name, see the profile attribute
+    strategy_timing_sink.
+
+    Parameters
+    ----------
+    sink_name (str or None)
+        One of TIMING_SINKS, or None to disable timing.
+    log_dir (str)
+        The log directory, where the "log" sink writes STRATEGY_TIMINGS_FILE.
+
+    Returns
+    -------
+    object or None
+        The sink, or None if timing is disabled.
+    """
+    if sink_name is None:
+        return None
+    if sink_name == "log":
+        return JsonLinesTimingSink(os.path.join(log_dir, STRATEGY_TIMINGS_FILE))
+    if sink_name == "stdout":
+        return StdoutTimingSink()
+    msg = f"Invalid strategy timing sink '{sink_name}', expected one of {TIMING_SINKS}."
+    raise ValueError(msg)
+
+
+def load_timing_records(log_file):
+    """
+    Loads the records written by a JsonLinesTimingSink. A partially written
+    last line is ignored.
+
+    Parameters
+    ----------
+    log_file (str)
+        The path to the JSON lines file.
+
+    Returns
+    -------
+    list
+        The timing records.
+    """
+    records = []
+    with open(log_file, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def aggregate_timings(records):
+    """
+    Aggregates timing records by strategy.
+
+    Parameters
+    ----------
+    records (list)
+        The timing records.
+
+    Returns
+    -------
+    dict
+        For every strategy, in the order of their first record, a dict with
+        the number of runs, the number of runs that changed the code, the
+        number of runs skipped by the probe of the strategy, and the summed
+        wall_time, cpu_time, input_size and output_size.
+    """
+    totals = {}
+    for record in records:
+        total = totals.setdefault(
+            record["strategy"],
+            {
+                "runs": 0,
+                "changed": 0,
+                "skipped": 0,
+                "wall_time": 0.0,
+                "cpu_time": 0.0,
+                "input_size": 0,
+                "output_size": 0,
+            },
+        )
+        total["runs"] += 1
+        total["changed"] += int(record["changed"])
+        total["skipped"] += int(record.get("skipped", False))
+        for key in ("wall_time", "cpu_time", "input_size", "output_size"):
+            total[key] += record[key]
+    return totals
+
+
+def format_timings_table(records):
+    """
+    Formats the aggregated timing records as a table, sorted by the time
+    spent in each strategy.
+
+    Parameters
+    ----------
+    records (list)
+        The timing records.
+
+    Returns
+    -------
+    str
+        The table.
+    """
+    totals = aggregate_timings(records)
+    total_wall_time = sum(total["wall_time"] for total in totals.values())
+    header = [
+        "strategy",
+        "runs",
+        "changed",
+        "skipped",
+        "wall s",
+        "cpu s",
+        "ms/run",
+        "share",
+    ]
+    rows = [header]
+    for strategy, total in sorted(
+        totals.items(), key=lambda item: item[1]["wall_time"], reverse=True
+    ):
+        share = total["wall_time"] / total_wall_time if total_wall_time else 0
+        rows.append(
+            [
+                strategy,
+                str(total["runs"]),
+                str(total["changed"]),
+                str(total["skipped"]),
+                f"{total['wall_time']:.3f}",
+                f"{total['cpu_time']:.3f}",
+                f"{total['wall_time'] / total['runs'] * 1000:.2f}",
+                f"{share:.1%}",
+            ]
+        )
+    widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+    return "\n".join(
+        "  ".join(cell.rjust(width) for cell, width in zip(row, widths)) for row in rows
+    )
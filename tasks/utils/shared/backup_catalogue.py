@@ -0,0 +1,333 @@
+import csv
+import io
+import os
+
+ADD_ACTION = "add"
+REMOVE_ACTION = "remove"
+FIELDNAMES = [
+    "previous_file_path",
+    "backup_file_name",
+    "comment",
+    "action",
+    "backup_id",
+]
+# The log is compacted once it has more than COMPACTION_FACTOR rows per
+# cataloged backup, but not before it has COMPACTION_MIN_ROWS rows.
+COMPACTION_MIN_ROWS = 100
+COMPACTION_FACTOR = 2
+
+
+class BackupCatalogue:
+    """
+    Catalogue of stored backups, persisted as an append-only CSV log. Every
+    added backup appends an "add" row and every removed backup a "remove"
+    row referring to its id, so changes are written without rewriting the
+    log. Rows appended by other processes are read incrementally. The log is
+    compacted, i.e. rewritten with the cataloged backups only, once it has
+    grown too large compared to the catalogue. Logs without the action and
+    backup_id columns are read as lists of added backups.
+
+    The catalogue indexes backups by the path of the backed up file, so the
+    latest backup of a file is looked up in constant time.
+
+    The log must only be changed through a catalogue or by replacing it, and
+    callers are expected to serialize access to it between processes.
+
+    Attributes
+    ----------
+    log_file (str)
+        The path to the CSV log.
+    entries (dict)
+        The cataloged backups, from oldest to latest, by their id. Each entry
+        has the keys previous_file_path, backup_file_name and comment.
+    """
+
+    def __init__(self, log_file):
+        """
+        Initialize the BackupCatalogue instance.
+
+        Parameters
+        ----------
+        log_file (str)
+            The path to the CSV log.
+        """
+        self.log_file = log_file
+        self._reset()
+
+    def _reset(self):
+        self.entries = {}
+        self._path_index = {}
+        self._backup_file_references = {}
+        self._next_id = 1
+        self._fieldnames = FIELDNAMES
+        self._log_rows = 0
+        # The inode and size of the parsed log, None if it does not exist.
+        self._log_state = None
+        self._pending_rows = []
+        self._needs_compaction = False
+
+    def __len__(self):
+        return len(self.entries)
+
+    def refresh(self):
+        """
+        Synchronizes the catalogue with the log. Rows appended since the last
+        synchronization are applied, a replaced or truncated log is read
+        again and a deleted log empties the catalogue. Uncommitted changes are
+        discarded.
+        """
+        self._pending_rows = []
+        try:
+            stat = os.stat(self.log_file)
+        except FileNotFoundError:
+            self._reset()
+            return
+        if self._log_state is not None:
+            inode, size = self._log_state
+            if stat.st_ino == inode and stat.st_size == size:
+                return
+            if stat.st_ino == inode and stat.st_size > size:
+                self._read_log(offset=size)
+                return
+        self._reset()
+        self._read_log(offset=0)
+
+    def _read_log(self, offset):
+        with open(self.log_file, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+            inode = os.fstat(f.fileno()).st_ino
+        # Only complete lines are parsed, the rest is read on the next refresh.
+        data = data[: data.rfind(b"\n") + 1]
+        rows = csv.reader(io.StringIO(data.decode("utf-8"), newline=""))
+        if offset == 0:
+            header = next(rows, None)
+            if header is not None:
+                self._fieldnames = header
+            self._needs_compaction = header != FIELDNAMES
+        for values in rows:
+            if not values:
+                continue
+            self._apply_row(dict(zip(self._fieldnames, values)))
+            self._log_rows += 1
+        self._log_state = (inode, offset + len(data))
+
+    def _apply_row(self, row):
+        if row.get("action") == REMOVE_ACTION:
+            self._remove_entry(int(row["backup_id"]))
+            return
+        if row.get("backup_id"):
+            backup_id = int(row["backup_id"])
+        else:
+            backup_id = self._next_id
+        entry = {
+            "previous_file_path": row.get("previous_file_path", ""),
+            "backup_file_name": row.get("backup_file_name", ""),
+            "comment": row.get("comment", ""),
+        }
+        self._add_entry(backup_id, entry)
+
+    def _add_entry(self, backup_id, entry):
+        self.entries[backup_id] = entry
+        self._path_index.setdefault(entry["previous_file_path"], []).append(backup_id)
+        backup_file_name = entry["backup_file_name"]
+        self._backup_file_references[backup_file_name] = (
+            self._backup_file_references.get(backup_file_name, 0) + 1
+        )
+        self._next_id = max(self._next_id, backup_id + 1)
+
+    def _remove_entry(self, backup_id):
+        entry = self.entries.pop(backup_id, None)
+        if entry is None:
+            return None
+        backup_ids = self._path_index[entry["previous_file_path"]]
+        backup_ids.remove(backup_id)
+        if not backup_ids:
+            del self._path_index[entry["previous_file_path"]]
+        backup_file_name = entry["backup_file_name"]
+        self._backup_file_references[backup_file_name] -= 1
+        if not self._backup_file_references[backup_file_name]:
+            del self._backup_file_references[backup_file_name]
+        return entry
+
+    def add(self, previous_file_path, backup_file_name, comment=None):
+        """
+        Adds a backup to the catalogue. The change is written on commit.
+
+        Parameters
+        ----------
+        previous_file_path (str)
+            The path to the backed up file.
+        backup_file_name (str)
+            The name of the backup file.
+        comment (str, optional)
+            An optional comment associated with the backup.
+
+        Returns
+        -------
+        int
+            The id of the backup.
+        """
+        backup_id = self._next_id
+        entry = {
+            "previous_file_path": previous_file_path,
+            "backup_file_name": backup_file_name,
+            "comment": comment,
+        }
+        self._add_entry(backup_id, entry)
+        self._pending_rows.append(
+            {**entry, "action": ADD_ACTION, "backup_id": backup_id}
+        )
+        return backup_id
+
+    def remove(self, backup_id):
+        """
+        Removes a backup from the catalogue. The change is written on commit.
+
+        Parameters
+        ----------
+        backup_id (int)
+            The id of the backup.
+
+        Returns
+        -------
+        dict
+            The removed entry.
+        """
+        entry = self._remove_entry(backup_id)
+        if entry is None:
+            msg = f"No backup with id {backup_id} found"
+            raise KeyError(msg)
+        self._pending_rows.append(
+            {
+                "previous_file_path": entry["previous_file_path"],
+                "backup_file_name": entry["backup_file_name"],
+                "comment": None,
+                "action": REMOVE_ACTION,
+                "backup_id": backup_id,
+            }
+        )
+        return entry
+
+    def get_backup_ids(self, previous_file_path):
+        """
+        Returns the ids of the backups of a file.
+
+        Parameters
+        ----------
+        previous_file_path (str)
+            The path to the backed up file.
+
+        Returns
+        -------
+        list
+            The ids, from oldest to latest backup.
+        """
+        return list(self._path_index.get(previous_file_path, []))
+
+    def get_latest_backup_id(self, previous_file_path=None):
+        """
+        Returns the id of the latest backup of a file, or of the latest
+        backup at all.
+
+        Parameters
+        ----------
+        previous_file_path (str, optional)
+            The path to the backed up file. Default is None.
+
+        Returns
+        -------
+        int or None
+            The id, or None if there is no such backup.
+        """
+        if previous_file_path is None:
+            return next(reversed(self.entries), None)
+        backup_ids = self._path_index.get(previous_file_path)
+        return backup_ids[-1] if backup_ids else None
+
+    def get_oldest_backup_id(self):
+        """
+        Returns the id of the oldest backup.
+
+        Returns
+        -------
+        int or None
+            The id, or None if the catalogue is empty.
+        """
+        return next(iter(self.entries), None)
+
+    def is_referenced(self, backup_file_name):
+        """
+        Checks whether a backup file belongs to a cataloged backup.
+
+        Parameters
+        ----------
+        backup_file_name (str)
+            The name of the backup file.
+
+        Returns
+        -------
+        bool
+            True if a backup refers to the file.
+        """
+        return backup_file_name in self._backup_file_references
+
+    def get_backup_file_names(self):
+        """
+        Returns the names of the backup files of the cataloged backups.
+
+        Returns
+        -------
+        set
+            The names.
+        """
+        return set(self._backup_file_references)
+
+    def commit(self):
+        """
+        Writes the uncommitted changes to the log by appending them, or by
+        compacting the log if it has grown too large.
+        """
+        log_rows = self._log_rows + len(self._pending_rows)
+        if (
+            self._needs_compaction
+            or self._log_state is None
+            or log_rows > max(COMPACTION_MIN_ROWS, COMPACTION_FACTOR * len(self))
+        ):
+            self.compact()
+            return
+        if not self._pending_rows:
+            return
+        with open(self.log_file, "ab") as f:
+            f.write(self._format_rows(self._pending_rows))
+            self._log_state = (os.fstat(f.fileno()).st_ino, f.tell())
+        self._log_rows = log_rows
+        self._pending_rows = []
+
+    def compact(self):
+        """
+        Rewrites the log with the cataloged backups only. Uncommitted changes
+        are written as well.
+        """
+        rows = [
+            {**entry, "action": ADD_ACTION, "backup_id": backup_id}
+            for backup_id, entry in self.entries.items()
+        ]
+        temp_file = f"{self.log_file}.{os.getpid()}.tmp"
+        with open(temp_file, "wb") as f:
+            f.write(self._format_rows(rows, header=True))
+            size = f.tell()
+        os.replace(temp_file, self.log_file)
+        self._fieldnames = FIELDNAMES
+        self._log_rows = len(rows)
+        self._log_state = (os.stat(self.log_file).st_ino, size)
+        self._pending_rows = []
+        self._needs_compaction = False
+
+    def _format_rows(self, rows, header=False):
+        buffer = io.StringIO(newline="")
+        writer = csv.DictWriter(buffer, fieldnames=FIELDNAMES)
+        if header:
+            writer.writeheader()
+        writer.writerows(rows)
+        return buffer.getvalue().encode("utf-8")
@@ -1,13 +1,24 @@
-from copy import deepcopy
-import csv
+from concurrent.futures import ThreadPoolExecutor
+import hashlib
 import os
 import shutil
+import zlib
+
+from tasks.utils.shared.backup_catalogue import BackupCatalogue
+from tasks.utils.shared.file_lock import file_lock
 
 
 class BackupHandler:
     """
     A class for handling file backups in a specified directory.
 
+    Backups are stored content addressed: the content of a backed up file is
+    compressed with zlib and stored once as a blob named after its SHA-256
+    hash, so identical snapshots share the same blob. The backup context maps
+    every backup to its blob, and a blob is removed once no backup refers to
+    it anymore. The context is kept in a BackupCatalogue, an indexed,
+    append-only log.
+
     Attributes
     ----------
     backup_dir (str)
@@ -25,6 +36,8 @@ class BackupHandler:
         Store a backup of a file in the backup directory.
     recover_backup(previous_file_name)
         Recover a specific backup file to its original location.
+    recover_backups(previous_file_paths, max_workers=1)
+        Recover the backups of several files at once.
     cleanup_storage()
         Clean up excess backup files based on the `max_backups` limit.
     get_backup_context(file_extension=None)
@@ -47,6 +60,8 @@ class BackupHandler:
     """
 
     CONTEXT_FILE_NAME = "backup_context.csv"
+    LOCK_FILE_SUFFIX = ".lock"
+    BLOB_SUFFIX = ".z"
 
     def __init__(self, backup_dir, max_backups=None):
         """
@@ -64,12 +79,23 @@ class BackupHandler:
         if not os.path.exists(self.backup_dir):
             os.mkdir(self.backup_dir)
         self.context_file = os.path.join(backup_dir, BackupHandler.CONTEXT_FILE_NAME)
+        # Kept next to the backup directory, so it survives clearing the storage.
+        self.lock_file = os.path.normpath(backup_dir) + BackupHandler.LOCK_FILE_SUFFIX
+        self.catalogue = BackupCatalogue(self.context_file)
         self.load_context()
         self.max_backups = max_backups
 
+    @property
+    def context_data(self):
+        """
+        list: The backup context entries, from oldest to latest backup.
+        """
+        return list(self.catalogue.entries.values())
+
     def load_context(self):
         """
-        Load the backup context from a CSV file.
+        Load the backup context from a CSV file. Only the changes since the
+        last load are read.
 
         Returns
         -------
@@ -77,30 +103,70 @@ class BackupHandler:
             context_data
         """
 
-        self.context_data = []
-        if os.path.exists(self.context_file):
-            with open(self.context_file, "r", newline="") as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    self.context_data.append(row)
-
+        self.catalogue.refresh()
         return self.context_data
 
     def save_context(self):
         """
-        Save the backup context to a CSV file.
+        Save the backup context to a CSV file, compacting its log.
         """
 
-        with open(self.context_file, "w", newline="") as csvfile:
-            fieldnames = ["previous_file_path", "backup_file_name", "comment"]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(self.context_data)
+        self.catalogue.compact()
+
+    def _get_view_name(self, backup_file_name):
+        # The decompressed copy of a blob, see get_backup_path.
+        if backup_file_name.endswith(BackupHandler.BLOB_SUFFIX):
+            return backup_file_name[: -len(BackupHandler.BLOB_SUFFIX)]
+        return None
+
+    def _read_backup(self, backup_file_name):
+        backup_file = os.path.join(self.backup_dir, backup_file_name)
+        with open(backup_file, "rb") as f:
+            content = f.read()
+        if backup_file_name.endswith(BackupHandler.BLOB_SUFFIX):
+            return zlib.decompress(content)
+        # Backups stored before the storage was content addressed are plain
+        # copies.
+        return content
+
+    def _release_backup(self, backup_file_name):
+        # Removes a blob and its decompressed copy once no backup refers to it.
+        if self.catalogue.is_referenced(backup_file_name):
+            return
+        file_names = [backup_file_name, self._get_view_name(backup_file_name)]
+        for file_name in filter(None, file_names):
+            file_path = os.path.join(self.backup_dir, file_name)
+            if os.path.exists(file_path):
+                os.remove(file_path)
+
+    def _remove_backup(self, backup_id):
+        entry = self.catalogue.remove(backup_id)
+        self._release_backup(entry["backup_file_name"])
+        return entry
+
+    def _remove_oldest_backups(self):
+        if self.max_backups is None:
+            return
+        while len(self.catalogue) > self.max_backups:
+            self._remove_backup(self.catalogue.get_oldest_backup_id())
+
+    def _find_latest_backup(self, previous_file_path=None):
+        # Backups whose blob has been deleted are dropped on the way.
+        while True:
+            backup_id = self.catalogue.get_latest_backup_id(previous_file_path)
+            if backup_id is None:
+                return None
+            backup_file_name = self.catalogue.entries[backup_id]["backup_file_name"]
+            if os.path.exists(os.path.join(self.backup_dir, backup_file_name)):
+                return backup_id
+            self._remove_backup(backup_id)
 
     def store_backup(self, file_path, comment=None):
         """
         Store a backup of a file in the backup directory. Raises
-        FileNotFoundError if the file does not exist.
+        FileNotFoundError if the file does not exist. The content is only
+        written if no backup with the same content is stored yet. Backups
+        stored by concurrent processes are serialized by a lock file.
 
         Parameters
         ----------
@@ -110,36 +176,27 @@ class BackupHandler:
             An optional comment to associate with the backup.
         """
 
-        count = 1
-        file_name, file_extension = os.path.splitext(os.path.basename(file_path))
-        dest_file = os.path.join(
-            self.backup_dir, f"{file_name}_{count}{file_extension}"
+        with open(file_path, "rb") as f:
+            content = f.read()
+        file_extension = os.path.splitext(file_path)[1]
+        backup_file_name = (
+            hashlib.sha256(content).hexdigest()
+            + file_extension
+            + BackupHandler.BLOB_SUFFIX
         )
+        backup_file = os.path.join(self.backup_dir, backup_file_name)
 
-        while os.path.exists(f"{dest_file}"):
-            dest_file = os.path.join(
-                self.backup_dir, f"{file_name}_{count}{file_extension}"
-            )
-            count += 1
-
-        shutil.copy2(file_path, dest_file)
-
-        context_entry = {
-            "previous_file_path": os.path.normpath(file_path),
-            "backup_file_name": os.path.basename(dest_file),
-            "comment": comment,
-        }
-        self.load_context()
-        self.context_data.append(context_entry)
-
-        if self.max_backups is not None and len(self.context_data) > self.max_backups:
-            oldest_backup = self.context_data.pop(0)
-            oldest_backup_file = os.path.join(
-                self.backup_dir, oldest_backup["backup_file_name"]
-            )
-            os.remove(oldest_backup_file)
+        with file_lock(self.lock_file):
+            if not os.path.exists(backup_file):
+                temp_file = f"{backup_file}.{os.getpid()}.tmp"
+                with open(temp_file, "wb") as f:
+                    f.write(zlib.compress(content))
+                os.replace(temp_file, backup_file)
 
-        self.save_context()
+            self.catalogue.refresh()
+            self.catalogue.add(os.path.normpath(file_path), backup_file_name, comment)
+            self._remove_oldest_backups()
+            self.catalogue.commit()
 
     def recover_backup(self, previous_file_path):
         """
@@ -152,25 +209,78 @@ class BackupHandler:
         previous_file_path (str)
             The path to the file that was backed up.
         """
-        self.cleanup_storage()
-        self.load_context()
-        previous_file_path = os.path.normpath(previous_file_path)
-        copy_context_data = deepcopy(self.context_data)
-        copy_context_data.reverse()  # To get the last backup first
-        for backup_file_context in copy_context_data:
-            source_file_path = backup_file_context["previous_file_path"]
-            if source_file_path == previous_file_path:
-                backup_file = os.path.join(
-                    self.backup_dir, backup_file_context["backup_file_name"]
-                )
-                if os.path.exists(backup_file):
-                    shutil.move(backup_file, previous_file_path)
-                    self.context_data.remove(backup_file_context)
-                    self.save_context()
-                break
-        else:
-            msg = f"No backup found for {previous_file_path}"
-            raise FileNotFoundError(msg)
+        with file_lock(self.lock_file):
+            self.catalogue.refresh()
+            previous_file_path = os.path.normpath(previous_file_path)
+            backup_id = self._find_latest_backup(previous_file_path)
+            try:
+                if backup_id is None:
+                    msg = f"No backup found for {previous_file_path}"
+                    raise FileNotFoundError(msg)
+                backup_file_name = self.catalogue.entries[backup_id]["backup_file_name"]
+                with open(previous_file_path, "wb") as f:
+                    f.write(self._read_backup(backup_file_name))
+                self._remove_backup(backup_id)
+            finally:
+                self.catalogue.commit()
+
+    def recover_backups(self, previous_file_paths, max_workers=1):
+        """
+        Recover the most recent backups of several files to their original
+        locations. The backups are looked up in a single pass over the backup
+        context, which is written once after all files are restored.
+
+        Parameters
+        ----------
+        previous_file_paths (list)
+            The paths to the files that were backed up.
+        max_workers (int, optional)
+            The number of files restored in parallel. Default is 1.
+
+        Returns
+        -------
+        dict
+            The error message for each file that could not be recovered, by
+            its path. Empty if all files were recovered.
+        """
+        failures = {}
+        with file_lock(self.lock_file):
+            self.catalogue.refresh()
+            backups = {}
+            for previous_file_path in previous_file_paths:
+                previous_file_path = os.path.normpath(previous_file_path)
+                if previous_file_path in backups:
+                    continue
+                backup_id = self._find_latest_backup(previous_file_path)
+                if backup_id is None:
+                    failures[previous_file_path] = (
+                        f"No backup found for {previous_file_path}"
+                    )
+                    continue
+                backups[previous_file_path] = backup_id
+
+            def restore(previous_file_path):
+                backup_id = backups[previous_file_path]
+                backup_file_name = self.catalogue.entries[backup_id]["backup_file_name"]
+                with open(previous_file_path, "wb") as f:
+                    f.write(self._read_backup(backup_file_name))
+
+            try:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {
+                        previous_file_path: executor.submit(restore, previous_file_path)
+                        for previous_file_path in backups
+                    }
+                for previous_file_path, future in futures.items():
+                    try:
+                        future.result()
+                    except OSError as e:
+                        failures[previous_file_path] = str(e)
+                    else:
+                        self._remove_backup(backups[previous_file_path])
+            finally:
+                self.catalogue.commit()
+        return failures
 
     def recover_last_backup(self):
         """
@@ -183,27 +293,27 @@ class BackupHandler:
             up.
         """
 
-        self.cleanup_storage()
-
-        if not self.context_data == []:
-            backup_file_context = self.context_data[-1]
-            source_file = os.path.join(
-                self.backup_dir, backup_file_context["backup_file_name"]
-            )
-            dest_file = backup_file_context["previous_file_path"]
-            if os.path.exists(source_file):
-                shutil.move(source_file, dest_file)
-                self.cleanup_storage()
+        with file_lock(self.lock_file):
+            self.catalogue.refresh()
+            backup_id = self._find_latest_backup()
+            try:
+                if backup_id is None:
+                    msg = "No backup found"
+                    raise FileNotFoundError(msg)
+                backup_file_context = self.catalogue.entries[backup_id]
+                dest_file = backup_file_context["previous_file_path"]
+                with open(dest_file, "wb") as f:
+                    f.write(self._read_backup(backup_file_context["backup_file_name"]))
+                self._remove_backup(backup_id)
                 return True
-            else:
-                msg = f"Backup file {source_file} not found"
-                raise FileNotFoundError(msg)
-        msg = "No backup found"
-        raise FileNotFoundError(msg)
+            finally:
+                self.catalogue.commit()
 
     def get_backup_path(self, previous_file_path):
         """
-        Get the backup path of a specific file.
+        Get the backup path of a specific file. The content of the most recent
+        backup is decompressed to a readable file next to its blob, which is
+        kept as long as the blob is stored.
 
         Parameters
         ----------
@@ -215,19 +325,22 @@ class BackupHandler:
         str
             The path to the backup file.
         """
-        self.load_context()
-        previous_file_path = os.path.normpath(previous_file_path)
-        reversed_context_data = deepcopy(self.context_data)
-        reversed_context_data.reverse()
-        for backup_file_context in reversed_context_data:
-            source_file_path = backup_file_context["previous_file_path"]
-            if source_file_path == previous_file_path:
-                return os.path.join(
-                    self.backup_dir, backup_file_context["backup_file_name"]
-                )
-        else:
-            msg = f"No backup found for {previous_file_path}"
-            raise FileNotFoundError(msg)
+        with file_lock(self.lock_file):
+            self.catalogue.refresh()
+            previous_file_path = os.path.normpath(previous_file_path)
+            backup_id = self.catalogue.get_latest_backup_id(previous_file_path)
+            if backup_id is None:
+                msg = f"No backup found for {previous_file_path}"
+                raise FileNotFoundError(msg)
+            backup_file_name = self.catalogue.entries[backup_id]["backup_file_name"]
+            view_name = self._get_view_name(backup_file_name)
+            if view_name is None:
+                return os.path.join(self.backup_dir, backup_file_name)
+            view_file = os.path.join(self.backup_dir, view_name)
+            if not os.path.exists(view_file):
+                with open(view_file, "wb") as f:
+                    f.write(self._read_backup(backup_file_name))
+            return view_file
 
     def cleanup_storage(self):
         """
@@ -237,7 +350,7 @@ class BackupHandler:
         This method removes backup files that are no longer associated with any
         records in the backup context. Additionally, if the number of backup
         files exceeds the maximum allowed, it removes the oldest backups to
-        maintain the specified limit.
+        maintain the specified limit. The backup context log is compacted.
 
         Returns
         -------
@@ -245,38 +358,37 @@ class BackupHandler:
             True if the cleanup was successful, False if the cleanup was not
             possible or no action was taken.
         """
-
-        if not os.path.exists(self.context_file):
-            self.clear_storage()
-            return False
-
-        self.load_context()
-        stored_files = set(os.listdir(self.backup_dir))
-        mentioned_files = set(entry["backup_file_name"] for entry in self.context_data)
-        files_to_remove = (
-            stored_files - mentioned_files - set([BackupHandler.CONTEXT_FILE_NAME])
-        )
-
-        for file_to_remove in files_to_remove:
-            file_path = os.path.join(self.backup_dir, file_to_remove)
-            os.remove(file_path)
-
-        self.context_data = [
-            entry
-            for entry in self.context_data
-            if entry["backup_file_name"] in stored_files
-        ]
-
-        while len(self.context_data) > self.max_backups:
-            oldest_backup = self.context_data.pop(0)
-            oldest_backup_file = os.path.join(
-                self.backup_dir, oldest_backup["backup_file_name"]
+        with file_lock(self.lock_file):
+            if not os.path.exists(self.context_file):
+                self.clear_storage()
+                self.catalogue.refresh()
+                return False
+
+            self.catalogue.refresh()
+            stored_files = set(os.listdir(self.backup_dir))
+            mentioned_files = self.catalogue.get_backup_file_names()
+            view_files = set(
+                self._get_view_name(file_name)
+                for file_name in mentioned_files & stored_files
             )
-            os.remove(oldest_backup_file)
+            files_to_remove = (
+                stored_files
+                - mentioned_files
+                - view_files
+                - set([BackupHandler.CONTEXT_FILE_NAME])
+            )
+
+            for file_to_remove in files_to_remove:
+                file_path = os.path.join(self.backup_dir, file_to_remove)
+                os.remove(file_path)
 
-        self.save_context()
+            for backup_id, entry in list(self.catalogue.entries.items()):
+                if entry["backup_file_name"] not in stored_files:
+                    self.catalogue.remove(backup_id)
+            self._remove_oldest_backups()
+            self.catalogue.compact()
 
-        return True
+            return True
 
     def clear_storage(self):
         """
@@ -302,15 +414,14 @@ class BackupHandler:
             comment).
         """
 
-        if file_extension:
-            filtered_context = [
-                entry
-                for entry in self.context_data
-                if entry["previous_file_path"].endswith(file_extension)
-            ]
-        else:
-            self.load_context()
-            filtered_context = self.context_data
+        with file_lock(self.lock_file):
+            self.catalogue.refresh()
+        filtered_context = [
+            entry
+            for entry in self.context_data
+            if not file_extension
+            or entry["previous_file_path"].endswith(file_extension)
+        ]
         return [
             (entry["previous_file_path"], entry["backup_file_name"], entry["comment"])
             for entry in filtered_context
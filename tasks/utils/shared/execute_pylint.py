@@ -1,6 +1,13 @@
+import json
 import os
 import subprocess
 import sys
+import tempfile
+
+# Run in the runner environment, which provides pylint.
+PYLINT_BATCH_RUNNER_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "pylint_batch_runner.py"
+)
 
 
 def execute_pylint(python_file_path, environment_path):
@@ -34,3 +41,88 @@ def execute_pylint(python_file_path, environment_path):
         return result.stdout
     except Exception as e:
         print(f"Failed to run pylint on {python_file_path}: {e}", file=sys.stderr)
+
+
+def _format_pylint_output(result):
+    lines = []
+    if result["module"] is not None and result["messages"]:
+        lines.append(f"************* Module {result['module']}")
+    for message in result["messages"]:
+        lines.append(
+            f"{message['path']}:{message['line']}:{message['column']}: "
+            f"{message['msg_id']}: {message['msg']} ({message['symbol']})"
+        )
+    lines.append("")
+    if result["score"] is not None:
+        rating = f"Your code has been rated at {result['score']:.2f}/10"
+        lines.extend(["-" * len(rating), rating, ""])
+    return "\n".join(lines) + "\n"
+
+
+def execute_pylint_batch(python_file_paths, environment_path, jobs=0, chunk_size=None):
+    """
+    Runs pylint on many Python files with one pylint run per chunk of files
+    and splits the results per file. The output for each file has the format
+    of the output of execute_pylint.
+
+    Parameters
+    ----------
+    python_file_paths (list)
+        The paths to the Python files to lint.
+    environment_path (str)
+        The path to the Python environment to use.
+    jobs (int)
+        The number of parallel pylint processes per run, 0 for the number of
+        CPUs.
+    chunk_size (int, optional)
+        The maximum number of files per pylint run. If None, all files are
+        linted in a single run.
+
+    Returns
+    -------
+    dict
+        The pylint output keyed by file path. Files of failed runs are
+        missing.
+    """
+    if sys.platform == "win32" or sys.platform == "win64":
+        python_path = os.path.join(environment_path, "Scripts", "python")
+    else:
+        python_path = os.path.join(environment_path, "bin", "python")
+    python_file_paths = list(python_file_paths)
+    chunk_size = chunk_size or max(len(python_file_paths), 1)
+
+    outputs = {}
+    for start in range(0, len(python_file_paths), chunk_size):
+        chunk = python_file_paths[start : start + chunk_size]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            files_list_path = os.path.join(temp_dir, "files.txt")
+            output_json_path = os.path.join(temp_dir, "results.json")
+            with open(files_list_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(chunk))
+            try:
+                result = subprocess.run(
+                    [
+                        python_path,
+                        PYLINT_BATCH_RUNNER_PATH,
+                        files_list_path,
+                        str(jobs),
+                        output_json_path,
+                    ],
+                    capture_output=True,
+                    text=True,
+                )
+                if result.stderr:
+                    print("Errors encountered during pylint run:", file=sys.stderr)
+                    print(result.stderr, file=sys.stderr)
+                with open(output_json_path, "r", encoding="utf-8") as f:
+                    results = json.load(f)
+            except Exception as e:
+                print(
+                    f"Failed to run pylint on {len(chunk)} files: {e}", file=sys.stderr
+                )
+                continue
+        for file in chunk:
+            file_result = results.get(os.path.abspath(file))
+            if file_result is not None:
+                outputs[file] = _format_pylint_output(file_result)
+    return outputs
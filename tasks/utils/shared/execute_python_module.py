@@ -1,9 +1,163 @@
+import atexit
+import json
 import os
 import sys
 import shutil
 import subprocess
+import tempfile
+import threading
 
-def execute_python_module(module, env_python_path, cwd=None, temp_script_path=None, args=None):
+from tasks.configs.defaults import PYTHON_MODULE_WORKER_MAX_JOBS_DEFAULT
+import tasks.utils.shared.python_module_worker as python_module_worker
+
+_IDLE_WORKERS = {}
+_IDLE_WORKERS_LOCK = threading.Lock()
+
+
+def _get_python_path(env_python_path):
+    if sys.platform == "win32" or sys.platform == "win64":
+        return os.path.join(env_python_path, "Scripts", "python")
+    return os.path.join(env_python_path, "bin", "python")
+
+
+class PythonModuleWorker:
+    """
+    Long-lived Python process in a runner environment that runs modules sent
+    over a pipe, so the interpreter is started and the runner dependencies are
+    imported once for many modules. The worker is recycled after max_jobs
+    modules.
+
+    Parameters
+    ----------
+    env_python_path (str)
+        The path to the runner Python environment.
+    max_jobs (int)
+        The number of modules run before the worker is recycled.
+    """
+
+    def __init__(self, env_python_path, max_jobs=PYTHON_MODULE_WORKER_MAX_JOBS_DEFAULT):
+        self.max_jobs = max_jobs
+        self.jobs = 0
+        self.process = subprocess.Popen(
+            [_get_python_path(env_python_path), "-u", python_module_worker.__file__],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+        )
+
+    def run(self, module, cwd=None, args=None):
+        """
+        Runs a module in the worker process.
+
+        Parameters
+        ----------
+        module (str)
+            The path to the module.
+        cwd (str)
+            The working directory of the module. Default is None.
+        args (list)
+            The command line arguments of the module. Default is None.
+
+        Returns
+        -------
+        tuple
+            The exit code, the standard output and the error output of the
+            module. If the worker crashed, the exit code is the one of the
+            worker process.
+        """
+        self.jobs += 1
+        with tempfile.TemporaryDirectory() as temp_dir:
+            stdout_path = os.path.join(temp_dir, "stdout")
+            stderr_path = os.path.join(temp_dir, "stderr")
+            request = {
+                "module": module,
+                "args": list(args or []),
+                "cwd": cwd,
+                "stdout_path": stdout_path,
+                "stderr_path": stderr_path,
+            }
+            try:
+                self.process.stdin.write(json.dumps(request) + "\n")
+                self.process.stdin.flush()
+                response = self.process.stdout.readline()
+            except (BrokenPipeError, OSError):
+                response = ""
+            if response:
+                returncode = json.loads(response)["returncode"]
+            else:
+                self.close()
+                returncode = self.process.returncode
+            outputs = []
+            for path in (stdout_path, stderr_path):
+                if os.path.exists(path):
+                    with open(path, "r", encoding="utf-8", errors="replace") as file:
+                        outputs.append(file.read())
+                else:
+                    outputs.append("")
+        return returncode, *outputs
+
+    def is_alive(self):
+        return self.process.poll() is None
+
+    def is_exhausted(self):
+        return self.jobs >= self.max_jobs
+
+    def close(self):
+        """
+        Terminates the worker process.
+        """
+        if self.is_alive():
+            self.process.stdin.close()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+
+
+def _acquire_worker(env_python_path):
+    with _IDLE_WORKERS_LOCK:
+        idle_workers = _IDLE_WORKERS.setdefault(env_python_path, [])
+        while idle_workers:
+            worker = idle_workers.pop()
+            if worker.is_alive():
+                return worker
+    return PythonModuleWorker(env_python_path)
+
+
+def _release_worker(env_python_path, worker):
+    if worker.is_alive() and not worker.is_exhausted():
+        with _IDLE_WORKERS_LOCK:
+            _IDLE_WORKERS.setdefault(env_python_path, []).append(worker)
+    else:
+        worker.close()
+
+
+@atexit.register
+def close_python_module_workers():
+    """
+    Terminates all idle Python module workers.
+    """
+    with _IDLE_WORKERS_LOCK:
+        for idle_workers in _IDLE_WORKERS.values():
+            for worker in idle_workers:
+                worker.close()
+        _IDLE_WORKERS.clear()
+
+
+def _run_in_worker(module, env_python_path, cwd, args):
+    worker = _acquire_worker(env_python_path)
+    try:
+        return worker.run(module, cwd=cwd, args=args)
+    finally:
+        _release_worker(env_python_path, worker)
+
+
+def execute_python_module(
+    module, env_python_path, cwd=None, temp_script_path=None, args=None, use_worker=False
+):
     """
     Executes a specified Python module using a designated Python interpreter
     from a virtual environment, potentially in a different working directory or
@@ -26,6 +180,10 @@ def execute_python_module(module, env_python_path, cwd=None, temp_script_path=No
         located in a different workspace. Default is None.
     args (list)
         The list of arguments to pass to the script. Default is None.
+    use_worker (bool)
+        Whether to run the script in a warm worker process of the environment
+        instead of a fresh interpreter. The output is the same. Default is
+        False.
 
     Returns
     -------
@@ -35,21 +193,28 @@ def execute_python_module(module, env_python_path, cwd=None, temp_script_path=No
     """
     if hasattr(module, "__file__"):
         module = module.__file__
-    
+
     if temp_script_path:
         shutil.copy(module, temp_script_path)
         module = temp_script_path
-        
-    if sys.platform == "win32" or sys.platform == "win64":
-        python_path = os.path.join(env_python_path, "Scripts", "python")
-    else:
-        python_path = os.path.join(env_python_path, "bin", "python")
+
+    python_path = _get_python_path(env_python_path)
 
     try:
         command = [python_path, "-u", module]
         if args:
             command.extend(args)
-        
+
+        if use_worker:
+            returncode, stdout, stderr = _run_in_worker(
+                module, env_python_path, cwd, args
+            )
+            if returncode != 0:
+                raise subprocess.CalledProcessError(
+                    returncode, command, output=stdout, stderr=stderr
+                )
+            return stdout
+
         env = os.environ.copy()
         if cwd:
             env['PYTHONPATH'] = cwd + os.pathsep + env.get('PYTHONPATH', '')
@@ -62,7 +227,7 @@ def execute_python_module(module, env_python_path, cwd=None, temp_script_path=No
             check=True,
             env=env
         )
-        
+
         return completed_process.stdout
     except subprocess.CalledProcessError as e:
         return (
@@ -0,0 +1,354 @@
+import json
+import os
+
+from tasks.utils.shared.ignore_patterns import IgnorePatterns
+from tasks.utils.shared.path_helpers import standardize_path
+
+INDEX_FILE_NAME = "file_index.json"
+
+_FILE_INDEXES = {}
+
+
+class _SuffixTrie:
+    """
+    Trie over reversed relative path components. Each node maps a component
+    to its child node and holds the paths whose relative components are
+    exhausted at that node.
+    """
+
+    __slots__ = ("children", "ends")
+
+    def __init__(self):
+        self.children = {}
+        self.ends = []
+
+    def insert(self, rel_components, path):
+        node = self
+        for component in reversed(rel_components):
+            child = node.children.get(component)
+            if child is None:
+                child = node.children[component] = _SuffixTrie()
+            node = child
+        node.ends.append(path)
+
+    def collect(self):
+        paths = []
+        pending = [self]
+        while pending:
+            node = pending.pop()
+            paths.extend(node.ends)
+            pending.extend(node.children.values())
+        return paths
+
+    def find_suffix(self, fragment):
+        """
+        Returns all paths ending with the fragment. All fragment components
+        but the leftmost must match whole path components; the leftmost one
+        may match the end of a component.
+        """
+        components = fragment.split(os.sep)
+        node = self
+        matches = []
+        # Components that are not matched by the trie belong to the root
+        # directory, thus paths exhausted along the way are checked directly.
+        for component in reversed(components[1:]):
+            matches.extend(path for path in node.ends if path.endswith(fragment))
+            node = node.children.get(component)
+            if node is None:
+                return matches
+        first = components[0]
+        if not first:
+            return matches + node.collect()
+        matches.extend(path for path in node.ends if path.endswith(fragment))
+        for name, child in node.children.items():
+            if name.endswith(first):
+                matches.extend(child.collect())
+        return matches
+
+
+class FileIndex:
+    """
+    Persistent index of the files and directories below a root directory.
+
+    The index stores, for every directory, its modification time together
+    with the names of its subdirectories and files. On refresh only the
+    directories whose modification time changed are listed again, so lookups
+    by name or path suffix do not need to walk the whole tree.
+
+    Parameters
+    ----------
+    root_dir (str)
+        The root directory to index.
+    index_dir (str, optional)
+        The directory where the index is persisted. If None, the index is only
+        kept in memory.
+    ignore_patterns (list, optional)
+        Gitignore-style patterns of files and directories excluded from the
+        index.
+    """
+
+    def __init__(self, root_dir, index_dir=None, ignore_patterns=None):
+        self.root_dir = standardize_path(root_dir)
+        self.index_path = (
+            os.path.join(index_dir, INDEX_FILE_NAME) if index_dir else None
+        )
+        self.ignore_patterns = IgnorePatterns(ignore_patterns, self.root_dir)
+        self._dirs = {}
+        self._files_by_name = None
+        self._dirs_by_name = None
+        self._files_trie = None
+        self._dirs_trie = None
+        self._load()
+
+    def _load(self):
+        if not self.index_path or not os.path.isfile(self.index_path):
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if (
+            data.get("root") == self.root_dir
+            and data.get("ignore_patterns") == self.ignore_patterns.patterns
+        ):
+            self._dirs = data.get("dirs", {})
+
+    def save(self):
+        """
+        Saves the index to the index directory, if one was given.
+        """
+        if not self.index_path:
+            return
+        os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+        temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "root": self.root_dir,
+                    "ignore_patterns": self.ignore_patterns.patterns,
+                    "dirs": self._dirs,
+                },
+                f,
+            )
+        os.replace(temp_path, self.index_path)
+
+    def _abs_path(self, rel_path):
+        if not rel_path:
+            return self.root_dir
+        return os.path.join(self.root_dir, rel_path)
+
+    def _scan_dir(self, rel_dir):
+        subdirs, files = [], []
+        try:
+            with os.scandir(self._abs_path(rel_dir)) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    rel_path = os.path.join(rel_dir, entry.name)
+                    if self.ignore_patterns.match(rel_path, is_dir):
+                        continue
+                    if not is_dir:
+                        files.append(entry.name)
+                    # Symlinked directories are not followed, as in os.walk
+                    elif not entry.is_symlink():
+                        subdirs.append(entry.name)
+        except OSError:
+            pass
+        return sorted(subdirs), sorted(files)
+
+    def refresh(self):
+        """
+        Brings the index up to date. Only directories whose modification time
+        changed since the last refresh are listed again.
+
+        Returns
+        -------
+        bool
+            True if the index changed, False otherwise.
+        """
+        old_dirs = self._dirs
+        new_dirs = {}
+        changed = False
+        pending = [""]
+        while pending:
+            rel_dir = pending.pop()
+            dir_path = self._abs_path(rel_dir)
+            try:
+                mtime = os.stat(dir_path).st_mtime_ns
+            except OSError:
+                changed = True
+                continue
+            entry = old_dirs.get(rel_dir)
+            if entry is None or entry[0] != mtime:
+                subdirs, files = self._scan_dir(rel_dir)
+                entry = [mtime, subdirs, files]
+                changed = True
+            new_dirs[rel_dir] = entry
+            pending.extend(os.path.join(rel_dir, name) for name in entry[1])
+        if changed or len(new_dirs) != len(old_dirs):
+            self._dirs = new_dirs
+            self._files_by_name = None
+            self._dirs_by_name = None
+            self._files_trie = None
+            self._dirs_trie = None
+            self.save()
+            return True
+        return False
+
+    def _build_name_maps(self):
+        files_by_name = {}
+        dirs_by_name = {}
+        for rel_dir, (_, _, files) in self._dirs.items():
+            dir_path = self._abs_path(rel_dir)
+            dirs_by_name.setdefault(os.path.basename(dir_path), []).append(dir_path)
+            for name in files:
+                files_by_name.setdefault(name, []).append(
+                    os.path.join(dir_path, name)
+                )
+        self._files_by_name = files_by_name
+        self._dirs_by_name = dirs_by_name
+
+    def _build_tries(self):
+        files_trie = _SuffixTrie()
+        dirs_trie = _SuffixTrie()
+        for rel_dir, (_, _, files) in self._dirs.items():
+            dir_path = self._abs_path(rel_dir)
+            rel_components = rel_dir.split(os.sep) if rel_dir else []
+            dirs_trie.insert(rel_components, dir_path)
+            for name in files:
+                files_trie.insert(
+                    rel_components + [name], os.path.join(dir_path, name)
+                )
+        self._files_trie = files_trie
+        self._dirs_trie = dirs_trie
+
+    def files_named(self, name):
+        """
+        Returns the paths of all indexed files with the given name.
+
+        Parameters
+        ----------
+        name (str)
+            The file name to look up.
+
+        Returns
+        -------
+        list
+            The absolute paths of the matching files.
+        """
+        if self._files_by_name is None:
+            self._build_name_maps()
+        return list(self._files_by_name.get(name, []))
+
+    def dirs_named(self, name):
+        """
+        Returns the paths of all indexed directories with the given name.
+
+        Parameters
+        ----------
+        name (str)
+            The directory name to look up.
+
+        Returns
+        -------
+        list
+            The absolute paths of the matching directories.
+        """
+        if self._dirs_by_name is None:
+            self._build_name_maps()
+        return list(self._dirs_by_name.get(name, []))
+
+    def files_ending_with(self, fragment):
+        """
+        Returns the paths of all indexed files ending with the given fragment.
+
+        Parameters
+        ----------
+        fragment (str)
+            The path fragment to look up.
+
+        Returns
+        -------
+        list
+            The absolute paths of the matching files.
+        """
+        if self._files_trie is None:
+            self._build_tries()
+        return self._files_trie.find_suffix(fragment)
+
+    def dirs_ending_with(self, fragment):
+        """
+        Returns the paths of all indexed directories ending with the given
+        fragment.
+
+        Parameters
+        ----------
+        fragment (str)
+            The path fragment to look up.
+
+        Returns
+        -------
+        list
+            The absolute paths of the matching directories.
+        """
+        if self._dirs_trie is None:
+            self._build_tries()
+        return self._dirs_trie.find_suffix(fragment)
+
+    def lookup(self, method, query):
+        """
+        Looks up a query with one of the lookup methods. If nothing is found or
+        one of the found paths vanished, the index is refreshed and the lookup
+        repeated.
+
+        Parameters
+        ----------
+        method (str)
+            The name of the lookup method, e.g. "files_named".
+        query (str)
+            The name or fragment to look up.
+
+        Returns
+        -------
+        list
+            The absolute paths found.
+        """
+        paths = getattr(self, method)(query)
+        if not paths or not all(os.path.lexists(path) for path in paths):
+            if self.refresh():
+                paths = getattr(self, method)(query)
+        return paths
+
+
+def get_file_index(root_dir, index_dir=None, ignore_patterns=None):
+    """
+    Returns the file index for the root directory. The index is created and
+    refreshed once per process and reused by subsequent calls. An index
+    inherited from a forked parent process is refreshed once in the child.
+
+    Parameters
+    ----------
+    root_dir (str)
+        The root directory to index.
+    index_dir (str, optional)
+        The directory where the index is persisted.
+    ignore_patterns (list, optional)
+        Gitignore-style patterns of files and directories excluded from the
+        index.
+
+    Returns
+    -------
+    FileIndex
+        The file index of the root directory.
+    """
+    key = (standardize_path(root_dir), index_dir, tuple(ignore_patterns or ()))
+    file_index, pid = _FILE_INDEXES.get(key, (None, None))
+    if file_index is None:
+        file_index = FileIndex(root_dir, index_dir, ignore_patterns)
+    if pid != os.getpid():
+        file_index.refresh()
+        _FILE_INDEXES[key] = (file_index, os.getpid())
+    return file_index
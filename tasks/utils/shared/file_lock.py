@@ -0,0 +1,35 @@
+from contextlib import contextmanager
+import os
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+@contextmanager
+def file_lock(lock_path):
+    """
+    Context manager that holds an exclusive lock on a lock file, serializing
+    the enclosed code between processes. The lock file is created if it does
+    not exist and is left in place.
+
+    Parameters
+    ----------
+    lock_path (str)
+        The path to the lock file.
+    """
+    with open(lock_path, "a+", encoding="utf-8") as lock_file:
+        if os.name == "nt":
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
@@ -1,5 +1,7 @@
 import os
 
+from tasks.utils.shared.file_index import get_file_index
+from tasks.utils.shared.ignore_patterns import walk_with_ignore_patterns
 from tasks.utils.shared.path_helpers import (
     standardize_path,
     sanitize_partial_path,
@@ -8,16 +10,24 @@ from tasks.utils.shared.path_helpers import (
 )
 
 
-def _find_closest_dir_from_name(name, root_dir, reference_dir):
+def _find_closest_dir_from_name(
+    name, root_dir, reference_dir, index_dir=None, ignore_patterns=None
+):
     if name == ".":
         return standardize_path(name)
 
     # Step 1: Collect all matching paths
-    matching_dirs = [
-        standardize_path(os.path.join(root_dir, d))
-        for d, _, _ in os.walk(root_dir)
-        if os.path.basename(d) == name
-    ]
+    if index_dir:
+        file_index = get_file_index(root_dir, index_dir, ignore_patterns)
+        matching_dirs = [
+            standardize_path(d) for d in file_index.lookup("dirs_named", name)
+        ]
+    else:
+        matching_dirs = [
+            standardize_path(os.path.join(root_dir, d))
+            for d, _, _ in walk_with_ignore_patterns(root_dir, ignore_patterns)
+            if os.path.basename(d) == name
+        ]
     if not matching_dirs:
         msg = f"No directory named '{name}' found under '{root_dir}'"
         raise NotADirectoryError(msg)
@@ -29,13 +39,22 @@ def _find_closest_dir_from_name(name, root_dir, reference_dir):
 
 
 
-def _find_closest_matching_dir_from_fragment(fragment, root_dir, reference_dir):
+def _find_closest_matching_dir_from_fragment(
+    fragment, root_dir, reference_dir, index_dir=None, ignore_patterns=None
+):
     # Step 1: Collect all matching paths
-    matching_dirs = [
-        standardize_path(os.path.join(root_dir, dirpath))
-        for dirpath, _, _ in os.walk(root_dir)
-        if dirpath.endswith(fragment)
-    ]
+    if index_dir:
+        file_index = get_file_index(root_dir, index_dir, ignore_patterns)
+        matching_dirs = [
+            standardize_path(d)
+            for d in file_index.lookup("dirs_ending_with", fragment)
+        ]
+    else:
+        matching_dirs = [
+            standardize_path(os.path.join(root_dir, dirpath))
+            for dirpath, _, _ in walk_with_ignore_patterns(root_dir, ignore_patterns)
+            if dirpath.endswith(fragment)
+        ]
     if not matching_dirs:
         msg = f"No directory ending with '{fragment}' found under '{root_dir}'"
         raise NotADirectoryError(msg)
@@ -47,7 +66,9 @@ def _find_closest_matching_dir_from_fragment(fragment, root_dir, reference_dir):
     return get_closest_path_from_list(matching_dirs, reference_dir)
 
 
-def find_closest_matching_dir(partial_path, root_dir, reference_dir):
+def find_closest_matching_dir(
+    partial_path, root_dir, reference_dir, index_dir=None, ignore_patterns=None
+):
     """
     Function to find the closest matching directory from a partial or
     incomplete path string. The function searches within the root directory and
@@ -66,6 +87,12 @@ def find_closest_matching_dir(partial_path, root_dir, reference_dir):
     reference_dir (str)
         The path to the reference directory, used to determine proximity when
         finding the nearest directory.
+    index_dir (str, optional)
+        Directory of the persistent file index. If given, the lookup uses the
+        index instead of walking the root directory.
+    ignore_patterns (list, optional)
+        Gitignore-style patterns of files and directories, relative to the
+        root directory, that are not searched.
 
     Returns
     -------
@@ -86,8 +113,10 @@ def find_closest_matching_dir(partial_path, root_dir, reference_dir):
             dir_ = partial_path
         else:
             dir_ = _find_closest_matching_dir_from_fragment(
-                partial_path, root_dir, reference_dir
+                partial_path, root_dir, reference_dir, index_dir, ignore_patterns
             )
     else:
-        dir_ = _find_closest_dir_from_name(partial_path, root_dir, reference_dir)
+        dir_ = _find_closest_dir_from_name(
+            partial_path, root_dir, reference_dir, index_dir, ignore_patterns
+        )
     return standardize_path(dir_)
@@ -1,6 +1,8 @@
 import os
 
 from tasks.configs.constants import CURRENT_FILE_TAG
+from tasks.utils.shared.file_index import get_file_index
+from tasks.utils.shared.ignore_patterns import walk_with_ignore_patterns
 from tasks.utils.shared.path_helpers import (
     sanitize_partial_path,
     standardize_path,
@@ -8,11 +10,19 @@ from tasks.utils.shared.path_helpers import (
     PathNotFoundError,
 )
 
-def _find_closest_file_from_name(file_name, root_dir, reference_path):
+def _find_closest_file_from_name(
+    file_name, root_dir, reference_path, index_dir=None, ignore_patterns=None
+):
     matching_files = []
-    for dirpath, _, filenames in os.walk(root_dir):
-        if file_name in filenames:
-            matching_files.append(os.path.join(dirpath, file_name))
+    if index_dir:
+        file_index = get_file_index(root_dir, index_dir, ignore_patterns)
+        matching_files = file_index.lookup("files_named", file_name)
+    else:
+        for dirpath, _, filenames in walk_with_ignore_patterns(
+            root_dir, ignore_patterns
+        ):
+            if file_name in filenames:
+                matching_files.append(os.path.join(dirpath, file_name))
 
     if not matching_files:
         raise FileNotFoundError(f"No file named '{file_name}' found under '{root_dir}'")
@@ -22,13 +32,21 @@ def _find_closest_file_from_name(file_name, root_dir, reference_path):
 
     return get_closest_path_from_list([standardize_path(p) for p in matching_files], reference_path)
     
-def _find_closest_file_from_fragment(fragment, root_dir, reference_path):
+def _find_closest_file_from_fragment(
+    fragment, root_dir, reference_path, index_dir=None, ignore_patterns=None
+):
     matching_files = []
-    for dirpath, _, filenames in os.walk(root_dir):
-        for filename in filenames:
-            full_path = os.path.join(dirpath, filename)
-            if full_path.endswith(fragment):
-                matching_files.append(full_path)
+    if index_dir:
+        file_index = get_file_index(root_dir, index_dir, ignore_patterns)
+        matching_files = file_index.lookup("files_ending_with", fragment)
+    else:
+        for dirpath, _, filenames in walk_with_ignore_patterns(
+            root_dir, ignore_patterns
+        ):
+            for filename in filenames:
+                full_path = os.path.join(dirpath, filename)
+                if full_path.endswith(fragment):
+                    matching_files.append(full_path)
 
     if not matching_files:
         raise FileNotFoundError(f"No file ending with '{fragment}' found under '{root_dir}'")
@@ -38,7 +56,9 @@ def _find_closest_file_from_fragment(fragment, root_dir, reference_path):
 
     return get_closest_path_from_list([standardize_path(p) for p in matching_files], reference_path)
 
-def find_closest_matching_file(sloppy_string, root_dir, reference_file_path):
+def find_closest_matching_file(
+    sloppy_string, root_dir, reference_file_path, index_dir=None, ignore_patterns=None
+):
     """
     Finds the closest matching file from a partial or incomplete string.
 
@@ -50,6 +70,12 @@ def find_closest_matching_file(sloppy_string, root_dir, reference_file_path):
         The root directory under which to search.
     reference_file_path : str
         Path used to determine proximity when resolving ambiguous matches.
+    index_dir : str, optional
+        Directory of the persistent file index. If given, the lookup uses the
+        index instead of walking the root directory.
+    ignore_patterns : list, optional
+        Gitignore-style patterns of files and directories, relative to the
+        root directory, that are not searched.
 
     Returns
     -------
@@ -73,6 +99,10 @@ def find_closest_matching_file(sloppy_string, root_dir, reference_file_path):
                 sloppy_string = base + "_test" + ext
 
     if os.sep in sloppy_string:
-        return _find_closest_file_from_fragment(sloppy_string, root_dir, reference_file_path)
+        return _find_closest_file_from_fragment(
+            sloppy_string, root_dir, reference_file_path, index_dir, ignore_patterns
+        )
     else:
-        return _find_closest_file_from_name(sloppy_string, root_dir, reference_file_path)
+        return _find_closest_file_from_name(
+            sloppy_string, root_dir, reference_file_path, index_dir, ignore_patterns
+        )
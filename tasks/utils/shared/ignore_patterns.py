@@ -0,0 +1,200 @@
+import os
+import re
+
+from tasks.utils.shared.path_helpers import standardize_path
+
+
+def _translate_glob(pattern):
+    regex = ""
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            regex += "(?:.*/)?"
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            regex += ".*"
+            i += 2
+            continue
+        if char == "*":
+            regex += "[^/]*"
+        elif char == "?":
+            regex += "[^/]"
+        elif char == "[" and "]" in pattern[i + 1 :]:
+            end = pattern.index("]", i + 1)
+            content = pattern[i + 1 : end].replace("\\", "\\\\")
+            if content.startswith("!"):
+                content = "^" + content[1:]
+            regex += f"[{content}]"
+            i = end
+        else:
+            regex += re.escape(char)
+        i += 1
+    return re.compile(regex)
+
+
+def _compile_pattern(pattern):
+    pattern = pattern.strip()
+    if not pattern or pattern.startswith("#"):
+        return None
+    negated = pattern.startswith("!")
+    if negated:
+        pattern = pattern[1:]
+    dir_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+    # As in gitignore, a slash at the beginning or in the middle anchors the
+    # pattern to the root directory, otherwise it matches names at any level.
+    anchored = "/" in pattern
+    pattern = pattern.lstrip("/")
+    if not pattern:
+        return None
+    return _translate_glob(pattern), anchored, dir_only, negated
+
+
+class IgnorePatterns:
+    """
+    Matcher for gitignore-style patterns used to prune directory walks.
+
+    Supported syntax:
+        - Patterns without a slash match file or directory names at any level.
+        - Patterns with a leading or inner slash are anchored to the root
+          directory.
+        - A trailing slash restricts the pattern to directories.
+        - "*", "?" and "[...]" match within a path component and "**" matches
+          across components.
+        - A leading "!" re-includes paths excluded by a previous pattern.
+        - Empty lines and lines starting with "#" are ignored.
+
+    Parameters
+    ----------
+    patterns (list)
+        The ignore patterns.
+    root_dir (str)
+        The directory anchored patterns are relative to.
+    """
+
+    def __init__(self, patterns, root_dir):
+        self.patterns = list(patterns or [])
+        self.root_dir = standardize_path(root_dir)
+        self._rules = [
+            rule for rule in map(_compile_pattern, self.patterns) if rule is not None
+        ]
+
+    def match(self, rel_path, is_dir=False):
+        """
+        Checks whether a path relative to the root directory is ignored.
+
+        Parameters
+        ----------
+        rel_path (str)
+            The path relative to the root directory.
+        is_dir (bool)
+            Whether the path is a directory.
+
+        Returns
+        -------
+        bool
+            True if the path is ignored, False otherwise.
+        """
+        rel_path = rel_path.replace(os.sep, "/")
+        name = rel_path.rsplit("/", 1)[-1]
+        ignored = False
+        for regex, anchored, dir_only, negated in self._rules:
+            if ignored != negated or (dir_only and not is_dir):
+                continue
+            if regex.fullmatch(rel_path if anchored else name):
+                ignored = not negated
+        return ignored
+
+    def is_ignored(self, path, is_dir=None):
+        """
+        Checks whether a path is ignored.
+
+        Parameters
+        ----------
+        path (str)
+            The path to check.
+        is_dir (bool, optional)
+            Whether the path is a directory. If None, it is determined from
+            the file system.
+
+        Returns
+        -------
+        bool
+            True if the path is ignored, False otherwise.
+        """
+        path = standardize_path(path)
+        if path == self.root_dir:
+            return False
+        if is_dir is None:
+            is_dir = os.path.isdir(path)
+        return self.match(os.path.relpath(path, self.root_dir), is_dir)
+
+    def prune(self, dirpath, dirnames):
+        """
+        Removes ignored directories from dirnames in place, so os.walk does
+        not descend into them.
+
+        Parameters
+        ----------
+        dirpath (str)
+            The directory containing the subdirectories.
+        dirnames (list)
+            The subdirectory names as yielded by os.walk.
+        """
+        dirnames[:] = [
+            name
+            for name in dirnames
+            if not self.is_ignored(os.path.join(dirpath, name), is_dir=True)
+        ]
+
+    def filter_files(self, dirpath, filenames):
+        """
+        Returns the file names that are not ignored.
+
+        Parameters
+        ----------
+        dirpath (str)
+            The directory containing the files.
+        filenames (list)
+            The file names as yielded by os.walk.
+
+        Returns
+        -------
+        list
+            The file names that are not ignored.
+        """
+        return [
+            name
+            for name in filenames
+            if not self.is_ignored(os.path.join(dirpath, name), is_dir=False)
+        ]
+
+
+def walk_with_ignore_patterns(top, ignore_patterns=None, root_dir=None):
+    """
+    Walks a directory like os.walk, pruning directories and files matching the
+    ignore patterns.
+
+    Parameters
+    ----------
+    top (str)
+        The directory to walk.
+    ignore_patterns (list or IgnorePatterns, optional)
+        The ignore patterns. If None, nothing is ignored.
+    root_dir (str, optional)
+        The directory anchored patterns are relative to. Defaults to top.
+
+    Yields
+    ------
+    tuple
+        The dirpath, dirnames and filenames as in os.walk.
+    """
+    if ignore_patterns is not None and not isinstance(ignore_patterns, IgnorePatterns):
+        ignore_patterns = IgnorePatterns(ignore_patterns, root_dir or top)
+    for dirpath, dirnames, filenames in os.walk(top):
+        if ignore_patterns is not None:
+            ignore_patterns.prune(dirpath, dirnames)
+            filenames = ignore_patterns.filter_files(dirpath, filenames)
+        yield dirpath, dirnames, filenames
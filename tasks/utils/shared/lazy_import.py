@@ -0,0 +1,52 @@
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """
+    Stands in for a module that is imported on first attribute access. Used
+    for optional, heavy dependencies only some code paths of a task need, so
+    tasks not taking these paths start without loading them.
+
+    Parameters
+    ----------
+    name (str)
+        The absolute name of the module.
+    """
+
+    def _load(self):
+        module = sys.modules.get(self.__name__)
+        if module is None or module is self:
+            module = importlib.import_module(self.__name__)
+        return module
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        return f"<lazy module '{self.__name__}'>"
+
+
+def lazy_import(name):
+    """
+    Returns a module that is imported on first attribute access. If the module
+    is imported already, it is returned directly.
+
+    Parameters
+    ----------
+    name (str)
+        The absolute name of the module, e.g. 'rich.console'.
+
+    Returns
+    -------
+    module
+        The module or a LazyModule standing in for it.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    return LazyModule(name)
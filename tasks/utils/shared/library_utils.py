@@ -1,7 +1,43 @@
+import glob
 import os
 import subprocess
 
 
+def get_environment_package_version(environment_path, package_name):
+    """
+    Returns the version of a package installed in a Python environment, read
+    from its package metadata without starting the environment's interpreter.
+
+    Parameters
+    ----------
+    environment_path (str)
+        The path to the Python environment.
+    package_name (str)
+        The name of the package.
+
+    Returns
+    -------
+    str or None
+        The package version, or None if the package is not installed.
+    """
+    distribution_name = package_name.replace("-", "_")
+    patterns = [
+        os.path.join(environment_path, "lib", "python*", "site-packages"),
+        os.path.join(environment_path, "Lib", "site-packages"),
+    ]
+    for pattern in patterns:
+        for site_packages in glob.glob(pattern):
+            dist_infos = glob.glob(
+                os.path.join(site_packages, f"{distribution_name}-*.dist-info")
+            )
+            for dist_info in dist_infos:
+                name = os.path.basename(dist_info)[: -len(".dist-info")]
+                version = name[len(distribution_name) + 1 :]
+                if "-" not in version:
+                    return version
+    return None
+
+
 def is_library_installed(req, venv_path):
     """
     Check if the 'black' library is installed in the specified virtual
@@ -0,0 +1,136 @@
+import glob
+import hashlib
+import json
+import os
+
+from tasks.configs.constants import TASKS_CACHE
+import tasks.utils.shared.retrieve_modules as retrieve_modules
+
+MODULES_INFO_CACHE_DIR = os.path.join(TASKS_CACHE, "modules_info")
+DISTRIBUTION_SUFFIXES = (".dist-info", ".egg-info", ".egg-link", ".pth")
+
+
+def get_site_packages_dirs(environment_path):
+    """
+    Returns the site-packages directories of a Python environment.
+
+    Parameters
+    ----------
+    environment_path (str)
+        The path to the Python environment.
+
+    Returns
+    -------
+    list
+        The site-packages directories.
+    """
+    patterns = [
+        os.path.join(environment_path, "lib", "python*", "site-packages"),
+        os.path.join(environment_path, "lib64", "python*", "site-packages"),
+        os.path.join(environment_path, "Lib", "site-packages"),
+    ]
+    dirs = []
+    for pattern in patterns:
+        for dir_ in sorted(glob.glob(pattern)):
+            real_dir = os.path.realpath(dir_)
+            if real_dir not in dirs:
+                dirs.append(real_dir)
+    return dirs
+
+
+def get_modules_info_fingerprint(environment_path, cwd):
+    """
+    Returns a fingerprint of everything modules info depends on: the installed
+    distributions of the environment's site-packages directories, the entries
+    of the working directory and the retrieve_modules script.
+
+    Parameters
+    ----------
+    environment_path (str)
+        The path to the Python environment.
+    cwd (str)
+        The working directory used to find local modules.
+
+    Returns
+    -------
+    str or None
+        The fingerprint, or None if no site-packages directory is found.
+    """
+    site_packages_dirs = get_site_packages_dirs(environment_path)
+    if not site_packages_dirs:
+        return None
+    hash_ = hashlib.sha256()
+    with open(retrieve_modules.__file__, "rb") as f:
+        hash_.update(f.read())
+    for dir_ in site_packages_dirs:
+        hash_.update(dir_.encode("utf-8"))
+        hash_.update(str(os.stat(dir_).st_mtime_ns).encode("utf-8"))
+        for entry in sorted(os.scandir(dir_), key=lambda entry: entry.name):
+            if entry.name.endswith(DISTRIBUTION_SUFFIXES):
+                hash_.update(f"{entry.name}:{entry.stat().st_mtime_ns}".encode("utf-8"))
+    hash_.update(json.dumps(sorted(os.listdir(cwd))).encode("utf-8"))
+    return hash_.hexdigest()
+
+
+def _get_cache_file(environment_path, cwd):
+    key = f"{os.path.realpath(environment_path)}\n{os.path.realpath(cwd)}"
+    name = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+    return os.path.join(MODULES_INFO_CACHE_DIR, name + ".json")
+
+
+def load_cached_modules_info(environment_path, cwd, fingerprint):
+    """
+    Returns the cached modules info of an environment and working directory,
+    if it was generated for the fingerprint.
+
+    Parameters
+    ----------
+    environment_path (str)
+        The path to the Python environment.
+    cwd (str)
+        The working directory used to find local modules.
+    fingerprint (str)
+        The current fingerprint, see get_modules_info_fingerprint.
+
+    Returns
+    -------
+    dict or None
+        The modules info, or None if it is not cached.
+    """
+    cache_file = _get_cache_file(environment_path, cwd)
+    if fingerprint is None or not os.path.isfile(cache_file):
+        return None
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if cached.get("fingerprint") != fingerprint:
+        return None
+    return cached["modules_info"]
+
+
+def store_modules_info(environment_path, cwd, fingerprint, modules_info):
+    """
+    Stores the modules info of an environment and working directory for the
+    fingerprint.
+
+    Parameters
+    ----------
+    environment_path (str)
+        The path to the Python environment.
+    cwd (str)
+        The working directory used to find local modules.
+    fingerprint (str)
+        The fingerprint, see get_modules_info_fingerprint.
+    modules_info (dict)
+        The modules info.
+    """
+    if fingerprint is None:
+        return
+    os.makedirs(MODULES_INFO_CACHE_DIR, exist_ok=True)
+    cache_file = _get_cache_file(environment_path, cwd)
+    temp_file = f"{cache_file}.{os.getpid()}.tmp"
+    with open(temp_file, "w", encoding="utf-8") as f:
+        json.dump({"fingerprint": fingerprint, "modules_info": modules_info}, f)
+    os.replace(temp_file, cache_file)
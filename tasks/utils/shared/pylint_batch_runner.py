@@ -0,0 +1,138 @@
+"""
+Runs pylint on many files within a single pylint run and writes the messages
+and scores per file as JSON.
+
+The script is executed with the interpreter of the runner environment by
+execute_pylint_batch and depends on the standard library and pylint only.
+
+Usage:
+    python pylint_batch_runner.py <files_list_path> <jobs> <output_json_path>
+
+The files list contains one file path per line.
+"""
+
+import json
+import os
+import sys
+
+from pylint.lint import Run
+from pylint.lint.expand_modules import expand_modules
+from pylint.reporters import CollectingReporter
+
+STATS_KEYS = ["fatal", "error", "warning", "refactor", "convention", "info"]
+
+
+def _get_module_names(files):
+    try:
+        descriptions, _ = expand_modules(files, [], [], [], [])
+    except Exception:
+        return {}
+    return {
+        os.path.abspath(description["path"]): description["name"]
+        for description in descriptions.values()
+    }
+
+
+def _split_by_module_name(files, module_names):
+    # Pylint keeps its statistics per module name, files sharing a module name
+    # (e.g. in different directories without __init__.py) go to separate runs.
+    batches = []
+    batch_module_names = []
+    for file in files:
+        module_name = module_names.get(os.path.abspath(file))
+        for batch, names in zip(batches, batch_module_names):
+            if module_name is None or module_name not in names:
+                break
+        else:
+            batch, names = [], set()
+            batches.append(batch)
+            batch_module_names.append(names)
+        batch.append(file)
+        if module_name is not None:
+            names.add(module_name)
+    return batches
+
+
+def _evaluate(evaluation, module_stats):
+    if not module_stats or not module_stats.get("statement"):
+        return None
+    stats = {key: module_stats.get(key, 0) for key in STATS_KEYS}
+    stats["statement"] = module_stats["statement"]
+    try:
+        return eval(evaluation, {}, stats)  # pylint: disable=eval-used
+    except Exception:
+        return None
+
+
+def _run_pylint(files, jobs, results):
+    reporter = CollectingReporter()
+    run = Run([f"--jobs={jobs}", *files], reporter=reporter, exit=False)
+    linter = run.linter
+
+    batch_results = {
+        os.path.abspath(file): results[os.path.abspath(file)] for file in files
+    }
+    for message in reporter.messages:
+        abspath = os.path.abspath(message.abspath)
+        result = results.setdefault(
+            abspath, {"module": message.module, "messages": [], "score": None}
+        )
+        batch_results[abspath] = result
+        result["module"] = result["module"] or message.module
+        result["messages"].append(
+            {
+                "path": message.path,
+                "line": message.line,
+                "column": message.column,
+                "msg_id": message.msg_id,
+                "symbol": message.symbol,
+                "msg": message.msg,
+            }
+        )
+    for result in batch_results.values():
+        module_stats = linter.stats.by_module.get(result["module"])
+        result["score"] = _evaluate(linter.config.evaluation, module_stats)
+
+
+def run_pylint_batch(files, jobs):
+    """
+    Runs pylint on the files and collects messages and scores per file.
+
+    Parameters
+    ----------
+    files (list)
+        The paths of the files to lint.
+    jobs (int)
+        The number of pylint processes, 0 for the number of CPUs.
+
+    Returns
+    -------
+    dict
+        The results keyed by absolute file path, each with the module name,
+        the messages and the score (None if the module has no statements).
+    """
+    module_names = _get_module_names(files)
+    results = {
+        os.path.abspath(file): {
+            "module": module_names.get(os.path.abspath(file)),
+            "messages": [],
+            "score": None,
+        }
+        for file in files
+    }
+    for batch in _split_by_module_name(files, module_names):
+        _run_pylint(batch, jobs, results)
+    return results
+
+
+def main():
+    files_list_path, jobs, output_json_path = sys.argv[1:4]
+    with open(files_list_path, "r", encoding="utf-8") as f:
+        files = [line.strip() for line in f if line.strip()]
+    results = run_pylint_batch(files, int(jobs))
+    with open(output_json_path, "w", encoding="utf-8") as f:
+        json.dump(results, f)
+
+
+if __name__ == "__main__":
+    main()
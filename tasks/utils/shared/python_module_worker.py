@@ -0,0 +1,164 @@
+"""
+Runs Python modules in a long-lived interpreter of the runner environment.
+
+The worker is started by execute_python_module when warm workers are enabled.
+It reads one JSON request per line, {"module": str, "args": list, "cwd": str
+or None, "stdout_path": str, "stderr_path": str}, and runs the module as
+__main__ in a fresh runpy namespace, with the file descriptors 1 and 2
+redirected to the given files, so output of the module and its subprocesses
+is captured as by a fresh "python -u" process. It writes one JSON response per
+line, {"returncode": int}.
+
+Modules imported by a job are kept for the next jobs if they belong to the
+Python installation, as the runner dependencies, and are dropped otherwise,
+so changes of the user's modules are picked up.
+
+The module depends on the standard library only, as it runs in the runner
+environment.
+"""
+
+import json
+import os
+import runpy
+import sys
+import traceback
+
+INSTALLATION_PREFIXES = tuple(
+    os.path.join(os.path.normcase(os.path.abspath(prefix)), "")
+    for prefix in {sys.prefix, sys.base_prefix, sys.exec_prefix}
+)
+
+
+def _is_installed_module(module):
+    file_path = getattr(module, "__file__", None)
+    if not file_path:
+        return True
+    file_path = os.path.normcase(os.path.abspath(file_path))
+    return file_path.startswith(INSTALLATION_PREFIXES)
+
+
+def _get_exit_code(exit_exception):
+    code = exit_exception.code
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def run_module(module, args, cwd, base_sys_path):
+    """
+    Runs a module as __main__ like "python -u module *args" started in cwd
+    with cwd on the PYTHONPATH.
+
+    Parameters
+    ----------
+    module (str)
+        The path of the module, relative paths are resolved from cwd.
+    args (list)
+        The command line arguments of the module.
+    cwd (str)
+        The working directory of the module, or None to keep the current one.
+    base_sys_path (list)
+        The module search path of the interpreter without the worker's
+        directory.
+
+    Returns
+    -------
+    int
+        The exit code of the module.
+    """
+    if cwd:
+        os.chdir(cwd)
+    script_dir = os.path.dirname(os.path.abspath(module))
+    sys.path[:] = [script_dir, *([cwd] if cwd else []), *base_sys_path]
+    sys.argv[:] = [module, *args]
+    try:
+        runpy.run_path(module, run_name="__main__")
+    except SystemExit as e:
+        return _get_exit_code(e)
+    except BaseException as e:
+        # Drops the frames of the worker and runpy, as a fresh interpreter
+        # reports the frames of the module only.
+        tb = e.__traceback__
+        while tb and tb.tb_frame.f_code.co_filename != module:
+            tb = tb.tb_next
+        traceback.print_exception(type(e), e, tb or e.__traceback__)
+        return 1
+    return 0
+
+
+def run_job(request, base_sys_path):
+    """
+    Runs the module of a request with the standard streams redirected to the
+    requested files, and restores the interpreter state afterwards.
+
+    Parameters
+    ----------
+    request (dict)
+        The job request.
+    base_sys_path (list)
+        The module search path of the interpreter without the worker's
+        directory.
+
+    Returns
+    -------
+    dict
+        The response with the exit code of the module.
+    """
+    initial_cwd = os.getcwd()
+    initial_environ = dict(os.environ)
+    initial_modules = set(sys.modules)
+    initial_streams = (sys.stdout, sys.stderr)
+    cwd = request.get("cwd")
+    if cwd:
+        os.environ["PYTHONPATH"] = cwd + os.pathsep + os.environ.get("PYTHONPATH", "")
+
+    saved_fds = [os.dup(1), os.dup(2)]
+    stdout_file = open(request["stdout_path"], "wb")
+    stderr_file = open(request["stderr_path"], "wb")
+    try:
+        os.dup2(stdout_file.fileno(), 1)
+        os.dup2(stderr_file.fileno(), 2)
+        returncode = run_module(
+            request["module"], request.get("args") or [], cwd, base_sys_path
+        )
+        sys.stdout.flush()
+        sys.stderr.flush()
+    finally:
+        os.dup2(saved_fds[0], 1)
+        os.dup2(saved_fds[1], 2)
+        for fd in saved_fds:
+            os.close(fd)
+        stdout_file.close()
+        stderr_file.close()
+        sys.stdout, sys.stderr = initial_streams
+        os.chdir(initial_cwd)
+        os.environ.clear()
+        os.environ.update(initial_environ)
+        for name in set(sys.modules) - initial_modules:
+            if not _is_installed_module(sys.modules.get(name)):
+                sys.modules.pop(name, None)
+    return {"returncode": returncode}
+
+
+def main():
+    # The protocol uses duplicates of stdin and stdout, so modules reading
+    # stdin or writing to the file descriptors do not interfere with it.
+    requests = os.fdopen(os.dup(0), "r", encoding="utf-8")
+    responses = os.fdopen(os.dup(1), "w", encoding="utf-8")
+    devnull = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(devnull, 0)
+    os.close(devnull)
+    base_sys_path = sys.path[1:]
+    for line in requests:
+        if not line.strip():
+            continue
+        response = run_job(json.loads(line), base_sys_path)
+        responses.write(json.dumps(response) + "\n")
+        responses.flush()
+
+
+if __name__ == "__main__":
+    main()
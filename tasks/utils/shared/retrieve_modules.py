@@ -1,23 +1,63 @@
+import importlib.metadata
 import json
 import os
 import sys
 
-import pkg_resources
-import stdlib_list
+# Entries of a distribution's RECORD at the top level of site-packages that
+# are not importable modules.
+NON_MODULE_SUFFIXES = (".dist-info", ".egg-info", ".data", ".pth")
+EXTENSION_SUFFIXES = (".py", ".so", ".pyd")
 
-package_to_import_name = {
-    "Pillow": "PIL",
-    "scikit-learn": "sklearn",
-    "_warnings": "warnings",
-    "PyYAML": "yaml",
-    "python-dateutil": "dateutil",
-    "opencv-python": "cv2",
-    "flask-mail": "flask_mail",
-    "flask-sqlalchemy": "flask_sqlalchemy",
-    "flask-migrate": "flask_migrate",
-    "stdlib-list": "stdlib_list",
-    # Add other package names here
-}
+
+def _get_standard_libraries():
+    if hasattr(sys, "stdlib_module_names"):
+        return sorted(sys.stdlib_module_names)
+    # Python < 3.10
+    import stdlib_list
+
+    standard_libs = [lib for lib in stdlib_list.stdlib_list() if "." not in lib]
+    return ["warnings" if lib == "_warnings" else lib for lib in standard_libs]
+
+
+def _get_names_from_record(dist):
+    names = set()
+    for file in dist.files or []:
+        parts = file.parts
+        first = parts[0]
+        if first in ("..", "__pycache__") or first.endswith(NON_MODULE_SUFFIXES):
+            continue
+        if len(parts) > 1:
+            names.add(first)
+        elif first.endswith(EXTENSION_SUFFIXES):
+            names.add(first.split(".")[0])
+    return names
+
+
+def get_import_names(dist):
+    """
+    Returns the top level import names of a distribution, read from its
+    top_level.txt, or from its RECORD if top_level.txt is missing. Falls back
+    to the normalized project name.
+
+    Parameters
+    ----------
+    dist (importlib.metadata.Distribution)
+        The distribution.
+
+    Returns
+    -------
+    set
+        The import names.
+    """
+    top_level = dist.read_text("top_level.txt")
+    if top_level:
+        names = {line.strip() for line in top_level.splitlines()}
+    else:
+        names = _get_names_from_record(dist)
+    names = {name for name in names if name.isidentifier()}
+    if not names and dist.metadata["Name"]:
+        names = {dist.metadata["Name"].replace("-", "_")}
+    return names
 
 
 def retrieve_modules(cwd):
@@ -26,23 +66,21 @@ def retrieve_modules(cwd):
     current Python environment. Stores them in a JSON file under
     'standard_library' and 'third_party' keys.
 
+    Third-party modules are the import names of the installed distributions,
+    read with importlib.metadata.
+
     Parameters
     ----------
     cwd (str)
         The current working directory. Used to find local modules.
     """
 
-    standard_libs = stdlib_list.stdlib_list()
-    standard_libs = [lib for lib in standard_libs if "." not in lib]
-    for i, lib in enumerate(standard_libs):
-        if lib in package_to_import_name:
-            standard_libs[i] = package_to_import_name[lib]
-
-    third_party_libs = [dist.project_name for dist in pkg_resources.working_set]
-    third_party_libs = [lib for lib in third_party_libs if "." not in lib]
-    for i, lib in enumerate(third_party_libs):
-        if lib in package_to_import_name:
-            third_party_libs[i] = package_to_import_name[lib]
+    standard_libs = _get_standard_libraries()
+
+    third_party_libs = set()
+    for dist in importlib.metadata.distributions():
+        third_party_libs.update(get_import_names(dist))
+    third_party_libs = sorted(third_party_libs)
 
     local_libs = os.listdir(cwd)
     local_libs = [lib.replace(".py", "") for lib in local_libs]